@@ -0,0 +1,50 @@
+"""
+Performance regression suite of the GA hot paths.
+
+    python run_perf.py --save-baseline          # record perf_results/baseline.json
+    python run_perf.py                          # compare with it, exit 1 on regression
+"""
+import argparse
+import os
+import sys
+from tests.perf_bench import PerfBench, DEFAULT_INSTANCES, DEFAULT_THRESHOLD, load_report, compare
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the genetic algorithm hot paths")
+    parser.add_argument("--instances", nargs="+", default=DEFAULT_INSTANCES,
+                        help="TSPLIB instances of the instances/ directory")
+    parser.add_argument("--baseline", default="perf_results/baseline.json")
+    parser.add_argument("--output", default="perf_results/latest.json")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store the results as the new baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    bench = PerfBench(instances=args.instances, repeats=args.repeats)
+    results = bench.run()
+    bench.save(args.output)
+
+    for benchmark, result in results.items():
+        print(f"{benchmark:45s} {result['seconds'] * 1e6:12.1f} us")
+
+    if args.save_baseline:
+        bench.save(args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, run with --save-baseline first")
+        return 0
+
+    regressions = compare(results, load_report(args.baseline)["results"], args.threshold)
+    for benchmark, before, after, ratio in regressions:
+        print(f"REGRESSION {benchmark}: {before * 1e6:.1f} us -> {after * 1e6:.1f} us ({ratio:.2f}x)")
+    if regressions:
+        return 1
+    print(f"No regression above {args.threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
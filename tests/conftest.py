@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from tsp_solver.core.city import City
+from tsp_solver.core.distance import DistanceMatrix
+from tsp_solver.genetic import GeneticAlgorithm
+
+
+def random_cities(size, seed=0):
+    rng = np.random.default_rng(seed)
+    return [City(x, y, f"City-{i+1}") for i, (x, y) in enumerate(rng.uniform(0, 100, (size, 2)))]
+
+
+@pytest.fixture(autouse=True)
+def instance_cache(tmp_path, monkeypatch):
+    """Keep the binary instance cache of every test out of the home directory"""
+    monkeypatch.setenv("TSP_SOLVER_CACHE", str(tmp_path / "instance_cache"))
+
+
+@pytest.fixture
+def cities():
+    return random_cities(30)
+
+
+@pytest.fixture
+def make_ga():
+    """
+    Factory of small seeded GeneticAlgorithms over random coordinates.
+
+    make_ga(size=40, coords_seed=0, populate=True, **kwargs): kwargs override
+    the GeneticAlgorithm defaults below; populate creates the initial population.
+    """
+    def make(size=40, coords_seed=0, populate=True, **kwargs):
+        coords = np.random.default_rng(coords_seed).uniform(0, 100, (size, 2))
+        settings = dict(population_size=30, elite_size=3, mutation_rate=0.05, seed=1)
+        settings.update(kwargs)
+        ga = GeneticAlgorithm(DistanceMatrix(coords), **settings)
+        if populate:
+            ga.create_initial_population()
+        return ga
+    return make
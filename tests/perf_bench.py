@@ -0,0 +1,184 @@
+import json
+import os
+import platform
+import random
+import statistics
+import time
+from datetime import datetime
+import numpy as np
+from tsp_solver.core.tsplib_importer import TSPLibImporter
+from tsp_solver.genetic import kernels
+from tsp_solver.genetic.algorithm import GeneticAlgorithm
+from tsp_solver.genetic.operators import (tournament_selection, elitism_selection,
+                                          tournament_selection_batch, rank_selection,
+                                          stochastic_universal_sampling,
+                                          ordered_crossover, cycle_crossover,
+                                          ordered_crossover_batch, cycle_crossover_batch,
+                                          edge_assembly_crossover, edge_recombination_crossover,
+                                          swap_mutation, insertion_mutation, inversion_mutation,
+                                          swap_mutation_batch, insertion_mutation_batch,
+                                          inversion_mutation_batch)
+
+INSTANCES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "instances")
+
+# Fixed TSPLIB instances of increasing size
+DEFAULT_INSTANCES = ["berlin52", "kroA200", "rat783", "pr2392"]
+
+# A benchmark is a regression when it is this much slower than the baseline
+DEFAULT_THRESHOLD = 0.25
+
+
+class PerfBench:
+    """
+    Throughput benchmarks of the GA hot paths on TSPLIB instances.
+
+    Every benchmark is reported as seconds per call (lower is better),
+    the median over several repeats. Results and baselines are JSON files
+    of the form {"meta": {...}, "results": {"<instance>/<benchmark>": {...}}}.
+    """
+
+    def __init__(self, instances=None, population_size=100, generations=20, repeats=5, seed=0):
+        self.instances = instances or DEFAULT_INSTANCES
+        self.population_size = population_size
+        self.generations = generations  # Generations timed per repeat
+        self.repeats = repeats
+        self.seed = seed
+        self.results = {}
+
+    def load_instance(self, name):
+        """TSPInstance of instances/<name>.tsp"""
+        return TSPLibImporter.load(os.path.join(INSTANCES_DIR, f"{name}.tsp"))
+
+    def measure(self, function, calls):
+        """Median time of one call of function, over the repeats of `calls` calls"""
+        function()  # Warm-up (JIT compilation, caches)
+        timings = []
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            for _ in range(calls):
+                function()
+            timings.append((time.perf_counter() - start) / calls)
+        return statistics.median(timings)
+
+    def record(self, instance, benchmark, seconds, **extra):
+        self.results[f"{instance}/{benchmark}"] = {"seconds": seconds, **extra}
+
+    def bench_generations(self, name, instance):
+        """Generations per second of a seeded GA, and evaluation time per individual"""
+        ga = GeneticAlgorithm(instance.distances, population_size=self.population_size,
+                              elite_size=self.population_size // 10,
+                              mutation_rate=1.0 / instance.dimension, seed=self.seed)
+        ga.create_initial_population()
+        seconds = self.measure(ga.run_generation, self.generations)
+        self.record(name, "generation", seconds, generations_per_second=1.0 / seconds)
+
+        population = ga.population
+        seconds = self.measure(lambda: instance.distances.tour_lengths(population), 1)
+        self.record(name, "evaluation_per_individual", seconds / len(population))
+        return ga
+
+    def bench_operators(self, name, instance, ga):
+        """Time of one call of each selection, crossover and mutation operator"""
+        rng = random.Random(self.seed)
+        np_rng = np.random.default_rng(self.seed)
+        distances = instance.distances
+        neighbors = distances.nearest_neighbors(ga.neighbor_count)
+        population = ga.population
+        fitness = 1 / ga.update_route_lengths()
+        parent1, parent2 = population[0], population[1]
+        parents1, parents2 = population[::2], population[1::2]
+        mutation_rate = 1.0 / instance.dimension
+
+        operators = {
+            "tournament_selection": lambda: tournament_selection(population, fitness, 5, rng=rng),
+            "tournament_selection_batch": lambda: tournament_selection_batch(
+                fitness, len(population), 5, np_rng),
+            "rank_selection": lambda: rank_selection(fitness, len(population), np_rng),
+            "stochastic_universal_sampling": lambda: stochastic_universal_sampling(
+                fitness, len(population), np_rng),
+            "elitism_selection": lambda: elitism_selection(fitness, len(population) // 10),
+            "ordered_crossover": lambda: ordered_crossover(parent1, parent2, rng=rng),
+            "cycle_crossover": lambda: cycle_crossover(parent1, parent2),
+            "ordered_crossover_batch": lambda: ordered_crossover_batch(parents1, parents2, rng=rng),
+            "cycle_crossover_batch": lambda: cycle_crossover_batch(parents1, parents2),
+            "edge_assembly_crossover": lambda: edge_assembly_crossover(
+                parent1, parent2, distances, np_rng, "single", neighbors),
+            "edge_assembly_crossover_block": lambda: edge_assembly_crossover(
+                parent1, parent2, distances, np_rng, "block", neighbors),
+            "edge_recombination_crossover": lambda: edge_recombination_crossover(
+                parent1, parent2, np_rng),
+            "swap_mutation": lambda: swap_mutation(parent1.copy(), mutation_rate, distances, rng=rng),
+            "insertion_mutation": lambda: insertion_mutation(parent1.copy(), 1.0, distances, rng=rng),
+            "inversion_mutation": lambda: inversion_mutation(parent1.copy(), 1.0, distances, rng=rng),
+            # Whole offspring, as mutated by GeneticAlgorithm.breed
+            "swap_mutation_batch": lambda: swap_mutation_batch(population.copy(), mutation_rate, np_rng),
+            "insertion_mutation_batch": lambda: insertion_mutation_batch(population.copy(), 1.0, np_rng),
+            "inversion_mutation_batch": lambda: inversion_mutation_batch(population.copy(), 1.0, np_rng),
+        }
+        for operator, function in operators.items():
+            self.record(name, operator, self.measure(function, 50))
+
+    def run(self, verbose=True):
+        """Run every benchmark on every instance and return the results"""
+        for name in self.instances:
+            instance = self.load_instance(name)
+            if verbose:
+                print(f"Benchmarking {name} ({instance.dimension} cities)...")
+            ga = self.bench_generations(name, instance)
+            self.bench_operators(name, instance, ga)
+            ga.close()
+        return self.results
+
+    def report(self):
+        """Results as a JSON-serializable dict, with the environment they were measured in"""
+        return {
+            "meta": {
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+                "processor": platform.processor(),
+                "kernels": kernels.backend,
+                "population_size": self.population_size,
+                "seed": self.seed,
+            },
+            "results": self.results,
+        }
+
+    def save(self, path):
+        """Write the report to a JSON file"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+
+def load_report(path):
+    """Report previously written by PerfBench.save"""
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare benchmark results with a baseline.
+
+    Args:
+        results (dict): Benchmark name -> {"seconds": ...}
+        baseline (dict): Same structure, from a previous run
+        threshold (float): Allowed slowdown, as a fraction of the baseline time
+
+    Returns:
+        list: (benchmark, baseline seconds, seconds, ratio) of the regressions,
+        sorted from the worst
+    """
+    regressions = []
+    for benchmark, result in results.items():
+        reference = baseline.get(benchmark)
+        if reference is None or reference["seconds"] <= 0:
+            continue
+        ratio = result["seconds"] / reference["seconds"]
+        if ratio > 1 + threshold:
+            regressions.append((benchmark, reference["seconds"], result["seconds"], ratio))
+    return sorted(regressions, key=lambda regression: regression[3], reverse=True)
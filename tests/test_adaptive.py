@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from tsp_solver.genetic import GeneticAlgorithm
+from tsp_solver.genetic.adaptive import (AdaptivePursuit, adapt_mutation_rate, is_stagnating,
+                                         MUTATION_RATE_BOUNDS)
+
+
+def test_adaptive_pursuit_converges_to_best_arm():
+    pursuit = AdaptivePursuit(["a", "b", "c"])
+    rng = np.random.default_rng(0)
+    rewards = {"a": 0.0, "b": 1.0, "c": 0.5}
+    for _ in range(200):
+        arm = pursuit.choose(rng)
+        pursuit.update(arm, rewards[arm])
+    assert np.isclose(pursuit.probabilities.sum(), 1.0)
+    assert np.argmax(pursuit.probabilities) == 1
+    assert np.isclose(pursuit.probabilities[1], pursuit.p_max)
+    assert np.all(pursuit.probabilities >= pursuit.p_min - 1e-12)
+
+
+def test_mutation_rate_adaptation():
+    assert is_stagnating([5.0] * 12)
+    assert not is_stagnating([6.0] + [5.0] * 10)
+    assert adapt_mutation_rate(0.1, stagnant=True) > 0.1
+    assert adapt_mutation_rate(0.1, stagnant=False, unique_ratio=0.1) > 0.1
+    assert adapt_mutation_rate(0.1, stagnant=False, unique_ratio=1.0) < 0.1
+    assert adapt_mutation_rate(100.0, stagnant=True) == MUTATION_RATE_BOUNDS[1] == 1.0
+    assert adapt_mutation_rate(1e-9, stagnant=False) == MUTATION_RATE_BOUNDS[0] > 0
+
+
+def test_adaptive_mode_records_choices(make_ga):
+    ga = make_ga(adaptive=True, crossover_pool=["ordered", "eax"])
+    for _ in range(30):
+        ga.run_generation()
+    assert len(ga.operator_history) == 30
+    assert {choice["crossover"] for choice in ga.operator_history} <= {"ordered", "eax"}
+    assert all(choice["reward"] is not None for choice in ga.operator_history[:-1])
+    known = ~np.isnan(ga.route_lengths)
+    assert np.allclose(ga.route_lengths[known], ga.distances.tour_lengths(ga.population[known]))
+
+
+def test_adaptive_checkpoint_resumes_exactly(tmp_path, make_ga):
+    ga = make_ga(adaptive=True)
+    for _ in range(10):
+        ga.run_generation()
+    ga.save_checkpoint(str(tmp_path / "run.ckpt"))
+    restored = GeneticAlgorithm.from_checkpoint(str(tmp_path / "run.ckpt"), ga.distances)
+
+    for _ in range(5):
+        ga.run_generation()
+        restored.run_generation()
+    assert np.array_equal(restored.population, ga.population)
+    assert restored.operator_history == ga.operator_history
+
+
+@pytest.mark.parametrize("mutation_type", ["swap", "insertion", "inversion"])
+def test_mutation_rate_has_the_same_unit_in_both_modes(mutation_type, make_ga):
+    routes = np.array([np.random.default_rng(i).permutation(40) for i in range(30)], dtype=np.int32)
+    mutated = []
+    for adaptive in (False, True):
+        ga = make_ga(adaptive=adaptive)
+        ga.mutation_type, ga.mutation_rate = mutation_type, 0.05
+        ga.np_rng = np.random.default_rng(3)
+        copy = routes.copy()
+        ga.mutate_batch(copy)
+        mutated.append(copy)
+    assert np.array_equal(mutated[0], mutated[1])
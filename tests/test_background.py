@@ -0,0 +1,58 @@
+import time
+import numpy as np
+from tsp_solver.genetic.algorithm import GeneticAlgorithm
+from tsp_solver.genetic.background import BackgroundSolver
+
+
+def wait_for_progress(solver, generations, timeout=30):
+    deadline = time.monotonic() + timeout
+    while solver.ga.generation < generations and time.monotonic() < deadline:
+        solver.poll(timeout=0.1)
+    assert solver.ga.generation >= generations
+
+
+def test_stop_continues_like_in_process(cities):
+    ga = GeneticAlgorithm(cities, population_size=30, elite_size=3, seed=5)
+    ga.create_initial_population()
+    ga.run_generation()  # A step in the window before starting
+
+    solver = BackgroundSolver(ga, interval=0.01)
+    wait_for_progress(solver, 5)
+    assert len(ga.history) == ga.generation  # Snapshots carry the new history entries
+    solver.stop()
+    while not solver.finished:
+        solver.poll(timeout=1)
+    assert solver.stop_reason == "cancelled" and solver.error is None
+    generation = ga.generation
+    ga.run_generation()
+
+    reference = GeneticAlgorithm(cities, population_size=30, elite_size=3, seed=5)
+    reference.create_initial_population()
+    for _ in range(generation + 1):
+        reference.run_generation()
+    assert np.array_equal(ga.population, reference.population)
+    assert ga.history == reference.history
+    assert ga.best_route[0].name == reference.best_route[0].name
+
+
+def test_stagnation_finishes_the_process(cities):
+    ga = GeneticAlgorithm(cities, population_size=20, elite_size=2, seed=1,
+                          use_stopping_criterion=True, generations_without_improvement=3,
+                          improvement_threshold=1.0)
+    ga.create_initial_population()
+    solver = BackgroundSolver(ga)
+    deadline = time.monotonic() + 30
+    while not solver.finished and time.monotonic() < deadline:
+        solver.poll(timeout=0.1)
+    assert solver.stop_reason == "stagnation"
+    assert ga.generation == 4
+    assert not solver.process.is_alive()
+
+
+def test_close(cities):
+    ga = GeneticAlgorithm(cities, population_size=20, elite_size=2, seed=1)
+    ga.create_initial_population()
+    with BackgroundSolver(ga) as solver:
+        wait_for_progress(solver, 1)
+    assert solver.finished and solver.stop_reason == "cancelled"
+    assert not solver.blocks
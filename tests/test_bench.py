@@ -1,23 +1,85 @@
+import json
+import os
+import sqlite3
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
 import numpy as np
 from datetime import datetime
 from tsp_solver.core.city import City
 from tsp_solver.genetic.algorithm import GeneticAlgorithm
 
+# Colonnes identifiant un run de la grille
+RUN_KEY = ("city_size", "population_ratio", "crossover_type", "mutation_type", "run")
+
+RUNS_TABLE = """
+CREATE TABLE IF NOT EXISTS runs (
+    city_size INTEGER, population_ratio INTEGER, population_size INTEGER,
+    crossover_type TEXT, mutation_type TEXT, run INTEGER, seed INTEGER,
+    best_distance REAL, execution_time REAL, stagnation_generation INTEGER,
+    final_generation INTEGER, convergence_history TEXT, finished_at TEXT,
+    PRIMARY KEY (city_size, population_ratio, crossover_type, mutation_type, run)
+)
+"""
+
+
+class ResultStore:
+    """Stockage SQLite des runs terminés, écrit au fil de l'eau par le processus principal"""
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(RUNS_TABLE)
+        self.connection.commit()
+
+    def completed(self):
+        """Clés (RUN_KEY) des runs déjà enregistrés"""
+        rows = self.connection.execute(f"SELECT {', '.join(RUN_KEY)} FROM runs")
+        return {tuple(row) for row in rows}
+
+    def add(self, result):
+        """Enregistre un run terminé (commit immédiat, pour survivre à un crash)"""
+        row = dict(result, convergence_history=json.dumps(result["convergence_history"]),
+                   finished_at=datetime.now().isoformat(timespec="seconds"))
+        columns = ", ".join(row)
+        placeholders = ", ".join(f":{column}" for column in row)
+        self.connection.execute(f"INSERT OR REPLACE INTO runs ({columns}) VALUES ({placeholders})", row)
+        self.connection.commit()
+
+    def dataframe(self):
+        """Tous les runs enregistrés"""
+        return pd.read_sql_query("SELECT * FROM runs", self.connection)
+
+    def close(self):
+        self.connection.close()
+
+
+def _run_grid_point(bench, params):
+    """Exécute un run de la grille dans un processus du pool"""
+    cities = bench.generate_cities(params["city_size"], seed=params["seed"])
+    result = bench.run_test_configuration(cities, params["population_size"], params["crossover_type"],
+                                          params["mutation_type"], seed=params["seed"])
+    result["convergence_history"] = [float(d) for d in result["convergence_history"]]
+    return dict(params, **result)
+
+
 class TSPTestBench:
-    def __init__(self):
+    def __init__(self, seed=0):
         self.results = []
         self.city_sizes = [10, 20, 30, 50]
         self.population_ratios = [5, 7, 10, 12, 15]
         self.crossover_types = ["ordered", "cycle"]
         self.mutation_types = ["swap", "insertion", "inversion"]
         self.num_runs = 5  # number of runs for each configuration, we will do an average
+        self.seed = seed  # seed of the whole grid, each run derives its own from it
         
-    def generate_cities(self, size):
-        """Génère un ensemble de villes aléatoires"""
-        return [City(np.random.uniform(0, 100), 
-                    np.random.uniform(0, 100), 
+    def generate_cities(self, size, seed=None):
+        """Génère un ensemble de villes aléatoires (reproductible si seed est donné)"""
+        rng = np.random if seed is None else np.random.default_rng(seed)
+        return [City(rng.uniform(0, 100), 
+                    rng.uniform(0, 100), 
                     f"City-{i+1}") for i in range(size)]
     
     def calculate_mutation_rate(self, num_cities):
@@ -36,7 +98,7 @@ class TSPTestBench:
         return improvement < threshold
     
     def run_test_configuration(self, cities, population_size, crossover_type, 
-                             mutation_type, max_generations=1000):
+                             mutation_type, max_generations=1000, seed=None):
         """Exécute une configuration de test"""
         start_time = time.time()
         
@@ -45,7 +107,8 @@ class TSPTestBench:
             population_size=population_size,
             mutation_rate=self.calculate_mutation_rate(len(cities)),
             crossover_type=crossover_type,
-            mutation_type=mutation_type
+            mutation_type=mutation_type,
+            seed=seed
         )
         
         ga.create_initial_population()
@@ -53,7 +116,7 @@ class TSPTestBench:
         best_distance = float('inf')
         
         for gen in range(max_generations):
-            best_route, current_distance, _ = ga.run_generation()
+            best_route, current_distance, _, _ = ga.run_generation()
             
             if current_distance < best_distance:
                 best_distance = current_distance
@@ -72,45 +135,73 @@ class TSPTestBench:
             'convergence_history': ga.history
         }
 
-    def run_benchmark(self):
-        """Exécute le benchmark complet"""
+    def run_seed(self, city_size, pop_ratio, crossover, mutation, run):
+        """Seed déterministe d'un run, indépendant de l'ordre d'exécution"""
+        entropy = [self.seed, city_size, pop_ratio, self.crossover_types.index(crossover),
+                   self.mutation_types.index(mutation), run]
+        return int(np.random.SeedSequence(entropy).generate_state(1)[0])
+    
+    def grid(self):
+        """Paramètres de tous les runs de la grille"""
         for city_size in self.city_sizes:
-            print(f"\nTesting with {city_size} cities...")
-            
             for pop_ratio in self.population_ratios:
-                population_size = pop_ratio * city_size
-                
                 for crossover in self.crossover_types:
                     for mutation in self.mutation_types:
-                        print(f"Testing: pop={population_size}, "
-                              f"crossover={crossover}, mutation={mutation}")
-                        
-                        # Exécute plusieurs tests pour cette configuration
-                        config_results = []
                         for run in range(self.num_runs):
-                            cities = self.generate_cities(city_size)
-                            result = self.run_test_configuration(
-                                cities, population_size, crossover, mutation)
-                            config_results.append(result)
-                        
-                        # Calcule les statistiques moyennes
-                        avg_results = {
-                            'city_size': city_size,
-                            'population_ratio': pop_ratio,
-                            'population_size': population_size,
-                            'crossover_type': crossover,
-                            'mutation_type': mutation,
-                            'avg_best_distance': np.mean([r['best_distance'] 
-                                                        for r in config_results]),
-                            'std_best_distance': np.std([r['best_distance'] 
-                                                       for r in config_results]),
-                            'avg_execution_time': np.mean([r['execution_time'] 
-                                                         for r in config_results]),
-                            'avg_stagnation_gen': np.mean([r['stagnation_generation'] 
-                                                         for r in config_results])
-                        }
-                        
-                        self.results.append(avg_results)
+                            yield {
+                                'city_size': city_size,
+                                'population_ratio': pop_ratio,
+                                'population_size': pop_ratio * city_size,
+                                'crossover_type': crossover,
+                                'mutation_type': mutation,
+                                'run': run,
+                                'seed': self.run_seed(city_size, pop_ratio, crossover, mutation, run),
+                            }
+
+    def run_benchmark(self, workers=None, store_path='test_results/benchmark.sqlite'):
+        """
+        Exécute le benchmark complet sur un pool de processus.
+        
+        Chaque run terminé est enregistré immédiatement dans la base SQLite
+        store_path ; relancer le benchmark ne refait que les runs manquants.
+        
+        Args:
+            workers (int, optional): Nombre de processus (par défaut le nombre de CPU)
+            store_path (str): Base SQLite des résultats
+        """
+        store = ResultStore(store_path)
+        try:
+            done = store.completed()
+            pending = [params for params in self.grid()
+                       if tuple(params[key] for key in RUN_KEY) not in done]
+            print(f"{len(done)} runs already done, {len(pending)} to go")
+            
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_run_grid_point, self, params) for params in pending]
+                for count, future in enumerate(as_completed(futures), 1):
+                    result = future.result()
+                    store.add(result)
+                    print(f"[{count}/{len(pending)}] size={result['city_size']}, "
+                          f"pop={result['population_size']}, crossover={result['crossover_type']}, "
+                          f"mutation={result['mutation_type']}, run={result['run']}: "
+                          f"{result['best_distance']:.2f}")
+            
+            runs = store.dataframe()
+        finally:
+            store.close()
+        
+        # Calcule les statistiques moyennes de chaque configuration
+        self.results = []
+        configuration = ['city_size', 'population_ratio', 'population_size',
+                         'crossover_type', 'mutation_type']
+        for values, config_results in runs.groupby(configuration, sort=True):
+            self.results.append({
+                **dict(zip(configuration, values)),
+                'avg_best_distance': config_results['best_distance'].mean(),
+                'std_best_distance': config_results['best_distance'].std(ddof=0),
+                'avg_execution_time': config_results['execution_time'].mean(),
+                'avg_stagnation_gen': config_results['stagnation_generation'].mean()
+            })
     
     def save_results(self, output_dir='test_results'):
         """Sauvegarde les résultats dans des fichiers"""
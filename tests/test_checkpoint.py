@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from tsp_solver.core.distance import DistanceMatrix
+from tsp_solver.genetic import GeneticAlgorithm
+from tsp_solver.genetic.checkpoint import write_checkpoint, read_checkpoint
+
+
+def test_checkpoint_file_round_trip(tmp_path):
+    arrays = {"population": np.arange(12, dtype=np.int32).reshape(3, 4),
+              "lengths": np.array([1.5, np.nan, 3.0]), "empty": np.empty(0)}
+    write_checkpoint(tmp_path / "state.bin", {"generation": 4}, arrays)
+
+    for mmap in (False, True):
+        header, restored = read_checkpoint(tmp_path / "state.bin", mmap=mmap)
+        assert header == {"generation": 4}
+        for name, array in arrays.items():
+            assert restored[name].dtype == array.dtype
+            assert np.array_equal(restored[name], array, equal_nan=True)
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_resumed_run_is_bit_identical(tmp_path, mmap, make_ga):
+    path = tmp_path / "run.ckpt"
+    interrupted = make_ga(checkpoint_path=path, checkpoint_every=10, use_stopping_criterion=True)
+    for _ in range(15):
+        interrupted.run_generation()
+
+    reference = make_ga(use_stopping_criterion=True)
+    for _ in range(10):
+        reference.run_generation()
+
+    resumed = GeneticAlgorithm.from_checkpoint(path, reference.distances, mmap=mmap)
+    assert resumed.generation == 10
+    for _ in range(20):
+        assert resumed.run_generation()[1:] == reference.run_generation()[1:]
+    assert np.array_equal(resumed.population, reference.population)
+    assert np.array_equal(resumed.route_lengths, reference.route_lengths, equal_nan=True)
+    assert resumed.history == reference.history
+
+
+def test_checkpoint_of_another_instance_is_rejected(tmp_path, make_ga):
+    ga = make_ga()
+    ga.save_checkpoint(tmp_path / "run.ckpt")
+    other = GeneticAlgorithm(DistanceMatrix(ga.distances.coords[:20]), population_size=30)
+    with pytest.raises(ValueError):
+        other.restore_checkpoint(tmp_path / "run.ckpt")
@@ -0,0 +1,74 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from tsp_solver import cli
+from tsp_solver.cli import load_config, main
+from tsp_solver.core.tsplib_importer import TSPLibImporter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INSTANCE = os.path.join(ROOT, "instances", "berlin52.tsp")
+
+
+def run_cli(*args, env=None):
+    env = dict(os.environ, PYTHONPATH=ROOT, **(env or {}))
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, env=env,
+                          cwd=ROOT, timeout=300)
+
+
+def test_main_prints_json_lines(capsys):
+    status = main([INSTANCE, INSTANCE, "--generations", "5", "--population-size", "20",
+                   "--elite-size", "2", "--seed", "1", "--jobs", "1"])
+    assert status == 0
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(results) == 1  # The same file is solved once
+    result = results[0]
+    assert result["name"] == "berlin52" and result["dimension"] == 52
+    assert result["generations"] == 5 and result["stop_reason"] == "generations"
+    tour = [node - 1 for node in result["tour"]]
+    assert sorted(tour) == list(range(52))
+    assert TSPLibImporter.load(INSTANCE).tour_length(tour) == result["best_length"]
+
+
+def test_failures_are_reported(capsys, tmp_path):
+    broken = tmp_path / "broken.tsp"
+    broken.write_text("NAME : broken\nTYPE : TSP\nDIMENSION : 3\nEOF\n")
+    status = main([str(broken), "--generations", "1", "--jobs", "1"])
+    assert status == 1
+    result = json.loads(capsys.readouterr().out)
+    assert result["instance"] == str(broken) and result["error"]
+
+
+def test_module_entry_point():
+    process = run_cli("-m", "tsp_solver", INSTANCE, "--generations", "3", "--population-size", "10",
+                      "--elite-size", "1", "--seed", "2", "--no-tour")
+    assert process.returncode == 0, process.stderr
+    result = json.loads(process.stdout)
+    assert result["generations"] == 3 and "tour" not in result
+
+
+def test_no_gui_imports():
+    process = run_cli("-c", "import json, sys, tsp_solver.cli; "
+                            "print(json.dumps(sorted({name.split('.')[0] for name in sys.modules})))")
+    assert process.returncode == 0, process.stderr
+    modules = json.loads(process.stdout)
+    assert "tsp_solver" in modules
+    assert "PyQt5" not in modules and "matplotlib" not in modules
+
+
+def test_toml_config(tmp_path):
+    config = tmp_path / "settings.toml"
+    config.write_text('population-size = 50\ntime_limit = 2.5\n')
+    assert load_config(str(config)) == {"population_size": 50, "time_limit": 2.5}
+
+
+def test_toml_config_without_a_parser(tmp_path, monkeypatch, capsys):
+    config = tmp_path / "settings.toml"
+    config.write_text("population_size = 50\n")
+    monkeypatch.setattr(cli, "tomllib", None)
+    with pytest.raises(ValueError, match="Python 3.11"):
+        load_config(str(config))
+    with pytest.raises(SystemExit):
+        main([INSTANCE, "--config", str(config)])
+    assert "TOML configs need Python 3.11+" in capsys.readouterr().err
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from tsp_solver.core.distance import DistanceMatrix
+from tsp_solver.genetic import GeneticAlgorithm
+from tsp_solver.genetic.operators import edge_assembly_crossover, edge_recombination_crossover
+
+
+def edges(tour):
+    return {frozenset((tour[k - 1], tour[k])) for k in range(len(tour))}
+
+
+def random_instance(size, seed=0):
+    rng = np.random.default_rng(seed)
+    distances = DistanceMatrix(rng.uniform(0, 1000, (size, 2)))
+    parent1, parent2 = rng.permutation(size).astype(np.int32), rng.permutation(size).astype(np.int32)
+    return distances, parent1, parent2
+
+
+@pytest.mark.parametrize("strategy", ["single", "block"])
+@pytest.mark.parametrize("size", [3, 5, 8, 200])
+def test_edge_assembly_crossover(strategy, size):
+    distances, parent1, parent2 = random_instance(size)
+    rng = np.random.default_rng(1)
+    neighbors = distances.nearest_neighbors(8)
+    for _ in range(20):
+        child = edge_assembly_crossover(parent1, parent2, distances, rng, strategy, neighbors)
+        assert child.dtype == parent1.dtype
+        assert sorted(child) == list(range(size))
+        assert child[0] == parent1[0]
+        # Only the subtour merges add edges found in neither parent
+        assert len(edges(child) - edges(parent1) - edges(parent2)) <= max(2, size // 4)
+
+
+def test_edge_assembly_crossover_without_neighbors():
+    distances, parent1, parent2 = random_instance(100, seed=2)
+    child = edge_assembly_crossover(parent1, parent2, distances, np.random.default_rng(2))
+    assert sorted(child) == list(range(100))
+
+
+def test_edge_assembly_crossover_of_identical_parents():
+    distances, parent1, _ = random_instance(50, seed=3)
+    child = edge_assembly_crossover(parent1, parent1, distances, np.random.default_rng(3))
+    assert np.array_equal(child, parent1)
+
+
+def test_edge_recombination_crossover():
+    _, parent1, parent2 = random_instance(100, seed=4)
+    child = edge_recombination_crossover(parent1, parent2, np.random.default_rng(4))
+    assert sorted(child) == list(range(100))
+    # Edges common to both parents are kept
+    assert edges(parent1) & edges(parent2) <= edges(child)
+
+
+def test_eax_outperforms_ordered_crossover():
+    distances, _, _ = random_instance(150, seed=5)
+
+    def best_length(crossover_type):
+        ga = GeneticAlgorithm(distances, population_size=30, elite_size=3, mutation_rate=0.0,
+                              crossover_type=crossover_type, seed=6)
+        ga.create_initial_population()
+        for _ in range(30):
+            ga.run_generation()
+        return ga.best_distance
+
+    assert best_length("eax") < 0.8 * best_length("ordered")
+
+
+@pytest.mark.parametrize("crossover_type", ["ordered", "cycle"])
+@pytest.mark.parametrize("crossover_rate", [1.0, 0.5, 0.0])
+def test_breed_uses_batch_crossover(make_ga, monkeypatch, crossover_type, crossover_rate):
+    ga = make_ga(crossover_type=crossover_type, crossover_rate=crossover_rate, mutation_rate=0.0)
+    monkeypatch.setattr(ga, "crossover", None)  # The per-child path is not taken
+    parents, lengths = ga.population.copy(), ga.update_route_lengths().copy()
+    children = np.empty_like(parents)
+    child_lengths = np.empty(len(parents))
+    ga.breed(parents, lengths, children, child_lengths, range(len(parents)))
+
+    assert np.array_equal(np.sort(children, axis=1), np.sort(parents, axis=1))
+    cloned = ~np.isnan(child_lengths)
+    assert np.allclose(child_lengths[cloned], ga.distances.tour_lengths(children[cloned]))
+    if crossover_rate == 0.0:
+        assert cloned.all()
+    elif crossover_rate == 1.0:
+        assert not cloned.any()
+    # With CX every position holds the city of one parent or the other
+    if crossover_type == "cycle":
+        parent_rows = (children[:, None, :] == parents[None, :, :])
+        assert np.all(parent_rows.any(axis=1))
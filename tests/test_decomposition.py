@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from tsp_solver.core.distance import DistanceMatrix
+from tsp_solver.genetic.decomposition import (DecompositionSolver, STAGES, grid_partition,
+                                              kmeans_partition)
+
+
+def random_coords(size, seed=0):
+    return np.random.default_rng(seed).uniform(0, 1000, (size, 2))
+
+
+@pytest.mark.parametrize("partition", [grid_partition, kmeans_partition])
+def test_partition(partition):
+    coords = random_coords(1000)
+    labels = partition(coords, 10)
+    counts = np.bincount(labels)
+    assert labels.shape == (1000,)
+    assert counts.min() > 0 and 8 <= len(counts) <= 12
+    if partition is grid_partition:
+        assert counts.max() - counts.min() <= 1
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_decomposition_solver(workers):
+    distances = DistanceMatrix(random_coords(600, seed=1))
+    solver = DecompositionSolver(distances, cluster_size=100, workers=workers, seed=2,
+                                 cluster_generations=20)
+    tour, length = solver.solve()
+
+    assert sorted(tour) == list(range(600))
+    assert length == pytest.approx(distances.tour_length(tour))
+    assert length <= solver.stitched_distance
+    assert set(solver.timings) == set(STAGES) | {"total"}
+    # Far shorter than a random tour (about 600 * 520)
+    assert length < 0.2 * distances.tour_length(np.arange(600))
+
+
+def test_decomposition_solver_is_reproducible():
+    distances = DistanceMatrix(random_coords(300, seed=3))
+
+    def solve():
+        solver = DecompositionSolver(distances, cluster_size=60, partition="grid", workers=1,
+                                     seed=4, cluster_generations=10)
+        return solver.solve()[0]
+
+    assert np.array_equal(solve(), solve())
+
+
+def test_decomposition_requires_coordinates():
+    with pytest.raises(ValueError):
+        DecompositionSolver(DistanceMatrix.from_matrix(np.ones((10, 10)) - np.eye(10)))
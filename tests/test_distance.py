@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from tsp_solver.core.distance import DEFAULT_MEMORY_BUDGET, FLOAT64_MAX_CITIES, DistanceMatrix
+from tsp_solver.genetic import GeneticAlgorithm
+
+
+def random_coords(size, seed=0):
+    return np.random.default_rng(seed).uniform(0, 1000, (size, 2))
+
+
+def random_routes(count, size, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.array([rng.permutation(size) for _ in range(count)], dtype=np.int32)
+
+
+@pytest.mark.parametrize("size, metric, dtype", [
+    (50, "euclidean", np.float64),
+    (FLOAT64_MAX_CITIES, "euclidean", np.float64),
+    (FLOAT64_MAX_CITIES + 1, "euclidean", np.float32),
+    (50, "EUC_2D", np.int32),
+    (FLOAT64_MAX_CITIES + 1, "CEIL_2D", np.int32),
+    (50, "ATT", np.int32),
+])
+def test_dtype_choice(size, metric, dtype):
+    # A zero budget only chooses the dtype, without filling the matrix
+    distances = DistanceMatrix(random_coords(size), memory_budget=0, metric=metric)
+    assert distances.dtype == dtype
+    assert not distances.is_precomputed
+
+
+def test_forced_dtype():
+    distances = DistanceMatrix(random_coords(30), dtype=np.float32)
+    assert distances.matrix.dtype == np.float32
+
+
+def test_memory_budget():
+    assert DEFAULT_MEMORY_BUDGET == 512 * 1024 ** 2
+    coords = random_coords(50)
+    matrix_bytes = 50 * 50 * np.dtype(np.float64).itemsize
+    assert DistanceMatrix(coords).is_precomputed
+    assert DistanceMatrix(coords, memory_budget=matrix_bytes).is_precomputed
+    assert not DistanceMatrix(coords, memory_budget=matrix_bytes - 1).is_precomputed
+
+
+@pytest.mark.parametrize("metric", ["euclidean", "EUC_2D", "GEO"])
+def test_on_demand_rows_match_the_matrix(metric):
+    coords = random_coords(60, seed=1) if metric != "GEO" else random_coords(60, seed=1) / 20
+    full = DistanceMatrix(coords, metric=metric)
+    # Room for a few rows only
+    lazy = DistanceMatrix(coords, memory_budget=3 * 60 * full.dtype.itemsize, metric=metric)
+    assert full.is_precomputed and not lazy.is_precomputed
+    assert lazy.dtype == full.dtype
+
+    routes = random_routes(20, 60)
+    assert np.allclose(lazy.tour_lengths(routes), full.tour_lengths(routes))
+    assert lazy.tour_length(routes[0]) == pytest.approx(full.tour_length(routes[0]))
+
+    a, b = random_routes(2, 60, seed=2)
+    assert np.allclose(lazy.pair_distances(a, b), full.pair_distances(a, b))
+    assert all(lazy(i, j) == pytest.approx(full(i, j)) for i, j in zip(a, b))
+
+    for i in (0, 5, 10, 5, 20, 30):
+        assert np.allclose(lazy.row(i), full.row(i))
+    assert len(lazy._row_cache) <= 3
+    assert np.array_equal(lazy.nearest_neighbors(8), full.nearest_neighbors(8))
+
+
+def test_genetic_algorithm_on_demand_rows():
+    coords = random_coords(40, seed=3)
+    results = []
+    for budget in (DEFAULT_MEMORY_BUDGET, 0):
+        ga = GeneticAlgorithm(DistanceMatrix(coords, memory_budget=budget),
+                              population_size=20, elite_size=2, seed=4)
+        ga.create_initial_population()
+        for _ in range(5):
+            ga.run_generation()
+        results.append((list(ga.best_route), ga.best_distance))
+    assert results[0][0] == results[1][0]
+    assert results[0][1] == pytest.approx(results[1][1])
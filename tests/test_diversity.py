@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from tsp_solver.genetic import GeneticAlgorithm
+from tsp_solver.genetic.diversity import (tour_hashes, duplicate_rows, edge_entropy,
+                                          population_diversity)
+
+
+def test_tour_hash_is_rotation_and_direction_invariant():
+    route = np.random.default_rng(0).permutation(50).astype(np.int32)
+    hashes = tour_hashes(np.array([route, np.roll(route, 7), route[::-1], np.roll(route[::-1], 3)]))
+    assert len(set(hashes)) == 1
+
+    swapped = route.copy()
+    swapped[[3, 4]] = swapped[[4, 3]]
+    assert tour_hashes(swapped) != tour_hashes(route)
+
+
+def test_duplicate_rows_keeps_first_copy():
+    routes = np.array([[0, 1, 2, 3], [1, 2, 3, 0], [0, 2, 1, 3], [3, 2, 1, 0]])
+    assert list(duplicate_rows(tour_hashes(routes))) == [1, 3]
+
+
+def test_diversity_metrics():
+    rng = np.random.default_rng(1)
+    route = rng.permutation(100)
+    clones = np.tile(route, (10, 1))
+    assert edge_entropy(clones) == pytest.approx(0.0, abs=1e-12)
+    assert population_diversity(clones)["unique_tours"] == 1
+
+    random_routes = np.array([rng.permutation(100) for _ in range(10)])
+    assert edge_entropy(random_routes) > 0.9
+    assert population_diversity(random_routes)["unique_ratio"] == 1.0
+
+
+def test_eliminate_duplicates(make_ga):
+    ga = make_ga(eliminate_duplicates=True, track_diversity=True, mutation_rate=0.0)
+    for _ in range(40):
+        ga.run_generation()
+        assert len(duplicate_rows(ga.route_hashes)) == 0
+        assert np.array_equal(ga.route_hashes, tour_hashes(ga.population))
+        known = ~np.isnan(ga.route_lengths)
+        assert np.allclose(ga.route_lengths[known],
+                           ga.distances.tour_lengths(ga.population[known]))
+    assert len(ga.diversity_history) == 40
+    assert ga.diversity()["unique_tours"] == 30
+
+    # Without elimination the population collapses to copies of a few routes
+    ga = make_ga(track_diversity=True, mutation_rate=0.0)
+    for _ in range(40):
+        ga.run_generation()
+    assert ga.diversity_history[-1]["unique_tours"] < 30
+
+
+def test_partial_restart_keeps_best_route(make_ga):
+    ga = make_ga(restart_threshold=1.0, generations_without_improvement=5)
+    for _ in range(20):
+        ga.run_generation()
+        best = ga.best_distance
+        assert np.nanmin(ga.route_lengths) <= best + 1e-9
+    assert ga.restarts == 3  # At generations 5, 10 and 15
+    assert np.array_equal(ga.route_hashes, tour_hashes(ga.population))
+
+
+def test_checkpoint_keeps_diversity_state(tmp_path, make_ga):
+    ga = make_ga(eliminate_duplicates=True, track_diversity=True, restart_threshold=1.0)
+    for _ in range(25):
+        ga.run_generation()
+    ga.save_checkpoint(str(tmp_path / "run.ckpt"))
+    restored = GeneticAlgorithm.from_checkpoint(str(tmp_path / "run.ckpt"), ga.distances)
+    assert restored.diversity_history == ga.diversity_history
+    assert restored.restarts == ga.restarts
+    assert np.array_equal(restored.route_hashes, ga.route_hashes)
+
+    ga.run_generation()
+    restored.run_generation()
+    assert np.array_equal(restored.population, ga.population)
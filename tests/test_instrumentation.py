@@ -0,0 +1,73 @@
+import csv
+import json
+import numpy as np
+import pytest
+from tsp_solver.genetic.diversity import duplicate_rows, tour_hashes
+from tsp_solver.genetic.instrumentation import PHASES, COUNTERS, Instrumentation
+
+
+def test_instrumentation_does_not_change_the_run(make_ga):
+    plain, instrumented = make_ga(), make_ga(instrument=True)
+    for _ in range(10):
+        plain.run_generation()
+        instrumented.run_generation()
+    assert plain.instrumentation is None
+    assert np.array_equal(plain.population, instrumented.population)
+    assert len(instrumented.instrumentation.rows) == 10
+
+
+def test_observers_receive_phase_and_generation_events(make_ga):
+    ga = make_ga()
+    events = []
+    ga.add_observer(events.append)
+    ga.run_generation()
+
+    phases = [event["name"] for event in events if event["type"] == "phase"]
+    assert phases == ["evaluate", "select", "breed", "stopping"]
+    generation = events[-1]
+    assert generation["type"] == "generation" and generation["generation"] == 0
+    assert generation["counters"]["evaluations"] == ga.population_size
+    assert generation["counters"]["improvements"] == 1
+    assert generation["phases"]["crossover"] > 0 and generation["phases"]["mutate"] > 0
+
+
+def test_exports(tmp_path, make_ga):
+    ga = make_ga(instrument=True)
+    for _ in range(3):
+        ga.run_generation()
+
+    ga.instrumentation.to_csv(tmp_path / "phases.csv")
+    with open(tmp_path / "phases.csv") as f:
+        rows = list(csv.DictReader(f))
+    assert [int(row["generation"]) for row in rows] == [0, 1, 2]
+    assert set(rows[0]) == {"generation", "best_distance", *PHASES, *COUNTERS}
+
+    ga.instrumentation.to_chrome_trace(tmp_path / "trace.json")
+    with open(tmp_path / "trace.json") as f:
+        trace = json.load(f)["traceEvents"]
+    assert sum(event["ph"] == "X" for event in trace) == 12
+    assert sum(event["ph"] == "C" for event in trace) == 3
+
+
+def test_kept_generations_are_bounded(make_ga):
+    ga = make_ga()
+    ga.instrumentation = Instrumentation(kept_generations=4)
+    for _ in range(10):
+        ga.run_generation()
+    assert [row["generation"] for row in ga.instrumentation.rows] == [6, 7, 8, 9]
+    assert len(ga.instrumentation.events) == 4 * len(PHASES)
+    assert ga.instrumentation.events[-1][1] == 9
+    assert ga.instrumentation.summary()["generations"] == 10
+
+
+@pytest.mark.parametrize("track_diversity", [False, True])
+def test_duplicate_children_from_tour_hashes(make_ga, track_diversity):
+    # Measured whether or not the algorithm needs the hashes itself
+    ga = make_ga(instrument=True, track_diversity=track_diversity, mutation_rate=0.0)
+    total = 0
+    for _ in range(20):
+        ga.run_generation()
+        counted = ga.instrumentation.rows[-1]["duplicate_children"]
+        assert counted == len(duplicate_rows(tour_hashes(ga.population)))
+        total += counted
+    assert total > 0
@@ -0,0 +1,58 @@
+import threading
+import multiprocessing
+import numpy as np
+from tsp_solver.core.instance import TSPInstance
+from tsp_solver.genetic.island import IslandModel, _island_process
+
+
+def random_coords(size, seed=0):
+    return np.random.default_rng(seed).uniform(0, 100, (size, 2))
+
+
+def test_instance_input():
+    instance = TSPInstance.from_coords(random_coords(25))
+    with IslandModel(instance, islands=2, migration_interval=3, seed=1,
+                     population_size=16, elite_size=2) as model:
+        route, distance = model.run(7)
+    assert np.array_equal(route, model.best_tour)
+    assert sorted(route.tolist()) == list(range(25))
+    assert distance == min(model.history)
+    assert len(model.history) == model.generation == 7
+    assert all(len(history) == 7 for history in model.island_histories)
+
+
+def test_history_aligned_with_early_stops():
+    instance = TSPInstance.from_coords(random_coords(20))
+    with IslandModel(instance, islands=3, migration_interval=4, seed=2, population_size=10,
+                     elite_size=1, use_stopping_criterion=True, generations_without_improvement=3,
+                     improvement_threshold=0.05) as model:
+        model.run(12)
+    assert len(model.history) == model.generation < 12
+    assert all(len(history) == model.generation for history in model.island_histories)
+    for step, best in enumerate(model.history):
+        assert best == min(history[step] for history in model.island_histories)
+
+
+def test_migration_keeps_permutations():
+    coords = random_coords(15, seed=3)
+    ga_kwargs = {"population_size": 12, "elite_size": 2, "eliminate_duplicates": True}
+    islands = []
+    for seed in range(2):
+        conn, child = multiprocessing.Pipe()
+        thread = threading.Thread(target=_island_process,
+                                  args=(child, TSPInstance.from_coords(coords), ga_kwargs, seed))
+        thread.start()
+        islands.append((conn, thread))
+
+    for _ in range(3):
+        for conn, _ in islands:
+            conn.send(("run", 2, 4))
+        reports = [conn.recv() for conn, _ in islands]
+        for (conn, _), report in zip(islands[::-1], reports):
+            routes, lengths = report[3], report[4]
+            assert all(sorted(route.tolist()) == list(range(15)) for route in routes)
+            conn.send(("migrate", routes, lengths))
+
+    for conn, thread in islands:
+        conn.send(("stop",))
+        thread.join()
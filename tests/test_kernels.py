@@ -0,0 +1,204 @@
+import random
+import numpy as np
+import pytest
+from tsp_solver.core.city import City
+from tsp_solver.core.distance import DistanceMatrix
+from tsp_solver.genetic import kernels
+from tsp_solver.genetic.algorithm import GeneticAlgorithm
+from tsp_solver.genetic.operators import (ordered_crossover_batch, cycle_crossover_batch,
+                                          swap_mutation_batch, insertion_mutation_batch,
+                                          inversion_mutation_batch)
+
+BACKENDS = [
+    "python",
+    pytest.param("numba", marks=pytest.mark.skipif("numba" not in kernels.BACKENDS,
+                                                    reason="numba is not installed")),
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    """Run the test with the operators using each kernel backend in turn"""
+    previous = kernels.backend
+    kernels.use_backend(request.param)
+    yield kernels.get_backend(request.param)
+    kernels.use_backend(previous)
+
+
+def random_parents(rng, size):
+    parent1 = np.array(rng.sample(range(size), size), dtype=np.int32)
+    parent2 = np.array(rng.sample(range(size), size), dtype=np.int32)
+    return parent1, parent2
+
+
+def naive_ordered_crossover(parent1, parent2, start_idx, end_idx):
+    size = len(parent1)
+    child = [None] * size
+    child[start_idx:end_idx + 1] = parent1[start_idx:end_idx + 1]
+    position = (end_idx + 1) % size
+    for k in range(size):
+        city = parent2[(end_idx + 1 + k) % size]
+        if city not in child:
+            child[position] = city
+            position = (position + 1) % size
+    return child
+
+
+def test_ordered_crossover(backend):
+    rng = random.Random(0)
+    for size in (2, 3, 10, 57):
+        for _ in range(20):
+            parent1, parent2 = random_parents(rng, size)
+            start_idx, end_idx = sorted(rng.sample(range(size), 2))
+            child = backend.ordered_crossover(parent1, parent2, start_idx, end_idx)
+            assert child.dtype == parent1.dtype
+            assert list(child) == naive_ordered_crossover(list(parent1), list(parent2),
+                                                          start_idx, end_idx)
+
+
+def naive_cycle_crossover(parent1, parent2):
+    size = len(parent1)
+    child = [None] * size
+    position = {city: i for i, city in enumerate(parent1)}
+    current_pos = 0
+    while True:
+        child[current_pos] = parent1[current_pos]
+        current_pos = position[parent2[current_pos]]
+        if current_pos == 0:
+            break
+    return [city if city is not None else parent2[i] for i, city in enumerate(child)]
+
+
+def test_cycle_crossover(backend):
+    rng = random.Random(1)
+    for size in (2, 10, 57):
+        for _ in range(20):
+            parent1, parent2 = random_parents(rng, size)
+            child = backend.cycle_crossover(parent1, parent2)
+            assert child.dtype == parent1.dtype
+            assert list(child) == naive_cycle_crossover(list(parent1), list(parent2))
+
+
+@pytest.mark.parametrize("crossover_type", ["ordered", "cycle"])
+def test_index_crossovers_match_city_lists(backend, crossover_type):
+    """The index-based operators and batches give the children of the list operators on cities"""
+    rng = random.Random(8)
+    cities = [City(x, y, f"City-{i + 1}") for i, (x, y) in
+              enumerate(np.random.default_rng(8).uniform(0, 100, (30, 2)))]
+    pairs = [random_parents(rng, 30) for _ in range(25)]
+    cut_points = np.array([sorted(rng.sample(range(30), 2)) for _ in pairs], dtype=np.intp)
+    parents1, parents2 = np.array([p[0] for p in pairs]), np.array([p[1] for p in pairs])
+    if crossover_type == "ordered":
+        batch = ordered_crossover_batch(parents1, parents2, cut_points)
+    else:
+        batch = cycle_crossover_batch(parents1, parents2)
+
+    for (parent1, parent2), (start_idx, end_idx), from_batch in zip(pairs, cut_points, batch):
+        city_parents = [cities[i] for i in parent1], [cities[i] for i in parent2]
+        if crossover_type == "ordered":
+            child = backend.ordered_crossover(parent1, parent2, start_idx, end_idx)
+            expected = naive_ordered_crossover(*city_parents, start_idx, end_idx)
+        else:
+            child = backend.cycle_crossover(parent1, parent2)
+            expected = naive_cycle_crossover(*city_parents)
+        assert [cities[i] for i in child] == expected
+        assert np.array_equal(from_batch, child)
+
+
+@pytest.mark.parametrize("operator", [swap_mutation_batch, insertion_mutation_batch,
+                                      inversion_mutation_batch])
+def test_batch_mutations(backend, operator):
+    """Batch mutations keep permutations and exact cached lengths, the same on every backend"""
+    distances = DistanceMatrix(np.random.default_rng(9).uniform(0, 100, (35, 2)))
+    rng = random.Random(9)
+    routes = np.array([random_parents(rng, 35)[0] for _ in range(40)])
+    lengths = distances.tour_lengths(routes)
+    tracked, plain = routes.copy(), routes.copy()
+    for step in range(10):
+        operator(tracked, 0.2, np.random.default_rng(step), distances=distances, lengths=lengths)
+        operator(plain, 0.2, np.random.default_rng(step))
+        assert np.array_equal(np.sort(tracked, axis=1), np.sort(routes, axis=1))
+        assert np.allclose(lengths, distances.tour_lengths(tracked), rtol=0, atol=1e-9)
+        assert np.array_equal(tracked, plain)
+
+    kernels.use_backend("python")
+    expected = routes.copy()
+    for step in range(10):
+        operator(expected, 0.2, np.random.default_rng(step))
+    assert np.array_equal(plain, expected)
+
+
+def test_route_kernels(backend):
+    route = np.arange(8, dtype=np.int32)
+    backend.swap_positions(route, np.array([[0, 7], [7, 3]], dtype=np.intp))
+    assert list(route) == [7, 1, 2, 0, 4, 5, 6, 3]
+
+    route = np.arange(8, dtype=np.int32)
+    backend.move_position(route, 1, 5)
+    assert list(route) == [0, 2, 3, 4, 5, 1, 6, 7]
+    backend.move_position(route, 5, 1)
+    assert list(route) == list(range(8))
+
+    backend.reverse_segment(route, 2, 6)
+    assert list(route) == [0, 1, 6, 5, 4, 3, 2, 7]
+
+
+def test_eax_intermediate(backend):
+    rng = random.Random(6)
+    draws = np.random.default_rng(6).random(2 * 60)
+    for block in (False, True):
+        parent1, parent2 = random_parents(rng, 60)
+        links, labels, count = backend.eax_intermediate(parent1, parent2, block, draws)
+        parent_edges = {frozenset((tour[k - 1], tour[k])) for tour in (parent1, parent2)
+                        for k in range(60)}
+        for city in range(60):
+            assert all(city in links[other] for other in links[city])
+            assert all(frozenset((city, other)) in parent_edges for other in links[city])
+        assert sorted(set(labels)) == list(range(count))
+
+        tour = backend.links_to_tour(links, parent1[0])
+        assert (count == 1) == (sorted(tour) == list(range(60)))
+
+
+def test_edge_recombination(backend):
+    rng = random.Random(7)
+    parent1, parent2 = random_parents(rng, 57)
+    child = backend.edge_recombination(parent1, parent2, np.random.default_rng(7).random(57))
+    assert sorted(child) == list(range(57))
+    assert child[0] == parent1[0]
+
+
+@pytest.mark.parametrize("dtype", [np.int32, np.float32, np.float64])
+def test_tour_length(backend, dtype):
+    coords = np.random.default_rng(2).uniform(0, 1000, (300, 2))
+    matrix = DistanceMatrix(coords).matrix.astype(dtype)
+    tour = np.random.default_rng(3).permutation(300).astype(np.int32)
+
+    expected = 0.0
+    for k in range(len(tour)):
+        expected += float(matrix[tour[k], tour[(k + 1) % len(tour)]])
+    assert backend.tour_length(tour, matrix) == expected
+
+
+@pytest.mark.parametrize("crossover_type", ["ordered", "cycle", "eax", "eax_block", "erx"])
+@pytest.mark.parametrize("mutation_type", ["swap", "insertion", "inversion"])
+def test_seeded_run_matches_reference(backend, crossover_type, mutation_type):
+    """Every backend gives the routes of the reference backend for a given seed"""
+    coords = np.random.default_rng(4).uniform(0, 100, (40, 2))
+
+    def run():
+        ga = GeneticAlgorithm(DistanceMatrix(coords), population_size=30, elite_size=3,
+                              mutation_rate=0.05, crossover_type=crossover_type,
+                              mutation_type=mutation_type, crossover_rate=0.8, seed=5)
+        ga.create_initial_population()
+        for _ in range(15):
+            ga.run_generation()
+        return ga.population.copy(), ga.route_lengths.copy(), ga.calculate_distance(ga.best_tour)
+
+    population, lengths, best = run()
+    kernels.use_backend("python")
+    expected_population, expected_lengths, expected_best = run()
+
+    assert np.array_equal(population, expected_population)
+    assert np.array_equal(lengths, expected_lengths, equal_nan=True)
+    assert best == expected_best
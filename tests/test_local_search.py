@@ -0,0 +1,130 @@
+import time
+import numpy as np
+import pytest
+from tsp_solver.core.distance import DistanceMatrix
+from tsp_solver.genetic import algorithm
+from tsp_solver.genetic.local_search import _Budget, local_search, or_opt, two_opt
+
+MODES = ["children", "elites", "sample"]
+
+
+def random_routes(count, size, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.array([rng.permutation(size) for _ in range(count)], dtype=np.int32)
+
+
+@pytest.mark.parametrize("improve", [two_opt, or_opt, local_search])
+@pytest.mark.parametrize("size", [4, 6, 40])
+def test_kernels_keep_permutations_and_deltas(improve, size):
+    distances = DistanceMatrix(np.random.default_rng(size).uniform(0, 100, (size, 2)))
+    neighbors = distances.nearest_neighbors(min(8, size - 1))
+    for tour in random_routes(10, size):
+        before = distances.tour_length(tour)
+        result = improve(tour, distances, neighbors)
+        delta = result[0] if improve is local_search else result
+
+        assert sorted(tour.tolist()) == list(range(size))
+        assert delta <= 0
+        assert distances.tour_length(tour) == pytest.approx(before + delta)
+
+
+def test_local_search_reaches_a_two_opt_optimum():
+    distances = DistanceMatrix(np.random.default_rng(3).uniform(0, 100, (60, 2)))
+    neighbors = distances.nearest_neighbors(8)
+    tour = random_routes(1, 60)[0]
+    local_search(tour, distances, neighbors)
+    assert two_opt(tour, distances, neighbors) == 0
+    assert or_opt(tour, distances, neighbors) == 0
+
+
+@pytest.mark.parametrize("max_moves", [0, 1, 5])
+def test_local_search_move_budget(max_moves):
+    distances = DistanceMatrix(np.random.default_rng(4).uniform(0, 100, (50, 2)))
+    neighbors = distances.nearest_neighbors(8)
+    tour = random_routes(1, 50)[0]
+    before = distances.tour_length(tour)
+    delta, moves = local_search(tour, distances, neighbors, max_moves=max_moves)
+    assert moves == max_moves  # A random tour has far more improving moves
+    assert distances.tour_length(tour) == pytest.approx(before + delta)
+
+
+def test_local_search_past_deadline_does_nothing():
+    distances = DistanceMatrix(np.random.default_rng(5).uniform(0, 100, (30, 2)))
+    tour = random_routes(1, 30)[0]
+    original = tour.copy()
+    delta, moves = local_search(tour, distances, distances.nearest_neighbors(8),
+                                deadline=time.perf_counter())
+    assert (delta, moves) == (0, 0)
+    assert np.array_equal(tour, original)
+
+
+def test_shared_budget_counts_both_passes():
+    distances = DistanceMatrix(np.random.default_rng(6).uniform(0, 100, (40, 2)))
+    neighbors = distances.nearest_neighbors(8)
+    tour = random_routes(1, 40)[0]
+    budget = _Budget(max_moves=3)
+    two_opt(tour, distances, neighbors, budget)
+    or_opt(tour, distances, neighbors, budget=budget)
+    assert budget.moves == 3
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_improve_keeps_permutations_and_exact_lengths(make_ga, mode):
+    ga = make_ga(local_search=mode, local_search_fraction=0.2)
+    routes = ga.population.copy()
+    lengths = ga.distances.tour_lengths(routes)
+    before = lengths.copy()
+    ga.improve(routes, lengths, elite_count=3)
+
+    assert np.array_equal(np.sort(routes, axis=1), np.sort(ga.population, axis=1))
+    assert np.all(lengths <= before + 1e-9)
+    assert np.allclose(lengths, ga.distances.tour_lengths(routes))
+
+    changed = np.flatnonzero((routes != ga.population).any(axis=1))
+    assert len(changed)
+    if mode == "children":
+        assert changed.min() >= 3
+    elif mode == "elites":
+        assert changed.max() < 3
+    else:
+        assert len(changed) <= round(0.2 * ga.population_size)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_improve_move_budget(make_ga, monkeypatch, mode):
+    applied = []
+
+    def counting(*args, **kwargs):
+        delta, moves = local_search(*args, **kwargs)
+        applied.append(moves)
+        return delta, moves
+    monkeypatch.setattr(algorithm, "improve_route", counting)
+
+    ga = make_ga(local_search=mode, local_search_fraction=0.5, local_search_moves=7)
+    routes = ga.population.copy()
+    lengths = ga.distances.tour_lengths(routes)
+    ga.improve(routes, lengths, elite_count=3)
+    assert sum(applied) == 7
+    assert np.allclose(lengths, ga.distances.tour_lengths(routes))
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_improve_time_budget(make_ga, mode):
+    ga = make_ga(local_search=mode, local_search_fraction=0.5, local_search_time=0.0)
+    routes = ga.population.copy()
+    lengths = ga.distances.tour_lengths(routes)
+    ga.improve(routes, lengths, elite_count=3)
+    assert np.array_equal(routes, ga.population)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_generations_keep_exact_lengths(make_ga, mode):
+    ga = make_ga(local_search=mode, local_search_moves=50)
+    best = []
+    for _ in range(4):
+        ga.run_generation()
+        best.append(ga.best_distance)
+    ga.update_route_lengths()
+    assert all(sorted(route.tolist()) == list(range(40)) for route in ga.population)
+    assert np.allclose(ga.route_lengths, ga.distances.tour_lengths(ga.population))
+    assert best == sorted(best, reverse=True)
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from tsp_solver.core.distance import DistanceMatrix
+from tsp_solver.genetic import GeneticAlgorithm
+from tsp_solver.genetic.operators import (swap_mutation_batch, insertion_mutation_batch,
+                                          inversion_mutation_batch)
+
+BATCH_OPERATORS = [swap_mutation_batch, insertion_mutation_batch, inversion_mutation_batch]
+
+
+def random_routes(count, size, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.array([rng.permutation(size) for _ in range(count)], dtype=np.int32)
+
+
+@pytest.mark.parametrize("operator", BATCH_OPERATORS)
+@pytest.mark.parametrize("size", [2, 3, 40])
+def test_batch_mutation_keeps_permutations_and_lengths(operator, size):
+    rng = np.random.default_rng(1)
+    distances = DistanceMatrix(rng.uniform(0, 100, (size, 2)))
+    for _ in range(50):
+        routes = random_routes(12, size, seed=int(rng.integers(1 << 30)))
+        original = routes.copy()
+        lengths = distances.tour_lengths(routes)
+        lengths[::3] = np.nan  # Unknown lengths stay unknown
+        mutated = operator(routes, 0.5, rng, distances=distances, lengths=lengths)
+
+        assert np.array_equal(np.sort(routes, axis=1), np.sort(original, axis=1))
+        changed = np.flatnonzero((routes != original).any(axis=1))
+        assert set(changed) <= set(mutated.tolist())
+        assert np.all(np.isnan(lengths[::3]))
+        known = ~np.isnan(lengths)
+        assert np.allclose(lengths[known], distances.tour_lengths(routes)[known])
+
+
+@pytest.mark.parametrize("operator", BATCH_OPERATORS)
+def test_batch_mutation_without_distances_marks_lengths_unknown(operator):
+    routes = random_routes(20, 30)
+    lengths = np.ones(20)
+    mutated = operator(routes, 1.0, np.random.default_rng(2), lengths=lengths)
+    assert len(mutated)
+    assert np.all(np.isnan(lengths[mutated]))
+    assert np.all(np.delete(lengths, mutated) == 1)
+
+
+@pytest.mark.parametrize("operator", BATCH_OPERATORS)
+def test_batch_mutation_is_reproducible(operator):
+    first, second = random_routes(30, 50), random_routes(30, 50)
+    operator(first, 0.3, np.random.default_rng(7))
+    operator(second, 0.3, np.random.default_rng(7))
+    assert np.array_equal(first, second)
+
+
+def test_swap_mutation_batch_same_swaps_with_lengths():
+    # Applied in rounds when costing, the swaps must give the kernel's routes
+    distances = DistanceMatrix(np.random.default_rng(5).uniform(0, 100, (20, 2)))
+    first, second = random_routes(25, 20), random_routes(25, 20)
+    lengths = distances.tour_lengths(second)
+    swap_mutation_batch(first, 0.3, np.random.default_rng(6))
+    swap_mutation_batch(second, 0.3, np.random.default_rng(6), distances=distances, lengths=lengths)
+    assert np.array_equal(first, second)
+    assert np.allclose(lengths, distances.tour_lengths(second))
+
+
+def test_swap_mutation_batch_rate():
+    routes = random_routes(200, 100)
+    rng = np.random.default_rng(3)
+    original = routes.copy()
+    swap_mutation_batch(routes, 0.01, rng)
+    # About 200 swaps (less the ones drawing their own position), each moving two cities
+    moved = np.count_nonzero(routes != original)
+    assert 250 < moved < 550
+    assert not len(swap_mutation_batch(routes, 0.0, rng))
+
+
+@pytest.mark.parametrize("mutation_type", ["swap", "insertion", "inversion"])
+def test_genetic_algorithm_cached_lengths_stay_exact(mutation_type):
+    coords = np.random.default_rng(4).uniform(0, 100, (30, 2))
+    ga = GeneticAlgorithm(DistanceMatrix(coords), population_size=30, elite_size=3,
+                          mutation_type=mutation_type, mutation_rate=0.3, crossover_rate=0.5, seed=4)
+    ga.create_initial_population()
+    for _ in range(20):
+        ga.run_generation()
+    known = ~np.isnan(ga.route_lengths)
+    assert known.any()
+    assert np.allclose(ga.route_lengths[known], ga.distances.tour_lengths(ga.population)[known])
+
+
+@pytest.mark.parametrize("mutation_type", ["swap", "insertion", "inversion"])
+def test_genetic_algorithm_mutate_returns_the_route(make_ga, mutation_type):
+    ga = make_ga(mutation_type=mutation_type, mutation_rate=1.0)
+    route = ga.population[0].copy()
+    mutated = ga.mutate(route)
+    assert mutated is route
+    assert sorted(route) == list(range(ga.num_cities))
+    assert not np.array_equal(route, ga.population[0])
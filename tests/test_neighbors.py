@@ -0,0 +1,44 @@
+import os
+import numpy as np
+import pytest
+from tsp_solver.core.neighbors import build_neighbor_index, neighbor_cache_path
+from tsp_solver.core.tsplib_importer import TSPLibImporter
+
+
+def candidate_distances(coords, neighbors):
+    return np.linalg.norm(coords[neighbors] - coords[:, None, :], axis=2)
+
+
+@pytest.mark.parametrize("k", [1, 5, 12])
+def test_grid_matches_kdtree(k):
+    coords = np.random.default_rng(k).uniform(0, 1000, (700, 2))
+    kdtree = build_neighbor_index(coords, k, "kdtree")
+    grid = build_neighbor_index(coords, k, "grid")
+    assert grid.shape == kdtree.shape == (700, k)
+    # Ties may be ordered differently, the candidate distances may not
+    assert np.allclose(candidate_distances(coords, grid), candidate_distances(coords, kdtree))
+    assert not np.any(grid == np.arange(700)[:, None])
+
+
+def write_instance(path, coords):
+    lines = [f"NAME : {path.stem}", "TYPE : TSP", f"DIMENSION : {len(coords)}",
+             "EDGE_WEIGHT_TYPE : EUC_2D", "NODE_COORD_SECTION"]
+    lines += [f"{i + 1} {x} {y}" for i, (x, y) in enumerate(coords)]
+    path.write_text("\n".join(lines + ["EOF", ""]))
+
+
+def test_disk_cache_is_opt_in(tmp_path):
+    coords = np.random.default_rng(0).uniform(0, 100, (50, 2))
+    path = tmp_path / "random50.tsp"
+    write_instance(path, coords)
+    instance = TSPLibImporter.load(str(path), use_cache=False)
+    neighbors = instance.nearest_neighbors(6)
+    assert os.listdir(tmp_path) == ["random50.tsp"]
+
+    cache_dir = tmp_path / "cache"
+    instance = TSPLibImporter.load(str(path), use_cache=False)
+    cached = instance.nearest_neighbors(6, cache_dir=str(cache_dir))
+    cache_path = neighbor_cache_path(str(path), 6, str(cache_dir))
+    assert os.path.exists(cache_path)
+    assert np.array_equal(np.load(cache_path), neighbors)
+    assert np.array_equal(cached, neighbors)
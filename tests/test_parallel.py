@@ -0,0 +1,44 @@
+from multiprocessing import shared_memory
+import numpy as np
+import pytest
+
+
+def run_parallel(make_ga, workers, generations=3, **kwargs):
+    with make_ga(population_size=40, workers=workers, **kwargs) as ga:
+        for _ in range(generations):
+            ga.run_generation()
+        return ga.population.copy(), ga.route_lengths.copy(), ga.distances
+
+
+def test_same_seed_same_offspring(make_ga):
+    routes, lengths, _ = run_parallel(make_ga, workers=2)
+    again_routes, again_lengths, _ = run_parallel(make_ga, workers=2)
+    assert np.array_equal(routes, again_routes)
+    assert np.array_equal(lengths, again_lengths)
+
+    # The chunks do not depend on the pool size
+    other_routes, other_lengths, _ = run_parallel(make_ga, workers=3)
+    assert np.array_equal(routes, other_routes)
+    assert np.array_equal(lengths, other_lengths)
+
+
+@pytest.mark.parametrize("crossover_type", ["ordered", "erx"])
+def test_cached_lengths_are_exact(make_ga, crossover_type):
+    routes, lengths, distances = run_parallel(make_ga, workers=2, crossover_type=crossover_type)
+    assert all(sorted(route.tolist()) == list(range(40)) for route in routes)
+    assert not np.isnan(lengths).any()
+    assert np.allclose(lengths, distances.tour_lengths(routes))
+
+
+def test_close_releases_shared_memory(make_ga):
+    ga = make_ga(population_size=20, workers=2)
+    ga.run_generation()
+    names = [block.name for block in ga._parallel.blocks]
+    assert names
+    shared_memory.SharedMemory(name=names[0]).close()  # Alive while the pool runs
+
+    ga.close()
+    assert ga._parallel is None
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
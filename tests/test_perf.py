@@ -0,0 +1,25 @@
+from tests.perf_bench import PerfBench, compare
+
+
+def test_perf_bench_reports_every_benchmark():
+    bench = PerfBench(instances=["burma14"], population_size=10, generations=2, repeats=1)
+    results = bench.run(verbose=False)
+
+    assert results["burma14/generation"]["generations_per_second"] > 0
+    for benchmark in ("evaluation_per_individual", "tournament_selection", "elitism_selection",
+                      "ordered_crossover", "cycle_crossover", "swap_mutation",
+                      "insertion_mutation", "inversion_mutation"):
+        assert results[f"burma14/{benchmark}"]["seconds"] > 0
+    assert bench.report()["meta"]["kernels"] in ("python", "numba")
+
+
+def test_compare_flags_slowdowns_above_threshold():
+    baseline = {"a/generation": {"seconds": 1.0}, "a/swap_mutation": {"seconds": 2.0}}
+    results = {"a/generation": {"seconds": 1.2}, "a/swap_mutation": {"seconds": 3.0},
+               "a/new_benchmark": {"seconds": 5.0}}
+
+    regressions = compare(results, baseline, threshold=0.25)
+
+    assert [regression[0] for regression in regressions] == ["a/swap_mutation"]
+    assert regressions[0][3] == 1.5
+    assert compare(results, baseline, threshold=0.6) == []
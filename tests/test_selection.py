@@ -0,0 +1,60 @@
+import math
+import numpy as np
+import pytest
+from tsp_solver.core.distance import DistanceMatrix
+from tsp_solver.genetic import GeneticAlgorithm
+from tsp_solver.genetic.operators import (elitism_selection, tournament_selection_batch,
+                                          rank_selection, stochastic_universal_sampling)
+
+
+def test_elitism_selection_matches_a_full_sort():
+    fitness = np.random.default_rng(0).integers(0, 20, 200).astype(float)
+    expected = sorted(range(len(fitness)), key=lambda i: fitness[i], reverse=True)[:15]
+    assert list(elitism_selection(fitness, 15)) == expected
+    assert len(elitism_selection(fitness, 500)) == 200
+
+
+def test_tournament_selection_batch_picks_the_fittest_candidate():
+    fitness = np.arange(50, dtype=float)
+    selected = tournament_selection_batch(fitness, 1000, 50, np.random.default_rng(1))
+    assert selected.shape == (1000,)
+    # The candidates are distinct: with all 50 in every tournament, the best always wins
+    assert np.all(selected == 49)
+    assert np.all(tournament_selection_batch(fitness, 100, 1, np.random.default_rng(1)) < 50)
+
+
+@pytest.mark.parametrize("n, k", [(10, 3), (10, 6), (30, 4)])  # Both ways of drawing
+def test_tournament_selection_batch_distribution(n, k):
+    # Without replacement, the individual with i worse ones wins with
+    # probability C(i, k - 1) / C(n, k)
+    fitness = np.random.default_rng(5).permutation(n).astype(float)
+    selected = tournament_selection_batch(fitness, 200000, k, np.random.default_rng(6))
+    counts = np.bincount(selected, minlength=n)
+    expected = np.array([math.comb(int(worse), k - 1) for worse in fitness]) / math.comb(n, k)
+    assert np.allclose(counts / counts.sum(), expected, atol=0.005)
+
+
+def test_rank_selection_favours_better_ranks():
+    fitness = np.array([1e-9, 1e-3, 1.0, 1e6])  # Scale does not matter, only the order
+    counts = np.bincount(rank_selection(fitness, 100000, np.random.default_rng(2)), minlength=4)
+    assert np.allclose(counts / counts.sum(), [0.1, 0.2, 0.3, 0.4], atol=0.01)
+
+
+def test_stochastic_universal_sampling_is_close_to_expected_counts():
+    fitness = np.array([1.0, 2.0, 3.0, 4.0])
+    counts = np.bincount(stochastic_universal_sampling(fitness, 20, np.random.default_rng(3)),
+                         minlength=4)
+    # Expected counts are 2, 4, 6 and 8: SUS never deviates by one or more
+    assert list(counts) == [2, 4, 6, 8]
+
+
+@pytest.mark.parametrize("selection_type", ["tournament", "rank", "sus"])
+def test_genetic_algorithm_selection_types(selection_type):
+    coords = np.random.default_rng(4).uniform(0, 100, (25, 2))
+    ga = GeneticAlgorithm(DistanceMatrix(coords), population_size=30, elite_size=4,
+                          selection_type=selection_type, seed=5)
+    ga.create_initial_population()
+    fitness, _ = ga.evaluate_population()
+    routes, lengths = ga.select_parents(fitness)
+    assert routes.shape == ga.population.shape
+    assert lengths[0] == ga.route_lengths.min()
@@ -0,0 +1,76 @@
+import time
+import numpy as np
+import pytest
+from tsp_solver.genetic.algorithm import GeneticAlgorithm
+
+
+def test_generation_cap(cities):
+    ga = GeneticAlgorithm(cities, population_size=20, elite_size=2, seed=1)
+    route, distance, reason = ga.solve(max_generations=15)
+    assert reason == "generations" and ga.stop_reason == reason
+    assert ga.generation == 15
+    assert distance == ga.best_distance == pytest.approx(ga.calculate_distance(ga.best_tour))
+    assert [city.name for city in route] == [cities[i].name for i in ga.best_tour]
+
+
+def test_same_result_as_run_generation(cities):
+    ga = GeneticAlgorithm(cities, population_size=20, elite_size=2, seed=1)
+    _, distance, _ = ga.solve(max_generations=10)
+
+    manual = GeneticAlgorithm(cities, population_size=20, elite_size=2, seed=1)
+    manual.create_initial_population()
+    for _ in range(10):
+        manual.run_generation()
+    manual.evaluate_population()
+    assert distance == manual.best_distance
+    assert np.array_equal(ga.population, manual.population)
+
+
+def test_histories_once_per_generation(cities):
+    ga = GeneticAlgorithm(cities, population_size=20, elite_size=2, seed=1, track_diversity=True)
+    ga.solve(max_generations=10)
+    assert len(ga.history) == len(ga.diversity_history) == 10
+    assert ga.best_distance == min(ga.update_route_lengths()) <= ga.history[-1]
+
+    ga.solve(max_generations=10)  # Nothing to run: the last generation is not recorded twice
+    ga.solve(max_generations=12)
+    assert len(ga.history) == len(ga.diversity_history) == 12
+
+
+def test_deadline(cities):
+    ga = GeneticAlgorithm(cities, population_size=20, elite_size=2, seed=1)
+    start = time.perf_counter()
+    _, distance, reason = ga.solve(time_limit=0.2, max_generations=10**9)
+    assert reason == "deadline"
+    assert time.perf_counter() - start < 0.5
+    assert np.isfinite(distance)
+
+
+def test_target(cities):
+    ga = GeneticAlgorithm(cities, population_size=20, elite_size=2, seed=1)
+    ga.create_initial_population()
+    ga.evaluate_population()
+    target = ga.best_distance * 0.9
+    _, distance, reason = ga.solve(target_length=target, max_generations=10**4)
+    assert reason == "target"
+    assert distance <= target
+
+
+def test_target_gap(cities):
+    ga = GeneticAlgorithm(cities, population_size=20, elite_size=2, seed=1)
+    ga.create_initial_population()
+    ga.evaluate_population()
+    # Already within 50% of a target a third shorter than the best route
+    _, _, reason = ga.solve(target_length=ga.best_distance / 1.4, target_gap=0.5, max_generations=5)
+    assert reason == "target"
+    assert ga.generation == 0
+
+
+def test_stagnation(cities):
+    ga = GeneticAlgorithm(cities, population_size=20, elite_size=2, seed=1,
+                          use_stopping_criterion=True, generations_without_improvement=5,
+                          improvement_threshold=1.0)
+    _, _, reason = ga.solve(max_generations=100)
+    assert reason == "stagnation"
+    assert ga.generation == 6
+    assert len(ga.last_best_distances) == 5
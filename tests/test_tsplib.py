@@ -0,0 +1,75 @@
+import os
+import numpy as np
+import pytest
+from tsp_solver.core.tsplib_importer import TSPLibImporter, cache_file
+
+INSTANCES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "instances")
+
+# Optimal tours of TSPLIB (the .opt.tour files, as node numbers) and their lengths
+OPTIMAL_TOURS = {
+    # GEO
+    "ulysses16": (6859, "1 14 13 12 7 6 15 5 11 9 10 16 3 2 4 8"),
+    # ATT
+    "att48": (10628, "1 8 38 31 44 18 7 28 6 37 19 27 17 43 30 36 46 33 20 47 21 32 39 48 "
+                     "5 42 24 10 45 35 4 26 2 29 34 41 16 22 3 23 14 25 13 11 12 15 40 9"),
+    # EXPLICIT, LOWER_DIAG_ROW
+    "gr24": (1272, "16 11 3 7 6 24 8 21 5 10 17 22 18 19 15 2 20 14 13 9 23 4 12 1"),
+    # EXPLICIT, FULL_MATRIX
+    "fri26": (937, "1 25 24 23 26 22 21 17 18 20 19 16 11 12 13 15 14 10 9 8 7 5 6 4 3 2"),
+}
+
+
+@pytest.mark.parametrize("name", sorted(OPTIMAL_TOURS))
+def test_optimal_tour_lengths(name):
+    length, nodes = OPTIMAL_TOURS[name]
+    instance = TSPLibImporter.load(os.path.join(INSTANCES_DIR, f"{name}.tsp"), use_cache=False)
+    tour = np.array([int(node) - 1 for node in nodes.split()])
+    assert sorted(tour) == list(range(instance.dimension))
+    assert instance.tour_length(tour) == length
+    assert instance.distances.tour_lengths(tour[None, :])[0] == length
+
+
+def copy_instance(tmp_path, name="berlin52"):
+    path = tmp_path / f"{name}.tsp"
+    with open(os.path.join(INSTANCES_DIR, f"{name}.tsp")) as f:
+        path.write_text(f.read())
+    return str(path)
+
+
+def test_cache_is_rebuilt_when_the_instance_changes(tmp_path):
+    path = copy_instance(tmp_path)
+    cache_dir = str(tmp_path / "cache")
+    first = TSPLibImporter.load(path, cache_dir=cache_dir)
+    cache_path = cache_file(path, cache_dir)
+    assert os.path.exists(cache_path)
+    assert np.array_equal(TSPLibImporter.load(path, cache_dir=cache_dir).coords, first.coords)
+
+    # Same size, new modification time: the edited coordinates are read
+    with open(path) as f:
+        text = f.read()
+    with open(path, "w") as f:
+        f.write(text.replace("\n1 565.0 575.0\n", "\n1 999.0 575.0\n"))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    changed = TSPLibImporter.load(path, cache_dir=cache_dir)
+    assert changed.coords[0, 0] == 999.0
+    assert np.array_equal(changed.coords[1:], first.coords[1:])
+    assert TSPLibImporter.load(path, cache_dir=cache_dir).coords[0, 0] == 999.0
+
+
+@pytest.mark.filterwarnings("error::ResourceWarning")
+@pytest.mark.parametrize("damage", ["truncate", "garbage"])
+def test_corrupt_cache_falls_back_to_parsing(tmp_path, damage):
+    path = copy_instance(tmp_path)
+    cache_dir = str(tmp_path / "cache")
+    expected = TSPLibImporter.load(path, cache_dir=cache_dir)
+    cache_path = cache_file(path, cache_dir)
+    with open(cache_path, "rb") as f:
+        data = f.read()
+    with open(cache_path, "wb") as f:
+        f.write(data[:len(data) // 2] if damage == "truncate" else b"\x00" * len(data))
+
+    instance = TSPLibImporter.load(path, cache_dir=cache_dir)
+    assert np.array_equal(instance.coords, expected.coords)
+    # The damaged file is replaced by a good one
+    assert TSPLibImporter._load_cached(path, cache_path) is not None
@@ -0,0 +1,5 @@
+# tsp_solver/__main__.py
+import sys
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,262 @@
+"""
+Headless batch solver.
+
+Solves one or many TSPLIB files concurrently and streams one JSON object
+per instance on standard output (JSON lines):
+
+    python -m tsp_solver instances/*.tsp --time-limit 30 --seed 1 --jobs 4
+
+Only the core and genetic packages are imported (no PyQt5, no
+matplotlib), so it starts quickly on servers.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+from .core.tsplib_importer import TSPLibImporter
+from .genetic.algorithm import GeneticAlgorithm
+from .genetic.decomposition import DecompositionSolver
+
+# Default value of every setting, also the keys accepted in a config file
+DEFAULTS = {
+    "population_size": 100,
+    "elite_size": 20,
+    "mutation_rate": 0.01,
+    "tournament_size": 5,
+    "crossover_type": "ordered",
+    "mutation_type": "swap",
+    "crossover_rate": 1.0,
+    "selection_type": "tournament",
+    "local_search": None,
+    "eliminate_duplicates": False,
+    "restart_threshold": None,
+    "adaptive": False,
+    "stagnation": None,
+    "decompose": False,
+    "cluster_size": 200,
+    "partition": "kmeans",
+    "generations": 1000,
+    "time_limit": None,
+    "target": None,
+    "target_gap": 0.0,
+    "seed": None,
+    "jobs": None,
+    "tour": True,
+}
+
+# Settings passed as they are to GeneticAlgorithm
+GA_SETTINGS = ("population_size", "elite_size", "mutation_rate", "tournament_size",
+               "crossover_type", "mutation_type", "crossover_rate", "selection_type",
+               "local_search", "eliminate_duplicates", "restart_threshold", "adaptive")
+
+
+def expand_instances(patterns):
+    """
+    Instance files matching the given paths or glob patterns, in order and without duplicates.
+
+    Raises:
+        FileNotFoundError: If a pattern matches no file
+    """
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        matches = [path for path in matches if os.path.isfile(path)]
+        if not matches:
+            raise FileNotFoundError(f"No instance file matches {pattern}")
+        paths.extend(path for path in matches if path not in paths)
+    return paths
+
+
+def load_config(path):
+    """
+    Settings of a JSON or TOML config file.
+
+    TOML needs Python 3.11+ or the tomli package.
+
+    Raises:
+        ValueError: If the file has unknown settings, or is a TOML file
+            that cannot be read by this interpreter
+    """
+    if path.endswith(".toml"):
+        if tomllib is None:
+            raise ValueError(f"TOML configs need Python 3.11+ or the tomli package: {path}")
+        with open(path, "rb") as f:
+            config = tomllib.load(f)
+    else:
+        with open(path, "r") as f:
+            config = json.load(f)
+
+    config = {key.replace("-", "_"): value for key, value in config.items()}
+    unknown = sorted(set(config) - set(DEFAULTS))
+    if unknown:
+        raise ValueError(f"Unknown settings in {path}: {', '.join(unknown)}")
+    return config
+
+
+def solve_file(path, settings):
+    """
+    Solve one instance file with the given settings.
+
+    Runs until the generation cap, the time limit, the target length or
+    the stagnation criterion is reached, whichever comes first.
+
+    Returns:
+        dict: JSON-serializable result of the run
+    """
+    start = time.perf_counter()
+    instance = TSPLibImporter.load(path)
+    if settings["decompose"]:
+        return _decompose_file(path, instance, settings, start)
+    ga_kwargs = {key: settings[key] for key in GA_SETTINGS}
+    if settings["stagnation"]:
+        ga_kwargs.update(use_stopping_criterion=True,
+                         generations_without_improvement=settings["stagnation"])
+
+    deadline = None
+    if settings["time_limit"] is not None:
+        deadline = start + settings["time_limit"]
+
+    with GeneticAlgorithm(instance.distances, seed=settings["seed"], **ga_kwargs) as ga:
+        ga.solve(deadline=deadline, max_generations=settings["generations"],
+                 target_length=settings["target"], target_gap=settings["target_gap"])
+
+    result = {
+        "instance": path,
+        "name": instance.name,
+        "dimension": instance.dimension,
+        "best_length": ga.best_distance,
+        "generations": ga.generation,
+        "stop_reason": ga.stop_reason,
+        "wall_time": round(time.perf_counter() - start, 6),
+        "seed": settings["seed"],
+    }
+    if settings["tour"]:
+        # TSPLIB node numbers, starting at 1
+        result["tour"] = [int(city) + 1 for city in ga.best_tour]
+    return result
+
+
+def _solve_or_report(path, settings):
+    try:
+        return solve_file(path, settings)
+    except Exception as e:
+        return {"instance": path, "error": str(e)}
+
+
+def _decompose_file(path, instance, settings, start):
+    """solve_file in decomposition mode: the GA settings changed from DEFAULTS apply to the clusters"""
+    ga_kwargs = {key: settings[key] for key in GA_SETTINGS if settings[key] != DEFAULTS[key]}
+    solver = DecompositionSolver(instance, cluster_size=settings["cluster_size"],
+                                 partition=settings["partition"], seed=settings["seed"], **ga_kwargs)
+    solver.solve(time_limit=settings["time_limit"])
+
+    result = {
+        "instance": path,
+        "name": instance.name,
+        "dimension": instance.dimension,
+        "best_length": solver.best_distance,
+        "generations": None,
+        "stop_reason": None,
+        "wall_time": round(time.perf_counter() - start, 6),
+        "seed": settings["seed"],
+        "timings": {stage: round(seconds, 6) for stage, seconds in solver.timings.items()},
+    }
+    if settings["tour"]:
+        result["tour"] = [int(city) + 1 for city in solver.best_tour]
+    return result
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="tsp-solver-batch",
+        description="Solve TSPLIB instances with the genetic algorithm and print "
+                    "one JSON result per line.")
+    parser.add_argument("instances", nargs="+", help=".tsp files or glob patterns")
+    parser.add_argument("--config", help="JSON or TOML file with default settings")
+
+    ga = parser.add_argument_group("genetic algorithm")
+    ga.add_argument("--population-size", type=int)
+    ga.add_argument("--elite-size", type=int)
+    ga.add_argument("--mutation-rate", type=float)
+    ga.add_argument("--tournament-size", type=int)
+    ga.add_argument("--crossover-type", choices=["ordered", "cycle", "eax", "eax_block", "erx"])
+    ga.add_argument("--mutation-type", choices=["swap", "insertion", "inversion"])
+    ga.add_argument("--crossover-rate", type=float)
+    ga.add_argument("--selection-type", choices=["tournament", "rank", "sus"])
+    ga.add_argument("--local-search", choices=["children", "elites", "sample"])
+    ga.add_argument("--eliminate-duplicates", action="store_const", const=True,
+                    help="Re-mutate children that repeat a tour of their generation")
+    ga.add_argument("--adaptive", action="store_const", const=True,
+                    help="Choose the operators and the mutation rate of every generation "
+                         "from the improvements they produce")
+    ga.add_argument("--restart-threshold", type=float,
+                    help="Partial restart when the edge entropy of the population falls below this")
+
+    run = parser.add_argument_group("run")
+    run.add_argument("--generations", type=int, help="Maximum number of generations")
+    run.add_argument("--time-limit", type=float, help="Time budget per instance, in seconds")
+    run.add_argument("--target", type=float,
+                     help="Stop as soon as a tour is this short (e.g. the known optimum)")
+    run.add_argument("--target-gap", type=float,
+                     help="Accept tours within this relative gap above --target (0.01 for 1%%)")
+    run.add_argument("--stagnation", type=int,
+                     help="Stop after this many generations without enough improvement")
+    run.add_argument("--decompose", action="store_const", const=True,
+                     help="Solve clusters of cities separately and stitch their tours "
+                          "(for instances of 10 000 cities and more)")
+    run.add_argument("--cluster-size", type=int, help="Cities per cluster with --decompose")
+    run.add_argument("--partition", choices=["kmeans", "grid"],
+                     help="Clustering of the cities with --decompose")
+    run.add_argument("--seed", type=int, help="Seed of every run, for reproducible results")
+    run.add_argument("--jobs", type=int, help="Instances solved in parallel (default: CPU count)")
+    run.add_argument("--no-tour", dest="tour", action="store_const", const=False,
+                     help="Leave the tours out of the results")
+    return parser
+
+
+def main(argv=None):
+    """Entry point of the batch solver, returns the exit status"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    settings = dict(DEFAULTS)
+    try:
+        if args.config:
+            settings.update(load_config(args.config))
+        paths = expand_instances(args.instances)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    settings.update({key: value for key, value in vars(args).items()
+                     if key in DEFAULTS and value is not None})
+
+    jobs = min(settings["jobs"] or os.cpu_count() or 1, len(paths))
+    failures = 0
+
+    def emit(result):
+        nonlocal failures
+        failures += "error" in result
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+    if jobs == 1:
+        for path in paths:
+            emit(_solve_or_report(path, settings))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(_solve_or_report, path, settings) for path in paths]
+            for future in as_completed(futures):
+                emit(future.result())
+
+    return 1 if failures else 0
@@ -1,2 +1,6 @@
 # tsp_solver/core/__init__.py
-from .city import City
\ No newline at end of file
+from .city import City
+from .distance import DistanceMatrix
+from .instance import TSPInstance
+from .neighbors import build_neighbor_index, load_neighbor_index
+from .tsplib_importer import TSPLibImporter
\ No newline at end of file
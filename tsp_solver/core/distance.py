@@ -0,0 +1,243 @@
+from collections import OrderedDict
+import numpy as np
+from .metrics import METRICS, PLANAR_METRICS
+from .neighbors import load_neighbor_index
+
+# Largest matrix (in bytes) kept in memory before switching to on-demand rows
+DEFAULT_MEMORY_BUDGET = 512 * 1024 ** 2
+
+# Number of float64 temporaries computed at once when filling the matrix
+ROW_BLOCK_ELEMENTS = 4 * 1024 ** 2
+
+# Up to this many cities the matrix is stored in float64, above it in float32
+FLOAT64_MAX_CITIES = 2000
+
+
+class DistanceMatrix:
+    """
+    Distance engine of an instance, addressed by integer city indices.
+
+    The full matrix is precomputed when it fits in the memory budget
+    (float64 for small instances, float32 above FLOAT64_MAX_CITIES, int32
+    for the rounded TSPLIB metrics). Otherwise distances are computed on
+    demand from the coordinates and the most recently used rows are cached.
+    Instances given as an explicit matrix (TSPLIB EXPLICIT) always keep it.
+    """
+
+    def __init__(self, coords, memory_budget=DEFAULT_MEMORY_BUDGET, dtype=None,
+                 metric="euclidean"):
+        """
+        Build the distance engine.
+
+        Args:
+            coords (array-like): (n, 2) array of city coordinates
+            memory_budget (int): Maximum size of the matrix in bytes
+            dtype (numpy dtype): Force the matrix dtype instead of choosing it by size
+            metric (str): Name of the distance function in core.metrics.METRICS
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        self._setup(np.ascontiguousarray(coords, dtype=np.float64).reshape(-1, 2),
+                    metric, memory_budget, dtype)
+
+        if self.size * self.size * self.dtype.itemsize <= memory_budget:
+            self.matrix = self._compute_rows(np.arange(self.size))
+
+    def _setup(self, coords, metric, memory_budget, dtype=None, size=None):
+        self.coords = coords
+        self.size = len(coords) if size is None else size
+        self.metric = metric
+        self.integral = metric != "euclidean"
+        self.memory_budget = memory_budget
+        self.source_path = None  # Instance file, naming and dating the neighbor index cache
+        self.dtype = np.dtype(dtype) if dtype is not None else self._choose_dtype()
+
+        self.matrix = None
+        self._neighbors = {}
+        self._row_cache = OrderedDict()
+        self._row_cache_size = max(1, memory_budget // max(1, self.size * self.dtype.itemsize))
+
+    @classmethod
+    def from_cities(cls, cities, **kwargs):
+        """Build the distance engine from a list of City objects"""
+        coords = np.array([(city.x, city.y) for city in cities], dtype=np.float64)
+        return cls(coords, **kwargs)
+
+    @classmethod
+    def from_matrix(cls, matrix, coords=None):
+        """
+        Wrap an explicit (n, n) distance matrix.
+
+        Args:
+            matrix (array-like): Full symmetric distance matrix
+            coords (array-like, optional): Display coordinates of the cities,
+                not used for the distances
+        """
+        matrix = np.asarray(matrix)
+        integral = (np.array_equal(matrix, np.round(matrix))
+                    and np.abs(matrix).max(initial=0) < 2 ** 31)
+        if coords is not None:
+            coords = np.ascontiguousarray(coords, dtype=np.float64).reshape(-1, 2)
+
+        engine = cls.__new__(cls)
+        engine._setup(coords, "explicit", DEFAULT_MEMORY_BUDGET,
+                      np.int32 if integral else np.float64, size=len(matrix))
+        engine.integral = integral
+        engine.matrix = np.ascontiguousarray(matrix, dtype=engine.dtype)
+        return engine
+
+    @classmethod
+    def from_arrays(cls, coords, matrix=None, metric="euclidean", memory_budget=DEFAULT_MEMORY_BUDGET):
+        """
+        Wrap already computed arrays (e.g. views on shared memory) without copying them.
+
+        Args:
+            coords (numpy.ndarray): (n, 2) array of city coordinates, or None
+                for an explicit matrix
+            matrix (numpy.ndarray, optional): Precomputed (n, n) distance matrix
+            metric (str): Name of the distance function, or "explicit"
+            memory_budget (int): Maximum size of the row cache in bytes when matrix is None
+        """
+        engine = cls.__new__(cls)
+        size = len(matrix) if matrix is not None else len(coords)
+        engine._setup(coords, metric, memory_budget,
+                      matrix.dtype if matrix is not None else None, size=size)
+        if metric == "explicit":
+            engine.integral = bool(np.issubdtype(matrix.dtype, np.integer))
+        engine.matrix = matrix
+        return engine
+
+    def __len__(self):
+        return self.size
+
+    def __call__(self, i, j):
+        """Distance between cities i and j"""
+        if self.matrix is not None:
+            return float(self.matrix[i, j])
+        return float(self.pair_distances(i, j))
+
+    @property
+    def is_precomputed(self):
+        """True if the full matrix is held in memory"""
+        return self.matrix is not None
+
+    def _choose_dtype(self):
+        if self.integral:
+            return np.dtype(np.int32)
+        if self.size <= FLOAT64_MAX_CITIES:
+            return np.dtype(np.float64)
+        return np.dtype(np.float32)
+
+    def _metric(self, a, b):
+        """Vectorized distance between the cities of index arrays a and b"""
+        return METRICS[self.metric](self.coords[a], self.coords[b])
+
+    def _compute_rows(self, rows):
+        rows = np.asarray(rows)
+        if self.matrix is not None:
+            return self.matrix[rows]
+
+        result = np.empty((len(rows), self.size), dtype=self.dtype)
+        columns = np.arange(self.size)[None, :]
+
+        # Work in blocks of rows to bound the size of the float64 temporaries
+        block = max(1, ROW_BLOCK_ELEMENTS // max(1, self.size))
+        for start in range(0, len(rows), block):
+            stop = start + block
+            result[start:stop] = self._metric(rows[start:stop, None], columns)
+        return result
+
+    def row(self, i):
+        """Distances from city i to every city"""
+        if self.matrix is not None:
+            return self.matrix[i]
+
+        row = self._row_cache.get(i)
+        if row is None:
+            row = self._compute_rows([i])[0]
+            self._row_cache[i] = row
+            if len(self._row_cache) > self._row_cache_size:
+                self._row_cache.popitem(last=False)
+        else:
+            self._row_cache.move_to_end(i)
+        return row
+
+    def pair_distances(self, a, b):
+        """
+        Distances between the cities of two index arrays, element-wise.
+
+        Args:
+            a (array-like): Indices of the first cities
+            b (array-like): Indices of the second cities (same shape as a)
+
+        Returns:
+            numpy.ndarray: Distances with the shape of a and b
+        """
+        if self.matrix is not None:
+            return self.matrix[a, b]
+        return self._metric(a, b)
+
+    def tour_length(self, tour):
+        """
+        Total length of a closed tour.
+
+        Args:
+            tour (array-like): City indices in the order of visit
+
+        Returns:
+            float: Length of the tour, including the edge back to the start
+        """
+        tour = np.asarray(tour)
+        return float(self.pair_distances(tour, np.roll(tour, -1)).sum(dtype=np.float64))
+
+    def tour_lengths(self, tours):
+        """
+        Lengths of several closed tours at once.
+
+        Args:
+            tours (array-like): (m, n) array of tours, one per row
+
+        Returns:
+            numpy.ndarray: (m,) float64 array of tour lengths
+        """
+        tours = np.asarray(tours)
+        return self.pair_distances(tours, np.roll(tours, -1, axis=1)).sum(axis=1, dtype=np.float64)
+
+    def _matrix_neighbors(self, k):
+        """Candidate lists from a partial sort of the distance rows, in O(n^2)"""
+        neighbors = np.empty((self.size, k), dtype=np.int32)
+        block = max(1, ROW_BLOCK_ELEMENTS // max(1, self.size))
+        for start in range(0, self.size, block):
+            rows = np.arange(start, min(start + block, self.size))
+            candidates = self._compute_rows(rows).astype(np.float64)
+            candidates[np.arange(len(rows)), rows] = np.inf  # A city is not its own neighbor
+            nearest = np.argpartition(candidates, k - 1, axis=1)[:, :k]
+            order = np.argsort(np.take_along_axis(candidates, nearest, axis=1), axis=1, kind='stable')
+            neighbors[rows] = np.take_along_axis(nearest, order, axis=1)
+        return neighbors
+
+    def nearest_neighbors(self, k, cache_dir=None):
+        """
+        Candidate lists: the k nearest cities of every city, closest first.
+
+        Built once per k with a KD-tree over the coordinates (see
+        core.neighbors) and kept in memory. Non-planar metrics (GEO,
+        explicit matrices) rank the distance rows.
+
+        Args:
+            k (int): Number of neighbors per city (capped at n - 1)
+            cache_dir (str, optional): Directory where the index of an instance
+                read from a file is also cached on disk (planar metrics only).
+                Nothing is written by default
+
+        Returns:
+            numpy.ndarray: (n, k) int32 array of city indices
+        """
+        k = min(k, self.size - 1)
+        if k not in self._neighbors:
+            if self.metric in PLANAR_METRICS:
+                self._neighbors[k] = load_neighbor_index(self.coords, k, self.source_path,
+                                                         cache_dir=cache_dir)
+            else:
+                self._neighbors[k] = self._matrix_neighbors(k)
+        return self._neighbors[k]
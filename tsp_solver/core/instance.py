@@ -0,0 +1,80 @@
+import numpy as np
+from .city import City
+from .distance import DistanceMatrix
+
+
+class TSPInstance:
+    """
+    A loaded TSP instance: its distance engine plus, when the file has them,
+    the city coordinates (node or display coordinates).
+
+    This is what the solver evaluates routes with; City objects are only
+    built on request, e.g. for the UI.
+    """
+
+    def __init__(self, name, distances, coords=None, edge_weight_type="EUC_2D",
+                 comment="", source_path=None):
+        """
+        Args:
+            name (str): Instance name (NAME field)
+            distances (DistanceMatrix): Distance engine of the instance
+            coords (numpy.ndarray, optional): (n, 2) coordinates used for display
+            edge_weight_type (str): TSPLIB EDGE_WEIGHT_TYPE
+            comment (str): TSPLIB COMMENT field
+            source_path (str, optional): File the instance was read from
+        """
+        self.name = name
+        self.distances = distances
+        self.coords = coords
+        self.edge_weight_type = edge_weight_type
+        self.comment = comment
+        self.source_path = source_path
+        distances.source_path = source_path
+
+    @classmethod
+    def from_coords(cls, coords, metric="EUC_2D", name="", **kwargs):
+        """Build an instance whose distances are computed from coordinates"""
+        coords = np.ascontiguousarray(coords, dtype=np.float64).reshape(-1, 2)
+        distances = DistanceMatrix(coords, metric=metric)
+        return cls(name, distances, coords, edge_weight_type=metric, **kwargs)
+
+    @classmethod
+    def from_matrix(cls, matrix, coords=None, name="", **kwargs):
+        """Build an instance from an explicit distance matrix"""
+        distances = DistanceMatrix.from_matrix(matrix, coords)
+        return cls(name, distances, distances.coords, edge_weight_type="EXPLICIT", **kwargs)
+
+    @property
+    def dimension(self):
+        """Number of cities"""
+        return len(self.distances)
+
+    def __len__(self):
+        return self.dimension
+
+    def __repr__(self):
+        return f"TSPInstance({self.name}, n={self.dimension}, {self.edge_weight_type})"
+
+    @property
+    def has_coords(self):
+        """True if the cities can be drawn"""
+        return self.coords is not None
+
+    def cities(self):
+        """
+        City objects of the instance, named City-1 ... City-n like in the file.
+
+        Raises:
+            ValueError: If the instance has no coordinates
+        """
+        if self.coords is None:
+            raise ValueError(f"Instance {self.name} has no coordinates")
+        return [City(float(x), float(y), f"City-{i + 1}") for i, (x, y) in enumerate(self.coords)]
+
+    def tour_length(self, tour):
+        """Length of a closed tour given as city indices"""
+        return self.distances.tour_length(tour)
+
+    def nearest_neighbors(self, k, cache_dir=None):
+        """k nearest cities of every city, as an (n, k) int32 array (see DistanceMatrix)"""
+        return self.distances.nearest_neighbors(k, cache_dir)
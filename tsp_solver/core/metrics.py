@@ -0,0 +1,81 @@
+"""
+Vectorized distance functions.
+
+Each function takes two (..., 2) arrays of coordinates and returns the
+element-wise distances with shape (...). Except for "euclidean", they
+follow the TSPLIB definitions (Reinelt, TSPLIB 95) and return whole
+numbers stored as float64.
+"""
+import numpy as np
+
+# Constants of the TSPLIB GEO metric
+GEO_PI = 3.141592
+GEO_EARTH_RADIUS = 6378.388
+
+
+def euclidean(a, b):
+    """Exact Euclidean distance (cities placed in the UI or generated at random)"""
+    delta = a - b
+    return np.sqrt(np.einsum('...k,...k->...', delta, delta))
+
+
+def euc_2d(a, b):
+    """EUC_2D: Euclidean distance rounded to the nearest integer"""
+    return np.floor(euclidean(a, b) + 0.5)
+
+
+def ceil_2d(a, b):
+    """CEIL_2D: Euclidean distance rounded up"""
+    return np.ceil(euclidean(a, b))
+
+
+def att(a, b):
+    """ATT: pseudo-Euclidean distance of the att48/att532 instances"""
+    delta = a - b
+    r = np.sqrt(np.einsum('...k,...k->...', delta, delta) / 10.0)
+    t = np.floor(r + 0.5)
+    return np.where(t < r, t + 1, t)
+
+
+def man_2d(a, b):
+    """MAN_2D: Manhattan distance rounded to the nearest integer"""
+    return np.floor(np.abs(a - b).sum(axis=-1) + 0.5)
+
+
+def max_2d(a, b):
+    """MAX_2D: maximum of the rounded coordinate differences"""
+    return np.floor(np.abs(a - b) + 0.5).max(axis=-1)
+
+
+def _geo_radians(coords):
+    """Convert TSPLIB DDD.MM (degrees.minutes) coordinates to radians"""
+    degrees = np.trunc(coords)
+    minutes = coords - degrees
+    return GEO_PI * (degrees + 5.0 * minutes / 3.0) / 180.0
+
+
+def geo(a, b):
+    """GEO: great-circle distance in km between (latitude, longitude) points"""
+    a = _geo_radians(a)
+    b = _geo_radians(b)
+    q1 = np.cos(a[..., 1] - b[..., 1])
+    q2 = np.cos(a[..., 0] - b[..., 0])
+    q3 = np.cos(a[..., 0] + b[..., 0])
+    cosine = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+    distance = np.trunc(GEO_EARTH_RADIUS * np.arccos(cosine) + 1.0)
+    # The formula gives 1 for a city and itself
+    return np.where(np.all(a == b, axis=-1), 0.0, distance)
+
+
+METRICS = {
+    "euclidean": euclidean,
+    "EUC_2D": euc_2d,
+    "CEIL_2D": ceil_2d,
+    "ATT": att,
+    "MAN_2D": man_2d,
+    "MAX_2D": max_2d,
+    "GEO": geo,
+}
+
+# Metrics whose nearest neighbors can be found in the plane of the coordinates
+PLANAR_METRICS = {"euclidean", "EUC_2D", "CEIL_2D", "ATT"}
@@ -0,0 +1,150 @@
+import os
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # pragma: no cover - scipy is a declared dependency
+    cKDTree = None
+
+# Average number of cities per cell of the grid index
+GRID_CITIES_PER_CELL = 2
+
+# Above this many cities, "auto" uses the grid instead of the KD-tree
+GRID_MIN_CITIES = 200000
+
+
+def _kdtree_neighbors(coords, k):
+    tree = cKDTree(coords)
+    # The closest point returned for each city is the city itself
+    _, nearest = tree.query(coords, k=k + 1)
+    nearest = nearest.reshape(len(coords), k + 1)
+    # Duplicated coordinates can put the city itself anywhere in the list,
+    # or push it out: move it to the end and keep the first k candidates
+    is_self = nearest == np.arange(len(coords))[:, None]
+    ranking = np.argsort(is_self, axis=1, kind='stable')[:, :k]
+    return np.take_along_axis(nearest, ranking, axis=1).astype(np.int32)
+
+
+def _grid_neighbors(coords, k):
+    n = len(coords)
+    low = coords.min(axis=0)
+    extent = np.maximum(coords.max(axis=0) - low, 1e-12)
+    cells_per_side = max(1, int(np.sqrt(n / GRID_CITIES_PER_CELL)))
+    cell_size = extent.max() / cells_per_side
+    shape = np.maximum(1, np.ceil(extent / cell_size).astype(int))
+
+    cell = np.minimum(((coords - low) / cell_size).astype(int), shape - 1)
+    cell_id = cell[:, 0] * shape[1] + cell[:, 1]
+    order = np.argsort(cell_id, kind='stable')
+    starts = np.searchsorted(cell_id[order], np.arange(shape[0] * shape[1] + 1))
+
+    neighbors = np.empty((n, k), dtype=np.int32)
+    for cx in range(shape[0]):
+        for cy in range(shape[1]):
+            members = order[starts[cx * shape[1] + cy]:starts[cx * shape[1] + cy + 1]]
+            if not len(members):
+                continue
+
+            # Grow the block of cells around this one until every city's k-th
+            # candidate is closer than the nearest city outside the block
+            radius = 1
+            while True:
+                x0, x1 = max(0, cx - radius), min(shape[0], cx + radius + 1)
+                y0, y1 = max(0, cy - radius), min(shape[1], cy + radius + 1)
+                candidates = np.concatenate([
+                    order[starts[x * shape[1] + y0]:starts[x * shape[1] + y1]]
+                    for x in range(x0, x1)])
+                covers_all = x0 == 0 and y0 == 0 and x1 == shape[0] and y1 == shape[1]
+                if len(candidates) > k:
+                    delta = coords[members][:, None, :] - coords[candidates][None, :, :]
+                    dist = np.einsum('ijk,ijk->ij', delta, delta)
+                    dist[members[:, None] == candidates[None, :]] = np.inf
+                    nearest = np.argpartition(dist, k - 1, axis=1)[:, :k]
+                    kth = np.take_along_axis(dist, nearest, axis=1)
+                    if covers_all or np.sqrt(kth.max()) <= radius * cell_size:
+                        break
+                elif covers_all:
+                    raise ValueError("Not enough cities for the requested number of neighbors")
+                radius += 1
+
+            ranking = np.argsort(kth, axis=1, kind='stable')
+            neighbors[members] = candidates[np.take_along_axis(nearest, ranking, axis=1)]
+    return neighbors
+
+
+def build_neighbor_index(coords, k, method="auto"):
+    """
+    Candidate lists: the k nearest cities of every city, closest first.
+
+    Built in O(n log n) with a KD-tree, or with a uniform grid for very
+    large instances (or when scipy is not available).
+
+    Args:
+        coords (array-like): (n, 2) array of city coordinates
+        k (int): Number of neighbors per city (capped at n - 1)
+        method (str): "kdtree", "grid" or "auto"
+
+    Returns:
+        numpy.ndarray: (n, k) int32 array of city indices
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    k = min(k, len(coords) - 1)
+    if k <= 0:
+        return np.empty((len(coords), 0), dtype=np.int32)
+
+    if method == "auto":
+        use_grid = cKDTree is None or len(coords) >= GRID_MIN_CITIES
+        method = "grid" if use_grid else "kdtree"
+    if method == "kdtree":
+        return _kdtree_neighbors(coords, k)
+    if method == "grid":
+        return _grid_neighbors(coords, k)
+    raise ValueError(f"Unknown neighbor index method: {method}")
+
+
+def neighbor_cache_path(instance_path, k, cache_dir):
+    """File of cache_dir holding the k-nearest-neighbor index of a .tsp instance"""
+    root, _ = os.path.splitext(os.path.basename(instance_path))
+    return os.path.join(cache_dir, f"{root}.knn{k}.npy")
+
+
+def load_neighbor_index(coords, k, instance_path=None, method="auto", cache_dir=None):
+    """
+    Candidate lists of an instance, optionally cached on disk.
+
+    Nothing is written unless a cache directory is given. The cache file
+    is reused only if it is newer than the instance and has the expected
+    shape; otherwise the index is rebuilt and saved.
+
+    Args:
+        coords (array-like): (n, 2) array of city coordinates
+        k (int): Number of neighbors per city
+        instance_path (str, optional): .tsp file of the instance, which names
+            the cache file and dates it
+        method (str): Index construction method when the cache is missing
+        cache_dir (str, optional): Directory of the cache files. Without it,
+            or without instance_path, nothing is cached
+
+    Returns:
+        numpy.ndarray: (n, k) int32 array of city indices
+    """
+    if instance_path is None or cache_dir is None:
+        return build_neighbor_index(coords, k, method)
+
+    n = len(coords)
+    cache_path = neighbor_cache_path(instance_path, k, cache_dir)
+    try:
+        if os.path.getmtime(cache_path) >= os.path.getmtime(instance_path):
+            neighbors = np.load(cache_path, mmap_mode='r')
+            if neighbors.shape == (n, min(k, n - 1)) and neighbors.dtype == np.int32:
+                return neighbors
+    except (OSError, ValueError):
+        pass  # Missing or unreadable cache
+
+    neighbors = build_neighbor_index(coords, k, method)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.save(cache_path, neighbors)
+    except OSError:
+        pass  # The cache is optional, e.g. read-only directories
+    return neighbors
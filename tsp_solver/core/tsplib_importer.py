@@ -1,34 +1,233 @@
+import hashlib
+import json
+import os
+import re
+import zipfile
+import numpy as np
 from ..core.city import City
+from ..core.instance import TSPInstance
+from ..core.metrics import METRICS
+
+SECTIONS = ("NODE_COORD_SECTION", "DISPLAY_DATA_SECTION", "EDGE_WEIGHT_SECTION",
+            "FIXED_EDGES_SECTION", "TOUR_SECTION")
+
+# A section keyword or EOF alone on its line
+_KEYWORD_LINE = re.compile(r"^[ \t]*(%s|EOF)[ \t]*$" % "|".join(SECTIONS), re.MULTILINE)
+
+# Binary cache of parsed instances, overridable with TSP_SOLVER_CACHE
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "tsp_solver")
+
+# Bump when the layout of the cache files changes
+CACHE_VERSION = 1
+
+
+def cache_file(filepath, cache_dir=None):
+    """Binary cache file of an instance, keyed on its absolute path"""
+    cache_dir = cache_dir or os.environ.get("TSP_SOLVER_CACHE", DEFAULT_CACHE_DIR)
+    key = hashlib.sha1(os.path.abspath(filepath).encode()).hexdigest()
+    return os.path.join(cache_dir, f"{key}.npz")
+
+
+def _triangle_indices(edge_weight_format, n):
+    """Row/column indices filled, in file order, by a triangular EDGE_WEIGHT_FORMAT"""
+    # For a symmetric matrix the column-wise formats read like the
+    # opposite row-wise triangle
+    formats = {
+        "UPPER_ROW": (1, True), "LOWER_COL": (1, True),
+        "UPPER_DIAG_ROW": (0, True), "LOWER_DIAG_COL": (0, True),
+        "LOWER_ROW": (-1, False), "UPPER_COL": (-1, False),
+        "LOWER_DIAG_ROW": (0, False), "UPPER_DIAG_COL": (0, False),
+    }
+    if edge_weight_format not in formats:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_FORMAT: {edge_weight_format}")
+    offset, upper = formats[edge_weight_format]
+    return np.triu_indices(n, offset) if upper else np.tril_indices(n, offset)
+
+
+def edge_weight_matrix(weights, edge_weight_format, n):
+    """
+    Build the full distance matrix from the numbers of an EDGE_WEIGHT_SECTION.
+
+    Args:
+        weights (numpy.ndarray): Numbers of the section, in file order
+        edge_weight_format (str): TSPLIB EDGE_WEIGHT_FORMAT
+        n (int): Dimension of the instance
+
+    Returns:
+        numpy.ndarray: (n, n) symmetric matrix
+    """
+    if edge_weight_format == "FULL_MATRIX":
+        return weights[:n * n].reshape(n, n)
+
+    rows, cols = _triangle_indices(edge_weight_format, n)
+    if len(weights) < len(rows):
+        raise ValueError(f"EDGE_WEIGHT_SECTION has {len(weights)} values, expected {len(rows)}")
+    matrix = np.zeros((n, n), dtype=weights.dtype)
+    matrix[rows, cols] = weights[:len(rows)]
+    matrix[cols, rows] = weights[:len(rows)]
+    return matrix
+
+
+def _node_coords(values, n):
+    """(n, 2) coordinates from the 'id x y' lines of a coordinate section"""
+    values = values.reshape(-1, 3)
+    coords = np.empty((n, 2), dtype=np.float64)
+    coords[values[:, 0].astype(np.int64) - 1] = values[:, 1:]
+    return coords
+
 
 class TSPLibImporter:
     @staticmethod
-    def import_instance(filepath: str) -> list[City]:
-        """Import a TSPLIB format instance file"""
-        cities = []
-        reading_coords = False
-        city_id = 1
+    def read_sections(filepath):
+        """
+        Split a TSPLIB file into its header fields and the numbers of each section.
+
+        The file is read at once and each section is converted to a NumPy
+        array in a single pass, without going through per-line objects.
+
+        Returns:
+            tuple: (header dict, dict mapping section name to a float64 array)
+        """
+        with open(filepath, 'r') as f:
+            text = f.read()
+
+        keywords = list(_KEYWORD_LINE.finditer(text))
+        header_end = keywords[0].start() if keywords else len(text)
+        header = {}
+        for line in text[:header_end].splitlines():
+            key, separator, value = line.partition(":")
+            if separator:
+                header[key.strip()] = value.strip()
+
+        sections = {}
+        for keyword, following in zip(keywords, keywords[1:] + [None]):
+            name = keyword.group(1)
+            if name == "EOF":
+                break
+            end = following.start() if following is not None else len(text)
+            sections[name] = np.fromstring(text[keyword.end():end], sep=" ")
+
+        return header, sections
+
+    @staticmethod
+    def _load_cached(filepath, cache_path):
+        """Instance from the binary cache, or None if it is missing or stale"""
+        try:
+            stat = os.stat(filepath)
+            # Opened here so that the file is closed whatever np.load raises
+            with open(cache_path, "rb") as f, np.load(f, allow_pickle=False) as cached:
+                meta = json.loads(str(cached["meta"]))
+                if (meta["version"] != CACHE_VERSION or meta["mtime_ns"] != stat.st_mtime_ns
+                        or meta["size"] != stat.st_size):
+                    return None
+                coords = cached["coords"] if "coords" in cached else None
+                matrix = cached["matrix"] if "matrix" in cached else None
+        except (OSError, KeyError, ValueError, TypeError, EOFError, zipfile.BadZipFile):
+            return None  # Missing, stale or damaged (e.g. truncated) cache file
+
+        if matrix is not None:
+            return TSPInstance.from_matrix(matrix, coords, name=meta["name"], comment=meta["comment"],
+                                           source_path=filepath)
+        return TSPInstance.from_coords(coords, meta["edge_weight_type"], name=meta["name"],
+                                       comment=meta["comment"], source_path=filepath)
+
+    @staticmethod
+    def _save_cached(instance, cache_path):
+        """Write the parsed arrays of an instance to the binary cache"""
+        stat = os.stat(instance.source_path)
+        meta = {
+            "version": CACHE_VERSION,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "name": instance.name,
+            "comment": instance.comment,
+            "edge_weight_type": instance.edge_weight_type,
+        }
+        arrays = {"meta": np.array(json.dumps(meta))}
+        if instance.coords is not None:
+            arrays["coords"] = instance.coords
+        if instance.edge_weight_type == "EXPLICIT":
+            arrays["matrix"] = instance.distances.matrix
 
         try:
-            with open(filepath, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line == "NODE_COORD_SECTION":
-                        reading_coords = True
-                        continue
-                    if line == "EOF":
-                        break
-                    if reading_coords:
-                        parts = line.split()
-                        if len(parts) >= 3:
-                            try:
-                                x = float(parts[1])
-                                y = float(parts[2])
-                                cities.append(City(x, y, f"City-{city_id}"))
-                                city_id += 1
-                            except ValueError:
-                                continue
-
-            return cities
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            # Write then rename, so concurrent batch jobs never read a partial file
+            partial = f"{cache_path}.{os.getpid()}.tmp"
+            with open(partial, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(partial, cache_path)
+        except OSError:
+            pass  # The cache is optional
+
+    @staticmethod
+    def load(filepath: str, use_cache=True, cache_dir=None) -> TSPInstance:
+        """
+        Load a TSPLIB instance into the compact form used by the solver.
+
+        Supports EXPLICIT matrices in every EDGE_WEIGHT_FORMAT and the
+        EUC_2D, CEIL_2D, ATT, GEO, MAN_2D and MAX_2D metrics. The parsed
+        arrays are kept in a binary .npz cache keyed on the file path, which
+        is invalidated when the file's modification time or size changes.
+
+        Args:
+            filepath (str): Path of the .tsp file
+            use_cache (bool): Read and write the binary cache
+            cache_dir (str, optional): Cache directory (default: $TSP_SOLVER_CACHE
+                or ~/.cache/tsp_solver)
+        """
+        cache_path = cache_file(filepath, cache_dir) if use_cache else None
+        if cache_path is not None:
+            instance = TSPLibImporter._load_cached(filepath, cache_path)
+            if instance is not None:
+                return instance
+
+        instance = TSPLibImporter.parse(filepath)
+        if cache_path is not None:
+            TSPLibImporter._save_cached(instance, cache_path)
+        return instance
+
+    @staticmethod
+    def parse(filepath: str) -> TSPInstance:
+        """Parse a TSPLIB file, without going through the binary cache"""
+        try:
+            header, sections = TSPLibImporter.read_sections(filepath)
+            edge_weight_type = header.get("EDGE_WEIGHT_TYPE", "EUC_2D")
+            name = header.get("NAME", "")
+            comment = header.get("COMMENT", "")
+
+            n = int(header["DIMENSION"]) if "DIMENSION" in header else None
+            coords = None
+            for section in ("NODE_COORD_SECTION", "DISPLAY_DATA_SECTION"):
+                if section in sections:
+                    if n is None:
+                        n = len(sections[section]) // 3
+                    coords = _node_coords(sections[section], n)
+                    break
+
+            if edge_weight_type == "EXPLICIT":
+                weights = sections.get("EDGE_WEIGHT_SECTION")
+                if weights is None or n is None:
+                    raise ValueError("EXPLICIT instance without DIMENSION or EDGE_WEIGHT_SECTION")
+                edge_weight_format = header.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX")
+                matrix = edge_weight_matrix(weights, edge_weight_format, n)
+                return TSPInstance.from_matrix(matrix, coords, name=name, comment=comment,
+                                               source_path=filepath)
+
+            if edge_weight_type not in METRICS:
+                raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE: {edge_weight_type}")
+            if coords is None:
+                raise ValueError("Missing NODE_COORD_SECTION")
+            return TSPInstance.from_coords(coords, edge_weight_type, name=name,
+                                           comment=comment, source_path=filepath)
 
         except Exception as e:
-            raise Exception(f"Error reading TSPLIB file: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Error reading TSPLIB file: {str(e)}")
+
+    @staticmethod
+    def import_instance(filepath: str) -> list[City]:
+        """Import a TSPLIB format instance file as City objects (needs coordinates)"""
+        instance = TSPLibImporter.load(filepath)
+        try:
+            return instance.cities()
+        except ValueError as e:
+            raise Exception(f"Error reading TSPLIB file: {str(e)}")
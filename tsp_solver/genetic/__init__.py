@@ -1 +1,5 @@
-from .algorithm import GeneticAlgorithm
\ No newline at end of file
+from .algorithm import GeneticAlgorithm
+from .island import IslandModel
+from .instrumentation import Instrumentation
+from .background import BackgroundSolver
+from .decomposition import DecompositionSolver
@@ -0,0 +1,110 @@
+"""
+Adaptive operator selection and mutation rate control.
+
+AdaptivePursuit picks one operator of a pool per generation. Its
+probabilities pursue the operator with the best quality estimate, an
+exponential moving average of the rewards (the improvement of the
+children over their parents) the operator earned. Every operator keeps a
+minimum probability, so the choice follows the needs of the run as they
+change, e.g. from recombining random routes to refining good ones.
+"""
+import numpy as np
+
+# Operators tried by GeneticAlgorithm(adaptive=True) unless given
+CROSSOVER_POOL = ("ordered", "cycle", "eax", "eax_block", "erx")
+MUTATION_POOL = ("swap", "insertion", "inversion")
+
+# Learning rates of the quality estimates (alpha) and of the probabilities (beta)
+PURSUIT_ALPHA = 0.3
+PURSUIT_BETA = 0.3
+
+# Mutation rate of the adaptive mode, a probability like in fixed mode (per
+# city for swap mutation, per child otherwise): its bounds, and its factor of
+# change per generation
+MUTATION_RATE_BOUNDS = (0.001, 1.0)
+MUTATION_RATE_STEP = 1.2
+
+# Below this share of distinct tours the population counts as converged
+DIVERSITY_LOW = 0.5
+
+# The search stagnates when the best route did not improve for this many generations
+STAGNATION_GENERATIONS = 10
+
+
+class AdaptivePursuit:
+    """
+    Adaptive pursuit operator selection (Thierens, 2005).
+
+    After an operator earns a reward r, its quality moves towards r by
+    alpha, then the probability of the best-quality operator moves
+    towards p_max by beta and the others towards p_min.
+    """
+
+    def __init__(self, arms, p_min=None, alpha=PURSUIT_ALPHA, beta=PURSUIT_BETA):
+        """
+        Args:
+            arms (sequence): Names of the operators
+            p_min (float, optional): Minimum probability of an operator,
+                0.2 / number of operators by default
+            alpha (float): Learning rate of the quality estimates
+            beta (float): Learning rate of the probabilities
+        """
+        self.arms = tuple(arms)
+        count = len(self.arms)
+        self.p_min = 0.2 / count if p_min is None else p_min
+        self.p_max = 1 - (count - 1) * self.p_min
+        self.alpha = alpha
+        self.beta = beta
+        self.quality = np.zeros(count)
+        self.probabilities = np.full(count, 1 / count)
+
+    def choose(self, rng):
+        """Draw an operator name with the current probabilities"""
+        return self.arms[rng.choice(len(self.arms), p=self.probabilities)]
+
+    def update(self, arm, reward):
+        """Credit an operator with the reward of its last use"""
+        index = self.arms.index(arm)
+        self.quality[index] += self.alpha * (reward - self.quality[index])
+        target = np.full(len(self.arms), self.p_min)
+        target[np.argmax(self.quality)] = self.p_max
+        self.probabilities += self.beta * (target - self.probabilities)
+        self.probabilities /= self.probabilities.sum()
+
+    def state(self):
+        """Quality estimates and probabilities, JSON-serializable (for checkpoints)"""
+        return {"quality": self.quality.tolist(), "probabilities": self.probabilities.tolist()}
+
+    def set_state(self, state):
+        """Restore the state returned by state()"""
+        self.quality = np.array(state["quality"], dtype=np.float64)
+        self.probabilities = np.array(state["probabilities"], dtype=np.float64)
+
+
+def is_stagnating(history, generations=STAGNATION_GENERATIONS):
+    """True if the last best distances of a history show no improvement"""
+    return len(history) > generations and history[-1] >= history[-1 - generations]
+
+
+def adapt_mutation_rate(rate, stagnant, unique_ratio=None):
+    """
+    Next mutation rate of the adaptive mode.
+
+    The rate grows while the best route stagnates or the population has
+    converged (fewer than DIVERSITY_LOW distinct tours), and shrinks back
+    while the search improves.
+
+    Args:
+        rate (float): Current mutation probability
+        stagnant (bool): The best route stagnates (see is_stagnating)
+        unique_ratio (float, optional): Share of distinct tours in the population
+
+    Returns:
+        float: New rate, within MUTATION_RATE_BOUNDS
+    """
+    converged = unique_ratio is not None and unique_ratio < DIVERSITY_LOW
+    if converged or stagnant:
+        rate *= MUTATION_RATE_STEP
+    else:
+        rate /= MUTATION_RATE_STEP
+    return float(np.clip(rate, *MUTATION_RATE_BOUNDS))
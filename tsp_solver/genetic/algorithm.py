@@ -1,8 +1,54 @@
 import random
+import time
+from collections import deque
 import numpy as np
-from ..genetic.operators.selection import tournament_selection, elitism_selection
-from ..genetic.operators.crossover import ordered_crossover, cycle_crossover
-from ..genetic.operators.mutation import swap_mutation, insertion_mutation, inversion_mutation
+from ..core.distance import DistanceMatrix
+from ..core.instance import TSPInstance
+from ..genetic.operators.selection import (elitism_selection, tournament_selection_batch,
+                                           rank_selection, stochastic_universal_sampling)
+from ..genetic.operators.crossover import (ordered_crossover, cycle_crossover,
+                                           ordered_crossover_batch, cycle_crossover_batch,
+                                           edge_assembly_crossover, edge_recombination_crossover)
+from ..genetic.operators.mutation import (swap_mutation_batch, insertion_mutation_batch,
+                                          inversion_mutation_batch)
+from . import kernels
+from .parallel import ParallelBreeder
+from .instrumentation import Instrumentation
+from .checkpoint import write_checkpoint, read_checkpoint
+from .local_search import local_search as improve_route
+from .diversity import tour_hashes, duplicate_rows, edge_entropy, population_diversity
+from .adaptive import (AdaptivePursuit, CROSSOVER_POOL, MUTATION_POOL, adapt_mutation_rate,
+                       is_stagnating)
+
+# Parameters saved in checkpoints, to rebuild the algorithm in from_checkpoint
+CHECKPOINT_PARAMETERS = ("population_size", "elite_size", "mutation_rate", "tournament_size",
+                         "crossover_type", "mutation_type", "crossover_rate", "selection_type",
+                         "use_stopping_criterion", "improvement_threshold",
+                         "generations_without_improvement", "seed", "local_search",
+                         "local_search_fraction", "local_search_time", "local_search_moves",
+                         "neighbor_count", "eliminate_duplicates", "track_diversity",
+                         "restart_threshold", "restart_fraction", "adaptive",
+                         "crossover_pool", "mutation_pool")
+
+# Reasons reported by solve for stopping
+STOP_DEADLINE = "deadline"
+STOP_GENERATIONS = "generations"
+STOP_TARGET = "target"
+STOP_STAGNATION = "stagnation"
+
+# Parameters changed by the adaptive mode at every generation
+ADAPTED_PARAMETERS = ("crossover_type", "mutation_type", "mutation_rate")
+
+# Crossovers creating all the children of a generation in one batch call, the
+# others (EAX, ERX) create them one by one
+BATCH_CROSSOVERS = ("ordered", "cycle")
+
+# Rounds of re-mutation of the duplicate children of a generation, after
+# which the remaining duplicates (if any) are kept
+DUPLICATE_RETRIES = 3
+
+# Random segment inversions applied to the routes re-created by a partial restart
+RESTART_INVERSIONS = 10
 
 class GeneticAlgorithm:
     """Implementation of a genetic algorithm to solve the Traveling Salesman Problem"""
@@ -10,147 +56,735 @@ class GeneticAlgorithm:
     def __init__(self, cities, population_size=100, elite_size=20, 
                  mutation_rate=0.01, tournament_size=5,
                  crossover_type="ordered", mutation_type="swap",
+                 crossover_rate=1.0, selection_type="tournament",
                  use_stopping_criterion=False, improvement_threshold=0.001,
-                 generations_without_improvement=20):
+                 generations_without_improvement=20, seed=None, workers=None,
+                 local_search=None, local_search_fraction=0.1, local_search_time=None,
+                 local_search_moves=None, neighbor_count=8, instrument=False,
+                 eliminate_duplicates=False, track_diversity=False,
+                 restart_threshold=None, restart_fraction=0.5,
+                 adaptive=False, crossover_pool=None, mutation_pool=None,
+                 checkpoint_path=None, checkpoint_every=None, checkpoint_interval=None):
         """
         Initialize the genetic algorithm.
-    
+        
+        Args:
+            cities (list, TSPInstance or DistanceMatrix): Cities to visit, a loaded
+                instance, or a prebuilt distance engine
+            crossover_type (str): "ordered" (OX), "cycle" (CX), "eax" (edge assembly,
+                single AB-cycle), "eax_block" (edge assembly, block of AB-cycles) or
+                "erx" (edge recombination)
+            selection_type (str): Parent selection after the elites: "tournament",
+                "rank" (linear ranking) or "sus" (stochastic universal sampling)
+            seed (int, optional): Seed of the algorithm's random generator. Without it
+                the global random module is used
+            workers (int, optional): Number of worker processes creating and evaluating
+                the offspring. None or 1 runs everything in this process
+            local_search (str, optional): Routes improved by 2-opt and Or-opt each
+                generation: "children", "elites" or "sample". None disables the stage
+            local_search_fraction (float): Fraction of the population improved with "sample"
+            local_search_time (float, optional): Time budget of the stage per generation (s)
+            local_search_moves (int, optional): Move budget of the stage per generation
+            neighbor_count (int): Length of the candidate lists used by the local search
+                and by the subtour merge of EAX
+            instrument (bool): Record per-phase timers and counters in self.instrumentation
+                (see add_observer). Off by default, with no overhead
+            eliminate_duplicates (bool): Re-mutate the children that are the same tour
+                (up to rotation and direction) as another route of their generation
+            track_diversity (bool): Append the diversity metrics of every evaluated
+                generation to self.diversity_history
+            restart_threshold (float, optional): Partial restart when the edge entropy of
+                the population (see diversity.edge_entropy) falls below this value, at
+                most once every generations_without_improvement generations
+            restart_fraction (float): Share of the population re-created by a restart
+            adaptive (bool): Choose the crossover and mutation operators of every generation
+                by adaptive pursuit, crediting each with the improvement of its children
+                over their parents, and adapt the mutation rate (a probability, per city
+                or per child as in fixed mode) to stagnation and diversity. See genetic.adaptive
+            crossover_pool (sequence, optional): Crossover types of the adaptive mode
+                (adaptive.CROSSOVER_POOL by default)
+            mutation_pool (sequence, optional): Mutation types of the adaptive mode
+                (adaptive.MUTATION_POOL by default)
+            checkpoint_path (str, optional): File written by the automatic checkpoints
+            checkpoint_every (int, optional): Checkpoint every this many generations
+            checkpoint_interval (float, optional): Checkpoint when this many seconds have
+                passed since the last one
         """
-        self.cities = cities
+        if isinstance(cities, TSPInstance):
+            self.cities = cities.cities() if cities.has_coords else None
+            self.distances = cities.distances
+        elif isinstance(cities, DistanceMatrix):
+            self.cities = None
+            self.distances = cities
+        else:
+            self.cities = cities
+            self.distances = DistanceMatrix.from_cities(cities)
+        self.num_cities = len(self.distances)
         self.population_size = population_size
         self.elite_size = elite_size
         self.mutation_rate = mutation_rate
+        self.crossover_rate = crossover_rate
         self.tournament_size = tournament_size
         self.crossover_type = crossover_type
         self.mutation_type = mutation_type
+        self.selection_type = selection_type
         
         self.use_stopping_criterion = use_stopping_criterion
         self.improvement_threshold = improvement_threshold
         self.generations_without_improvement = generations_without_improvement
-        self.last_best_distances = []
+        # Best distance of the last generations, the oldest dropped automatically
+        self.last_best_distances = deque(maxlen=max(1, generations_without_improvement))
         
-        self.population = []
-        self.best_route = None
+        self.seed = seed
+        self.rng = random if seed is None else random.Random(seed)
+        # Generator of the batched operators, seeded from the global random module without a seed
+        self.np_rng = np.random.default_rng(seed if seed is not None else random.getrandbits(64))
+        self.workers = workers
+        self._parallel = None  # Process pool, created on first use
+        
+        self.local_search = local_search
+        self.local_search_fraction = local_search_fraction
+        self.local_search_time = local_search_time
+        self.local_search_moves = local_search_moves
+        self.neighbor_count = neighbor_count
+        self.instrumentation = Instrumentation() if instrument else None
+        
+        self.eliminate_duplicates = eliminate_duplicates
+        self.track_diversity = track_diversity
+        self.restart_threshold = restart_threshold
+        self.restart_fraction = restart_fraction
+        
+        self.adaptive = adaptive
+        self.crossover_pool = tuple(crossover_pool or CROSSOVER_POOL)
+        self.mutation_pool = tuple(mutation_pool or MUTATION_POOL)
+        self.crossover_pursuit = AdaptivePursuit(self.crossover_pool) if adaptive else None
+        self.mutation_pursuit = AdaptivePursuit(self.mutation_pool) if adaptive else None
+        self.operator_history = []  # Operators and mutation rate of each generation, with adaptive
+        self._parent_mean = None  # Mean length of the last parents, until their children are credited
+        
+        # Tour hashes are only maintained when something uses them
+        self.hashing = (eliminate_duplicates or track_diversity or restart_threshold is not None
+                        or adaptive)
+        
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        self._last_checkpoint = time.monotonic()
+        
+        self.population = np.empty((0, self.num_cities), dtype=np.int32)  # One route of city indices per row
+        self.route_lengths = np.empty(0)  # Cached length of each route, NaN when unknown
+        self.route_hashes = None  # Canonical tour hash of each route, when hashing
+        self.best_route = None  # Best route as a list of City objects (indices without cities)
+        self.best_tour = None  # Best route as an array of city indices
         self.best_distance = float('inf')
         self.generation = 0
         self.history = []  # To store the evolution of the best distance
+        self.diversity_history = []  # Diversity metrics of each generation, with track_diversity
+        self.restarts = 0  # Number of partial restarts
+        self.last_restart = 0  # Generation of the last partial restart
+        self.stop_reason = None  # Why the last call of solve stopped
     
     def create_initial_population(self):
         """Create an initial population of random routes"""
-        self.population = []
-        
-        for _ in range(self.population_size):
-            route = random.sample(self.cities, len(self.cities))
-            self.population.append(route)
+        routes = [self.rng.sample(range(self.num_cities), self.num_cities)
+                  for _ in range(self.population_size)]
+        self.population = np.array(routes, dtype=np.int32).reshape(self.population_size, self.num_cities)
+        self.route_lengths = np.full(self.population_size, np.nan)
+        self.route_hashes = tour_hashes(self.population) if self.hashing else None
             
         self.best_route = None
+        self.best_tour = None
         self.best_distance = float('inf')
         self.generation = 0
         self.history = []
-        self.last_best_distances = []
+        self.diversity_history = []
+        self.restarts = 0
+        self.last_restart = 0
+        self.operator_history = []
+        self._parent_mean = None
+        self.last_best_distances.clear()
         
         return self.population
     
+    def route_cities(self, route):
+        """Convert a route of city indices to the list of City objects it visits"""
+        if self.cities is None:
+            return [int(i) for i in route]
+        return [self.cities[i] for i in route]
+    
     def calculate_distance(self, route):
         """
         Calculate the total distance of a route.
         
+        With a precomputed matrix the edges are summed by the selected kernel
+        backend, otherwise by the distance engine.
+        
         Args:
-            route (list): List of cities in the order of visit
+            route (numpy.ndarray): City indices in the order of visit
             
         Returns:
             float: Total distance of the route
         """
-        total_distance = 0
-        for i in range(len(route)):
-            from_city = route[i]
-            to_city = route[(i + 1) % len(route)]
-            total_distance += from_city.distance(to_city)
-        
-        return total_distance
+        if self.distances.matrix is None:
+            return self.distances.tour_length(route)
+        return kernels.tour_length(np.asarray(route), self.distances.matrix)
     
     def calculate_fitness(self, route):
         """Calculate the fitness of a route (inverse of total distance)"""
         distance = self.calculate_distance(route)
         return 1 / distance if distance > 0 else float('inf')
     
+    def update_route_lengths(self):
+        """Cost the routes whose length is not cached and return all the lengths"""
+        stale = np.flatnonzero(np.isnan(self.route_lengths))
+        if len(stale):
+            self.route_lengths[stale] = self.distances.tour_lengths(self.population[stale])
+            if self.instrumentation is not None:
+                self.instrumentation.count("evaluations", len(stale))
+        return self.route_lengths
+    
     def evaluate_population(self):
-        """Evaluate the fitness of the entire population"""
-        fitness_results = {}
+        """
+        Evaluate the whole population in one batch.
         
-        for i, route in enumerate(self.population):
-            fitness_results[i] = self.calculate_fitness(route)
-            
-            distance = self.calculate_distance(route)
-            
-            if distance < self.best_distance:
-                self.best_distance = distance
-                self.best_route = route.copy()  # On garde une copie du meilleur chemin
+        Only routes without a cached length are costed, with a single
+        gather-and-sum over the distance matrix for all of them.
         
+        Returns:
+            tuple: (fitness, distances) arrays indexed like the population
+        """
+        distances = self.update_route_lengths()
+        if self._parent_mean is not None:
+            self.credit_operators(distances)
+        
+        with np.errstate(divide='ignore'):
+            fitness = 1 / distances
+        
+        self.update_best(distances)
         self.history.append(self.best_distance)
+        if self.track_diversity:
+            self.diversity_history.append(population_diversity(self.population, self.route_hashes))
         
-        return fitness_results
+        return fitness, distances
+    
+    def update_best(self, distances):
+        """Keep the best route of the population if it beats the best so far"""
+        best_idx = int(np.argmin(distances))
+        if distances[best_idx] < self.best_distance:
+            self.best_distance = float(distances[best_idx])
+            self.best_tour = self.population[best_idx].copy()  # On garde une copie du meilleur chemin
+            self.best_route = self.route_cities(self.best_tour)
+            if self.instrumentation is not None:
+                self.instrumentation.count("improvements")
     
-    def select_parents(self, fitness_results):
-        """Select parents for reproduction using tournament selection"""
-        selection_results = []
+    def select_parents(self, fitness):
+        """
+        Select parents for reproduction: the elites, then the rest of the
+        population drawn in one batch by the selection_type operator.
         
-        elite_indices = elitism_selection(fitness_results, self.elite_size)
-        selection_results.extend(elite_indices)
+        Returns:
+            tuple: (selected_routes, selected_lengths), elites first
+        """
+        elite_indices = elitism_selection(fitness, self.elite_size)
+        count = self.population_size - len(elite_indices)
         
-        while len(selection_results) < self.population_size:
-            selected_idx = tournament_selection(
-                self.population, fitness_results, self.tournament_size)
-            selection_results.append(selected_idx)
+        if self.selection_type == "rank":
+            selected = rank_selection(fitness, count, self.np_rng)
+        elif self.selection_type == "sus":
+            selected = stochastic_universal_sampling(fitness, count, self.np_rng)
+        else:
+            selected = tournament_selection_batch(fitness, count, self.tournament_size, self.np_rng)
+        selection_results = np.concatenate([elite_indices, selected])
         
-        selected_routes = [self.population[i] for i in selection_results]
-        return selected_routes
+        selected_routes = self.population[selection_results]
+        selected_lengths = self.route_lengths[selection_results]
+        return selected_routes, selected_lengths
+    
+    def crossover_batch(self, parents1, parents2):
+        """
+        Cross many pairs of parents at once (OX or CX), drawing the cut points
+        of OX from the numpy generator.
+        
+        Args:
+            parents1 (numpy.ndarray): (m, n) array of first parents
+            parents2 (numpy.ndarray): (m, n) array of second parents
+            
+        Returns:
+            numpy.ndarray: (m, n) array of children
+        """
+        if self.crossover_type == "cycle":
+            return cycle_crossover_batch(parents1, parents2)
+        m, n = parents1.shape
+        if n < 2:
+            return parents1.copy()
+        # Two distinct cut points per pair, sorted
+        first = self.np_rng.integers(0, n, size=m)
+        second = self.np_rng.integers(0, n - 1, size=m)
+        second += second >= first
+        cut_points = np.stack([np.minimum(first, second), np.maximum(first, second)], axis=1)
+        return ordered_crossover_batch(parents1, parents2, cut_points)
     
     def crossover(self, parent1, parent2):
-        """Cross parents to create a child (ordered crossover)"""
+        """Cross parents to create a child (OX, CX, EAX or ERX on index arrays)"""
         if self.crossover_type == "cycle":
             return cycle_crossover(parent1, parent2)
+        elif self.crossover_type in ("eax", "eax_block"):
+            strategy = "block" if self.crossover_type == "eax_block" else "single"
+            return edge_assembly_crossover(parent1, parent2, self.distances, self.np_rng, strategy,
+                                           self.distances.nearest_neighbors(self.neighbor_count))
+        elif self.crossover_type == "erx":
+            return edge_recombination_crossover(parent1, parent2, self.np_rng)
         else:
-            return ordered_crossover(parent1, parent2)
+            return ordered_crossover(parent1, parent2, rng=self.rng)
     
     def mutate(self, route):
-        """Apply mutation to the route (swap mutation)"""
+        """
+        Apply mutation to one route, like mutate_batch does to the children.
+        
+        Args:
+            route (numpy.ndarray): Route to mutate in place (array of city indices)
+            
+        Returns:
+            numpy.ndarray: The mutated route
+        """
+        route = np.asarray(route)
+        self.mutate_batch(route[None, :])
+        return route
+    
+    def mutate_batch(self, routes, lengths=None):
+        """
+        Apply mutation to many routes at once, drawing from the numpy generator.
+        
+        Args:
+            routes (numpy.ndarray): (m, n) routes to mutate in place
+            lengths (numpy.ndarray, optional): Their cached lengths (NaN if unknown),
+                updated in place
+            
+        Returns:
+            numpy.ndarray: Indices of the mutated routes
+        """
         if self.mutation_type == "insertion":
-            return insertion_mutation(route, self.mutation_rate)
+            operator = insertion_mutation_batch
         elif self.mutation_type == "inversion":
-            return inversion_mutation(route, self.mutation_rate)
+            operator = inversion_mutation_batch
         else:
-            return swap_mutation(route, self.mutation_rate)
+            operator = swap_mutation_batch
+        return operator(routes, self.mutation_rate, self.np_rng, distances=self.distances,
+                        lengths=lengths)
     
-    def create_next_generation(self, selected_routes):
-        """Create new generation from selected routes"""
-        next_generation = []
+    def create_next_generation(self, selected_routes, selected_lengths):
+        """
+        Create new generation from selected routes.
+        
+        Elites keep their cached length. Children produced without crossover
+        are clones of their first parent, so their length is updated from
+        the mutation delta; crossover children are costed at the next
+        evaluation (or by the workers in parallel mode).
+        """
+        next_generation = np.empty_like(self.population)
+        next_lengths = np.empty(self.population_size)
+        elite_count = min(self.elite_size, self.population_size)
         
-        elites = selected_routes[:self.elite_size]
-        next_generation.extend(elites)
+        next_generation[:elite_count] = selected_routes[:elite_count]
+        next_lengths[:elite_count] = selected_lengths[:elite_count]
+        if self.adaptive:
+            self.adapt(selected_lengths[elite_count:])
         
-        while len(next_generation) < self.population_size:
-            parent1, parent2 = random.sample(selected_routes, 2)
-            child = self.crossover(parent1, parent2)
-            child = self.mutate(child) 
-            next_generation.append(child)
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            start = time.perf_counter()
+        
+        if self.workers is not None and self.workers > 1:
+            if self._parallel is None:
+                self._parallel = ParallelBreeder(self, self.workers)
+            self._parallel.breed(selected_routes, selected_lengths, next_generation,
+                                 next_lengths, elite_count, self.rng.getrandbits(64),
+                                 {name: getattr(self, name) for name in ADAPTED_PARAMETERS})
+            if instrumentation is not None:
+                # The workers also cost their children
+                instrumentation.count("evaluations", self.population_size - elite_count)
+        else:
+            self.breed(selected_routes, selected_lengths, next_generation, next_lengths,
+                       range(elite_count, self.population_size))
+        
+        if instrumentation is not None:
+            end = time.perf_counter()
+            instrumentation.phase("breed", self.generation, start, end)
+            start = time.perf_counter()
+        
+        if self.local_search is not None:
+            self.improve(next_generation, next_lengths, elite_count)
+            if instrumentation is not None:
+                instrumentation.phase("local_search", self.generation, start)
+        
+        if self.hashing or instrumentation is not None:
+            hashes = tour_hashes(next_generation)
+            if instrumentation is not None:
+                # Counted before any elimination
+                instrumentation.count("duplicate_children", len(duplicate_rows(hashes)))
+        if self.hashing:
+            self.route_hashes = hashes
+            if self.eliminate_duplicates:
+                self.remove_duplicates(next_generation, next_lengths, self.route_hashes)
+            # At most one restart per stagnation window, to let the new routes spread
+            if (self.restart_threshold is not None
+                    and self.generation - self.last_restart >= self.generations_without_improvement
+                    and edge_entropy(next_generation) < self.restart_threshold):
+                self.partial_restart(next_generation, next_lengths, self.route_hashes, elite_count)
         
         self.population = next_generation
+        self.route_lengths = next_lengths
         self.generation += 1
         
         return self.population
     
+    def breed(self, selected_routes, selected_lengths, out_routes, out_lengths, slots):
+        """
+        Fill the given slots with children of the selected routes.
+        
+        Each child is created by crossover or cloned from its first parent,
+        then all the children are mutated together in one batch. With OX and
+        CX the parent pairs are drawn at once and all the crossovers are done
+        by one batch call; EAX and ERX create the children one by one.
+        
+        Args:
+            selected_routes (numpy.ndarray): Parents to pick from
+            selected_lengths (numpy.ndarray): Cached lengths of the parents
+            out_routes (numpy.ndarray): Array receiving the children
+            out_lengths (numpy.ndarray): Array receiving the children lengths (NaN if unknown)
+            slots (range): Consecutive rows of out_routes to fill
+        """
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            start = time.perf_counter()
+        rows = slice(slots.start, slots.stop)
+        if self.crossover_type in BATCH_CROSSOVERS:
+            self._breed_batch(selected_routes, selected_lengths, out_routes[rows], out_lengths[rows])
+        else:
+            for slot in slots:
+                idx1, idx2 = self.rng.sample(range(len(selected_routes)), 2)
+                parent1, parent2 = selected_routes[idx1], selected_routes[idx2]
+                if self.crossover_rate >= 1 or self.rng.random() < self.crossover_rate:
+                    out_routes[slot] = self.crossover(parent1, parent2)
+                    out_lengths[slot] = np.nan
+                else:
+                    out_routes[slot] = parent1
+                    out_lengths[slot] = selected_lengths[idx1]
+        
+        if instrumentation is not None:
+            middle = time.perf_counter()
+        self.mutate_batch(out_routes[rows], out_lengths[rows])
+        if instrumentation is not None:
+            end = time.perf_counter()
+            instrumentation.add_time("crossover", middle - start)
+            instrumentation.add_time("mutate", end - middle)
+    
+    def _breed_batch(self, selected_routes, selected_lengths, children, lengths):
+        """breed with a batch crossover: all the draws at once, then one crossover call"""
+        m, count = len(children), len(selected_routes)
+        # Two distinct parents per child
+        first = self.np_rng.integers(0, count, size=m)
+        second = self.np_rng.integers(0, count - 1, size=m)
+        second += second >= first
+        crossed = np.ones(m, dtype=bool)
+        if self.crossover_rate < 1:
+            crossed = self.np_rng.random(m) < self.crossover_rate
+        
+        children[~crossed] = selected_routes[first[~crossed]]
+        lengths[~crossed] = selected_lengths[first[~crossed]]
+        children[crossed] = self.crossover_batch(selected_routes[first[crossed]],
+                                                 selected_routes[second[crossed]])
+        lengths[crossed] = np.nan
+    
+    def remove_duplicates(self, routes, lengths, hashes):
+        """
+        Re-mutate the routes that are the same tour as an earlier route.
+        
+        Duplicates get a random segment inversion until their tour hash is
+        new, for at most DUPLICATE_RETRIES rounds. The first copy of every
+        tour is kept, so the elites (first in routes) are preserved.
+        
+        Args:
+            routes (numpy.ndarray): Routes of the new generation, modified in place
+            lengths (numpy.ndarray): Their cached lengths, updated by the mutation deltas
+            hashes (numpy.ndarray): Their tour hashes, updated in place
+        
+        Returns:
+            int: Number of duplicates found in the first round
+        """
+        found = None
+        for _ in range(DUPLICATE_RETRIES):
+            rows = duplicate_rows(hashes)
+            if found is None:
+                found = len(rows)
+            if not len(rows):
+                break
+            mutated, mutated_lengths = routes[rows], lengths[rows]
+            inversion_mutation_batch(mutated, 1.0, self.np_rng, self.distances, mutated_lengths)
+            routes[rows], lengths[rows] = mutated, mutated_lengths
+            hashes[rows] = tour_hashes(mutated)
+        return found
+    
+    def partial_restart(self, routes, lengths, hashes, elite_count):
+        """
+        Re-create the worst restart_fraction of the routes, when diversity has collapsed.
+        
+        The elites and the best routes are kept. Each replaced route is a
+        copy of a random kept one perturbed by RESTART_INVERSIONS random
+        segment inversions: random permutations would be too long to ever be
+        selected on large instances.
+        
+        Args:
+            routes (numpy.ndarray): Routes of the new generation, modified in place
+            lengths (numpy.ndarray): Their cached lengths (NaN if unknown), updated in place
+            hashes (numpy.ndarray): Their tour hashes, updated in place
+            elite_count (int): Number of elites at the start of routes
+        """
+        size = len(routes)
+        count = min(int(self.restart_fraction * size), size - max(1, elite_count))
+        if count <= 0:
+            return
+        # Unknown lengths (crossover children without local search) rank last
+        order = np.argsort(np.where(np.isnan(lengths), np.inf, lengths), kind="stable")
+        order = order[order >= elite_count]
+        replaced = np.sort(order[len(order) - count:])
+        kept = np.setdiff1d(np.arange(size), replaced)
+        
+        sources = kept[self.np_rng.integers(0, len(kept), size=count)]
+        new_routes, new_lengths = routes[sources], lengths[sources]
+        for _ in range(RESTART_INVERSIONS):
+            inversion_mutation_batch(new_routes, 1.0, self.np_rng, self.distances, new_lengths)
+        routes[replaced], lengths[replaced] = new_routes, new_lengths
+        hashes[replaced] = tour_hashes(new_routes)
+        self.restarts += 1
+        self.last_restart = self.generation
+        if self.instrumentation is not None:
+            self.instrumentation.count("restarts")
+    
+    def adapt(self, parent_lengths):
+        """
+        Adaptive mode: choose the operators of the generation being bred and its mutation rate.
+        
+        The choice is appended to operator_history; its reward is filled in
+        by credit_operators once the children have been evaluated.
+        
+        Args:
+            parent_lengths (numpy.ndarray): Lengths of the parents selected after the elites
+        """
+        unique_ratio = None
+        if self.route_hashes is not None:
+            unique_ratio = len(np.unique(self.route_hashes)) / len(self.route_hashes)
+        self.mutation_rate = adapt_mutation_rate(self.mutation_rate, is_stagnating(self.history),
+                                                 unique_ratio)
+        self.crossover_type = self.crossover_pursuit.choose(self.np_rng)
+        self.mutation_type = self.mutation_pursuit.choose(self.np_rng)
+        if len(parent_lengths):
+            self._parent_mean = float(np.mean(parent_lengths))
+        self.operator_history.append({
+            "generation": self.generation,
+            "crossover": self.crossover_type,
+            "mutation": self.mutation_type,
+            "mutation_rate": self.mutation_rate,
+            "reward": None,
+        })
+    
+    def credit_operators(self, lengths):
+        """
+        Adaptive mode: reward the last operators with the relative improvement
+        of the mean length of their children over that of their parents.
+        
+        Args:
+            lengths (numpy.ndarray): Lengths of the evaluated population, elites first
+        """
+        children = lengths[min(self.elite_size, self.population_size):]
+        reward = (self._parent_mean - float(np.mean(children))) / self._parent_mean
+        self._parent_mean = None
+        choice = self.operator_history[-1]
+        choice["reward"] = reward
+        self.crossover_pursuit.update(choice["crossover"], reward)
+        self.mutation_pursuit.update(choice["mutation"], reward)
+    
+    def diversity(self):
+        """
+        Diversity metrics of the current population.
+        
+        Returns:
+            dict: "unique_tours", "unique_ratio" and "edge_entropy" (see diversity.population_diversity)
+        """
+        return population_diversity(self.population, self.route_hashes)
+    
+    def improve(self, routes, lengths, elite_count):
+        """
+        Memetic stage: improve routes in place with 2-opt and Or-opt.
+        
+        Which routes are improved depends on local_search; the stage stops
+        when the per-generation time or move budget runs out.
+        
+        Args:
+            routes (numpy.ndarray): Routes of the new generation
+            lengths (numpy.ndarray): Their cached lengths, updated by the moves' deltas
+            elite_count (int): Number of elites at the start of routes
+        """
+        if self.local_search == "elites":
+            targets = range(elite_count)
+        elif self.local_search == "sample":
+            count = max(1, round(self.local_search_fraction * len(routes)))
+            targets = sorted(self.rng.sample(range(len(routes)), min(count, len(routes))))
+        else:
+            targets = range(elite_count, len(routes))
+        
+        neighbors = self.distances.nearest_neighbors(self.neighbor_count)
+        deadline = None
+        if self.local_search_time is not None:
+            deadline = time.perf_counter() + self.local_search_time
+        moves_left = self.local_search_moves
+        
+        for idx in targets:
+            delta, moves = improve_route(routes[idx], self.distances, neighbors,
+                                         max_moves=moves_left, deadline=deadline)
+            lengths[idx] += delta
+            if moves_left is not None:
+                moves_left -= moves
+                if moves_left <= 0:
+                    break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+    
+    def save_checkpoint(self, path=None):
+        """
+        Write the whole state of the run to a single binary file.
+        
+        The population is stored as an int32 array next to the cached
+        lengths, the best route, the history, the generation counter, the
+        stopping-criterion window and the state of the random generators, so
+        that a restored run continues exactly as this one would have.
+        
+        Args:
+            path (str, optional): Checkpoint file (checkpoint_path by default)
+        """
+        path = path or self.checkpoint_path
+        header = {
+            "version": 1,
+            "num_cities": self.num_cities,
+            "generation": self.generation,
+            "best_distance": self.best_distance,
+            "parameters": {name: getattr(self, name) for name in CHECKPOINT_PARAMETERS},
+            "rng_state": self.rng.getstate(),
+            "np_rng_state": self.np_rng.bit_generator.state,
+            "diversity_history": self.diversity_history,
+            "restarts": self.restarts,
+            "last_restart": self.last_restart,
+            "operator_history": self.operator_history,
+            "parent_mean": self._parent_mean,
+        }
+        if self.adaptive:
+            header["pursuits"] = [self.crossover_pursuit.state(), self.mutation_pursuit.state()]
+        arrays = {
+            "population": self.population.astype(np.int32, copy=False),
+            "route_lengths": self.route_lengths,
+            "history": np.asarray(self.history, dtype=np.float64),
+            "last_best_distances": np.asarray(self.last_best_distances, dtype=np.float64),
+        }
+        if self.best_tour is not None:
+            arrays["best_tour"] = self.best_tour
+        write_checkpoint(path, header, arrays)
+        self._last_checkpoint = time.monotonic()
+    
+    def restore_checkpoint(self, path, mmap=False):
+        """
+        Restore the state saved by save_checkpoint.
+        
+        The algorithm must solve the same instance, with the same parameters.
+        Without a seed, the state of the global random module is restored.
+        
+        Args:
+            path (str): Checkpoint file
+            mmap (bool): Map the population from the file (copy-on-write)
+                instead of reading it, for very large populations
+        """
+        header, arrays = read_checkpoint(path, mmap=mmap)
+        if header["num_cities"] != self.num_cities:
+            raise ValueError(f"Checkpoint is for {header['num_cities']} cities, not {self.num_cities}")
+        
+        self.population = arrays["population"]
+        self.route_lengths = np.array(arrays["route_lengths"])
+        self.best_tour = arrays.get("best_tour")
+        self.best_route = self.route_cities(self.best_tour) if self.best_tour is not None else None
+        self.best_distance = header["best_distance"]
+        self.history = arrays["history"].tolist()
+        self.last_best_distances = deque(arrays["last_best_distances"].tolist(),
+                                         maxlen=self.last_best_distances.maxlen)
+        self.generation = header["generation"]
+        self.diversity_history = header.get("diversity_history", [])
+        self.restarts = header.get("restarts", 0)
+        self.last_restart = header.get("last_restart", 0)
+        self.operator_history = header.get("operator_history", [])
+        self._parent_mean = header.get("parent_mean")
+        if self.adaptive and "pursuits" in header:
+            self.crossover_pursuit.set_state(header["pursuits"][0])
+            self.mutation_pursuit.set_state(header["pursuits"][1])
+        self.route_hashes = tour_hashes(self.population) if self.hashing else None
+        
+        version, internal_state, gauss_next = header["rng_state"]
+        self.rng.setstate((version, tuple(internal_state), gauss_next))
+        self.np_rng.bit_generator.state = header["np_rng_state"]
+        return self
+    
+    @classmethod
+    def from_checkpoint(cls, path, cities, mmap=False, **kwargs):
+        """
+        Rebuild an algorithm from a checkpoint.
+        
+        Args:
+            path (str): Checkpoint file
+            cities: Instance the checkpoint was made on (as for __init__)
+            mmap (bool): Map the population from the file instead of reading it
+            **kwargs: Other parameters of __init__ (workers, automatic checkpoints, ...)
+                or overrides of the saved ones
+        """
+        header, _ = read_checkpoint(path, mmap=True)
+        parameters = dict(header["parameters"], **kwargs)
+        return cls(cities, **parameters).restore_checkpoint(path, mmap=mmap)
+    
+    def _auto_checkpoint(self):
+        """Write the automatic checkpoint if one is due"""
+        due = (self.checkpoint_every is not None and self.generation % self.checkpoint_every == 0)
+        if not due and self.checkpoint_interval is not None:
+            due = time.monotonic() - self._last_checkpoint >= self.checkpoint_interval
+        if due:
+            self.save_checkpoint()
+    
+    def add_observer(self, callback):
+        """
+        Subscribe callback(event) to the instrumentation events, turning it on if needed.
+        
+        See Instrumentation for the events.
+        """
+        if self.instrumentation is None:
+            self.instrumentation = Instrumentation()
+        return self.instrumentation.subscribe(callback)
+    
+    def close(self):
+        """Shut down the worker processes of the parallel mode, if any"""
+        if self._parallel is not None:
+            self._parallel.close()
+            self._parallel = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
     def should_stop(self):
         """Check if the algorithm should stop based on improvement criterion"""
         if not self.use_stopping_criterion:
             return False
-            
-        if len(self.last_best_distances) < self.generations_without_improvement:
-            self.last_best_distances.append(self.best_distance)
-            return False
-            
+        
+        full = len(self.last_best_distances) == self.last_best_distances.maxlen
         self.last_best_distances.append(self.best_distance)
-        self.last_best_distances.pop(0)
+        if not full:
+            return False
         
         oldest = self.last_best_distances[0]
         newest = self.last_best_distances[-1]
@@ -158,11 +792,93 @@ class GeneticAlgorithm:
         relative_improvement = (oldest - newest) / oldest
         return relative_improvement < self.improvement_threshold
     
+    def solve(self, time_limit=None, deadline=None, max_generations=None,
+              target_length=None, target_gap=0.0):
+        """
+        Run generations until a budget or a goal is reached (anytime solving).
+        
+        The conditions are checked between generations, at the cost of a
+        comparison each. A generation is not started if it would end after
+        the deadline, its duration estimated by the shortest one so far (the
+        first one, which pays for caches and compilation, is left out).
+        
+        Args:
+            time_limit (float, optional): Wall-clock budget in seconds, from now
+            deadline (float, optional): Absolute deadline, as a time.perf_counter() value
+            max_generations (int, optional): Stop when self.generation reaches it
+            target_length (float, optional): Stop as soon as a route is this short...
+            target_gap (float): ...or within this relative gap above it (0.01 for 1%)
+            
+        Returns:
+            tuple: (best_route, best_distance, stop_reason) where stop_reason,
+            also kept in self.stop_reason, is one of "deadline", "generations",
+            "target" and "stagnation"
+        """
+        start = time.perf_counter()
+        if time_limit is not None:
+            deadline = start + time_limit if deadline is None else min(deadline, start + time_limit)
+        target = None if target_length is None else target_length * (1 + target_gap)
+        if not len(self.population):
+            self.create_initial_population()
+        
+        self.stop_reason = None
+        generation_time = 0.0  # Shortest generation so far, the first one (warm-up) left out
+        generations_run = 0
+        while self.stop_reason is None:
+            if target is not None and self.best_distance <= target:
+                self.stop_reason = STOP_TARGET
+            elif max_generations is not None and self.generation >= max_generations:
+                self.stop_reason = STOP_GENERATIONS
+            elif deadline is not None and time.perf_counter() + generation_time > deadline:
+                self.stop_reason = STOP_DEADLINE
+            else:
+                generation_start = time.perf_counter()
+                _, _, _, should_stop = self.run_generation()
+                elapsed = time.perf_counter() - generation_start
+                if generations_run == 1:
+                    generation_time = elapsed
+                elif generations_run > 1:
+                    generation_time = min(generation_time, elapsed)
+                generations_run += 1
+                if should_stop:
+                    self.stop_reason = STOP_STAGNATION
+        
+        # Cost the last generation for its best route only: the lengths stay
+        # cached, and the next run_generation records it in the histories and
+        # credits its operators once
+        self.update_best(self.update_route_lengths())
+        if target is not None and self.best_distance <= target:
+            self.stop_reason = STOP_TARGET
+        return self.best_route, self.best_distance, self.stop_reason
+    
     def run_generation(self):
         """Execute a complete generation of the genetic algorithm"""
-        fitness_results = self.evaluate_population()
-        selected_routes = self.select_parents(fitness_results)
-        self.create_next_generation(selected_routes)
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            fitness, _ = self.evaluate_population()
+            selected_routes, selected_lengths = self.select_parents(fitness)
+            self.create_next_generation(selected_routes, selected_lengths)
+            should_stop = self.should_stop()
+            if self.checkpoint_path is not None:
+                self._auto_checkpoint()
+            return self.best_route, self.best_distance, self.generation, should_stop
+        
+        generation = self.generation
+        start = time.perf_counter()
+        fitness, _ = self.evaluate_population()
+        end = time.perf_counter()
+        instrumentation.phase("evaluate", generation, start, end)
+        
+        selected_routes, selected_lengths = self.select_parents(fitness)
+        start = time.perf_counter()
+        instrumentation.phase("select", generation, end, start)
+        
+        self.create_next_generation(selected_routes, selected_lengths)
         
+        start = time.perf_counter()
         should_stop = self.should_stop()
+        instrumentation.phase("stopping", generation, start)
+        instrumentation.end_generation(generation, self.best_distance)
+        if self.checkpoint_path is not None:
+            self._auto_checkpoint()
         return self.best_route, self.best_distance, self.generation, should_stop
\ No newline at end of file
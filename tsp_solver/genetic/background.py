@@ -0,0 +1,183 @@
+"""
+Genetic algorithm run in a background process, for interactive front-ends.
+
+The algorithm is handed over with a checkpoint: the process resumes it,
+runs generations at full speed and, when stopped, writes it back so the
+caller's GeneticAlgorithm continues exactly where the process stopped.
+The instance arrays are shared with the process through shared memory.
+"""
+import multiprocessing
+import os
+import queue
+import tempfile
+import time
+import numpy as np
+from ..core.distance import DistanceMatrix
+from .parallel import _create_block, _attach, _release
+
+# Minimum time between two progress snapshots sent by the process, in seconds
+PROGRESS_INTERVAL = 0.05
+
+# Time left to the process to stop cleanly before it is terminated, in seconds
+STOP_TIMEOUT = 5.0
+
+
+def _run(specs, metric, checkpoint, progress, stop_event, interval):
+    """Body of the background process: run generations until stopped"""
+    from .algorithm import GeneticAlgorithm
+
+    try:
+        blocks = {}
+        arrays = {}
+        for key, spec in specs.items():
+            blocks[key], arrays[key] = _attach(spec)
+        distances = DistanceMatrix.from_arrays(arrays.get('coords'), arrays.get('matrix'), metric)
+        ga = GeneticAlgorithm.from_checkpoint(checkpoint, distances)
+
+        reason = "cancelled"
+        sent = len(ga.history)
+        last = time.perf_counter()
+        while not stop_event.is_set():
+            _, best_distance, generation, should_stop = ga.run_generation()
+            now = time.perf_counter()
+            if should_stop or now - last >= interval:
+                # Only the history entries not sent yet travel through the queue
+                progress.put(("progress", generation, best_distance, ga.best_tour, ga.history[sent:]))
+                sent = len(ga.history)
+                last = now
+            if should_stop:
+                reason = "stagnation"
+                break
+
+        ga.save_checkpoint(checkpoint)
+        progress.put(("finished", reason))
+    except Exception as e:
+        progress.put(("error", f"{type(e).__name__}: {e}"))
+
+
+class BackgroundSolver:
+    """
+    Runs a GeneticAlgorithm in a separate process.
+
+    While the process runs, poll() applies its progress snapshots (at most
+    one every PROGRESS_INTERVAL seconds) to the algorithm given to the
+    constructor: generation, best_distance, best_tour and history. Once
+    it has stopped (stop() was called or the stopping criterion was met),
+    the full state of the algorithm is restored from the process.
+
+    The process is started with the "spawn" method: forking a GUI
+    application, with its threads and native resources, is not safe.
+    """
+
+    def __init__(self, ga, interval=PROGRESS_INTERVAL):
+        """
+        Start the process.
+
+        Args:
+            ga (GeneticAlgorithm): Algorithm to run, with its initial population
+            interval (float): Minimum time between two progress snapshots, in seconds
+        """
+        self.ga = ga
+        self.finished = False
+        self.stop_reason = None  # "cancelled", "stagnation" or "error" once finished
+        self.error = None
+
+        fd, self.checkpoint = tempfile.mkstemp(prefix="tsp_solver_", suffix=".ckpt")
+        os.close(fd)
+        ga.save_checkpoint(self.checkpoint)
+
+        distances = ga.distances
+        arrays = {}
+        if distances.coords is not None:
+            arrays['coords'] = distances.coords
+        if distances.matrix is not None:
+            arrays['matrix'] = distances.matrix
+        self.blocks = []
+        specs = {}
+        for key, array in arrays.items():
+            block = _create_block(np.ascontiguousarray(array))
+            self.blocks.append(block)
+            specs[key] = (block.name, array.shape, array.dtype.str)
+
+        context = multiprocessing.get_context("spawn")
+        self.stop_event = context.Event()
+        self.progress = context.Queue()
+        self.process = context.Process(
+            target=_run, args=(specs, distances.metric, self.checkpoint, self.progress,
+                               self.stop_event, interval),
+            daemon=True)
+        self.process.start()
+
+    def stop(self):
+        """Ask the process to stop after its current generation (returns immediately)"""
+        self.stop_event.set()
+
+    def poll(self, timeout=None):
+        """
+        Apply the progress received from the process.
+
+        Args:
+            timeout (float, optional): Wait up to this long for a first message
+
+        Returns:
+            bool: True if the algorithm changed (new progress, or finished)
+        """
+        changed = False
+        while not self.finished:
+            try:
+                if timeout is not None and not changed:
+                    message = self.progress.get(timeout=timeout)
+                else:
+                    message = self.progress.get_nowait()
+            except queue.Empty:
+                if not self.process.is_alive() and self.progress.empty():
+                    self._finish("error", f"Solver process exited with code {self.process.exitcode}")
+                    changed = True
+                break
+
+            changed = True
+            if message[0] == "progress":
+                _, generation, best_distance, best_tour, history = message
+                self.ga.generation = generation
+                self.ga.best_distance = best_distance
+                self.ga.best_tour = best_tour
+                self.ga.history.extend(history)
+            elif message[0] == "finished":
+                self.process.join()
+                self.ga.restore_checkpoint(self.checkpoint)
+                self._finish(message[1])
+            else:
+                self._finish("error", message[1])
+        return changed
+
+    def close(self, timeout=STOP_TIMEOUT):
+        """
+        Stop the process and wait for its state, terminating it after timeout seconds.
+
+        After a termination the algorithm keeps the last progress received
+        but not the population of the process.
+        """
+        self.stop()
+        deadline = time.monotonic() + timeout
+        while not self.finished and time.monotonic() < deadline:
+            self.poll(timeout=max(0.0, deadline - time.monotonic()))
+        if not self.finished:
+            self.process.terminate()
+            self.process.join()
+            self._finish("error", "Solver process terminated")
+
+    def _finish(self, reason, error=None):
+        self.finished = True
+        self.stop_reason = reason
+        self.error = error
+        self.progress.close()
+        _release(self.blocks)
+        self.blocks = []
+        if os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,93 @@
+"""
+Single-file binary checkpoints.
+
+Layout: an 8-byte magic, the length of a JSON header as a little-endian
+uint64, the header, then the raw arrays, each one aligned on ALIGNMENT
+bytes so it can be memory-mapped in place. The header holds the scalar
+state and, for each array, its dtype, shape and offset in the file.
+"""
+import json
+import os
+import struct
+import numpy as np
+
+MAGIC = b"TSPGACK1"
+
+# Alignment of the arrays in the file, in bytes
+ALIGNMENT = 64
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_checkpoint(path, header, arrays):
+    """
+    Write a checkpoint atomically (to a temporary file, then renamed).
+
+    Args:
+        path (str): Checkpoint file
+        header (dict): JSON-serializable state
+        arrays (dict): Name -> numpy.ndarray
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    layout = {}
+    header = dict(header, arrays=layout)
+
+    # The offsets depend on the header length, which depends on the offsets:
+    # grow the space left for the header until it fits
+    start = 0
+    while True:
+        offset = start
+        for name, array in arrays.items():
+            layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            offset = _aligned(offset + array.nbytes)
+        encoded = json.dumps(header).encode()
+        if len(MAGIC) + 8 + len(encoded) <= start:
+            break
+        start = _aligned(len(MAGIC) + 8 + len(encoded) + 16 * len(arrays))
+
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(encoded)))
+        f.write(encoded)
+        for name, array in arrays.items():
+            f.seek(layout[name]["offset"])
+            array.tofile(f)
+        f.truncate(offset)
+    os.replace(partial, path)
+
+
+def read_checkpoint(path, mmap=False):
+    """
+    Read a checkpoint written by write_checkpoint.
+
+    Args:
+        path (str): Checkpoint file
+        mmap (bool): Map the arrays copy-on-write instead of reading them
+
+    Returns:
+        tuple: (header dict, dict of arrays)
+
+    Raises:
+        ValueError: If the file is not a checkpoint
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a checkpoint file")
+        (length,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(length))
+
+        arrays = {}
+        for name, spec in header.pop("arrays").items():
+            dtype = np.dtype(spec["dtype"])
+            shape = tuple(spec["shape"])
+            if mmap and int(np.prod(shape)) > 0:
+                arrays[name] = np.asarray(np.memmap(path, dtype=dtype, mode="c",
+                                                    offset=spec["offset"], shape=shape))
+            else:
+                f.seek(spec["offset"])
+                count = int(np.prod(shape))
+                arrays[name] = np.fromfile(f, dtype=dtype, count=count).reshape(shape)
+    return header, arrays
@@ -0,0 +1,308 @@
+"""
+Divide-and-conquer solving of very large instances.
+
+The cities are partitioned into spatial clusters of a few hundred cities,
+each cluster is solved by its own GeneticAlgorithm in a worker process, the
+order in which the clusters are visited is solved the same way over their
+centroids, and the cluster tours are cut open and stitched together in that
+order. A final local search pass starting from the cities near the cluster
+boundaries repairs the seams.
+"""
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.spatial import cKDTree
+from ..core.distance import DistanceMatrix
+from ..core.instance import TSPInstance
+from .algorithm import GeneticAlgorithm
+from .local_search import local_search
+
+PARTITIONS = ("kmeans", "grid")
+
+# Lloyd iterations of the k-means partition (started from the grid partition)
+KMEANS_ITERATIONS = 10
+
+# Default GeneticAlgorithm parameters of the cluster and order problems:
+# small populations, kept diverse and polished by local search
+CLUSTER_GA_DEFAULTS = {
+    "population_size": 40,
+    "elite_size": 4,
+    "mutation_type": "inversion",
+    "mutation_rate": 0.2,
+    "local_search": "elites",
+    "eliminate_duplicates": True,
+}
+
+# Share of the time limit given to the cluster GAs, the rest going to the
+# cluster order and to the boundary repair
+CLUSTER_TIME_SHARE = 0.6
+ORDER_TIME_SHARE = 0.1
+
+# Stages of a solve, in order, as reported in timings
+STAGES = ("partition", "clusters", "order", "stitch", "repair")
+
+
+def grid_partition(coords, cluster_count):
+    """
+    Balanced grid partition: vertical strips of equal size, each cut into cells of equal size.
+
+    Args:
+        coords (numpy.ndarray): (n, 2) city coordinates
+        cluster_count (int): Approximate number of clusters
+
+    Returns:
+        numpy.ndarray: Cluster of every city, from 0 to the number of clusters - 1
+    """
+    n = len(coords)
+    strips = max(1, round(math.sqrt(cluster_count)))
+    cells = max(1, round(cluster_count / strips))
+    labels = np.empty(n, dtype=np.int64)
+    by_x = np.argsort(coords[:, 0], kind="stable")
+    for strip, members in enumerate(np.array_split(by_x, strips)):
+        by_y = members[np.argsort(coords[members, 1], kind="stable")]
+        for cell, cell_members in enumerate(np.array_split(by_y, cells)):
+            labels[cell_members] = strip * cells + cell
+    return _compact_labels(labels)
+
+
+def kmeans_partition(coords, cluster_count, iterations=KMEANS_ITERATIONS):
+    """
+    k-means partition, started from the centroids of the grid partition.
+
+    Args:
+        coords (numpy.ndarray): (n, 2) city coordinates
+        cluster_count (int): Approximate number of clusters
+        iterations (int): Number of Lloyd iterations
+
+    Returns:
+        numpy.ndarray: Cluster of every city, from 0 to the number of clusters - 1
+    """
+    labels = grid_partition(coords, cluster_count)
+    for _ in range(iterations):
+        centroids = cluster_centroids(coords, labels)
+        _, new_labels = cKDTree(centroids).query(coords)
+        new_labels = _compact_labels(new_labels)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+    return labels
+
+
+def _compact_labels(labels):
+    """Renumber the non-empty clusters from 0"""
+    return np.unique(labels, return_inverse=True)[1].reshape(-1)
+
+
+def cluster_centroids(coords, labels):
+    """(k, 2) mean coordinates of the cities of each cluster"""
+    counts = np.bincount(labels)[:, None]
+    sums = np.stack([np.bincount(labels, weights=coords[:, axis]) for axis in range(2)], axis=1)
+    return sums / counts
+
+
+def _solve_tour(coords, metric, ga_kwargs, seed, time_limit, generations):
+    """Tour of a small problem by a GeneticAlgorithm (run in the worker processes)"""
+    n = len(coords)
+    if n <= 3:
+        return np.arange(n)
+    distances = DistanceMatrix(coords, metric=metric)
+    with GeneticAlgorithm(distances, seed=seed, **ga_kwargs) as ga:
+        ga.create_initial_population()
+        ga.solve(time_limit=time_limit, max_generations=generations)
+        return ga.best_tour
+
+
+def _open_path(cycle, entry, following, distances):
+    """
+    Cut a cluster cycle into a path starting at entry and choose its end.
+
+    The path ends at one of the two cycle neighbours of entry (the edge
+    between them is removed): the one minimizing the length of the removed
+    edge subtracted from the link to the next cluster.
+
+    Args:
+        cycle (numpy.ndarray): Cluster tour (global city indices)
+        entry (int): First city of the path
+        following (callable): Returns (distance, city) of the city of the next
+            cluster the path would go on to from a given city
+        distances (DistanceMatrix): Distance engine of the instance
+
+    Returns:
+        tuple: (path, next_entry)
+    """
+    m = len(cycle)
+    rolled = np.roll(cycle, -int(np.flatnonzero(cycle == entry)[0]))
+    if m == 1:
+        return rolled, following(rolled[0])[1]
+    # Ending at the predecessor keeps the order, at the successor reverses it
+    paths = (rolled, np.concatenate([rolled[:1], rolled[:0:-1]]))
+    best = None
+    for path in paths:
+        link, next_entry = following(path[-1])
+        cost = link - distances(path[0], path[-1])
+        if best is None or cost < best[0]:
+            best = (cost, path, next_entry)
+    return best[1], best[2]
+
+
+class DecompositionSolver:
+    """
+    Divide-and-conquer solver for instances of 10 000 cities and more.
+
+    The instance is partitioned into clusters of about cluster_size cities
+    ("kmeans" or balanced "grid" partition). Every cluster is solved by a
+    GeneticAlgorithm in a pool of worker processes, and so is the visiting
+    order of the clusters (a TSP over their centroids). Each cluster tour
+    is then opened into a path entering at the city closest to the end of
+    the previous cluster path, and a 2-opt/Or-opt pass starting from the
+    cities that have candidate neighbours in another cluster repairs the
+    seams. The duration of every stage is recorded in timings.
+    """
+
+    def __init__(self, cities, cluster_size=200, partition="kmeans", workers=None, seed=None,
+                 cluster_generations=200, neighbor_count=8, **ga_kwargs):
+        """
+        Initialize the solver.
+
+        Args:
+            cities (TSPInstance or DistanceMatrix): Instance to solve, with coordinates
+            cluster_size (int): Approximate number of cities per cluster
+            partition (str): "kmeans" or "grid"
+            workers (int, optional): Number of worker processes (CPU count by default,
+                1 solves the clusters in this process)
+            seed (int, optional): Seed of the partition-independent random draws
+            cluster_generations (int): Generation cap of each cluster GA
+            neighbor_count (int): Length of the candidate lists of the boundary repair
+            **ga_kwargs: Parameters of the cluster GeneticAlgorithms, overriding
+                CLUSTER_GA_DEFAULTS
+        """
+        if partition not in PARTITIONS:
+            raise ValueError(f"Unknown partition: {partition}")
+        self.distances = cities.distances if isinstance(cities, TSPInstance) else cities
+        if self.distances.coords is None or self.distances.metric == "explicit":
+            raise ValueError("Decomposition needs city coordinates")
+        self.cluster_size = cluster_size
+        self.partition = partition
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+        self.cluster_generations = cluster_generations
+        self.neighbor_count = neighbor_count
+        self.ga_kwargs = dict(CLUSTER_GA_DEFAULTS, **ga_kwargs)
+
+        self.labels = None  # Cluster of every city
+        self.cluster_order = None  # Clusters in the order they are visited
+        self.best_tour = None
+        self.best_distance = float('inf')
+        self.stitched_distance = None  # Length before the boundary repair
+        self.timings = {}  # Seconds spent in each of STAGES, and "total"
+
+    def solve(self, time_limit=None, repair_time=None):
+        """
+        Solve the instance.
+
+        Args:
+            time_limit (float, optional): Approximate time budget in seconds, shared
+                between the cluster GAs (CLUSTER_TIME_SHARE), the order GA
+                (ORDER_TIME_SHARE) and the repair (the rest)
+            repair_time (float, optional): Time budget of the boundary repair, in
+                seconds (what is left of time_limit by default, otherwise unlimited)
+
+        Returns:
+            tuple: (best_tour, best_distance)
+        """
+        start = time.perf_counter()
+        deadline = None if time_limit is None else start + time_limit
+        self.timings = {}
+        coords = self.distances.coords
+        metric = self.distances.metric
+        seeds = np.random.SeedSequence(self.seed)
+
+        # Partition
+        stage = time.perf_counter()
+        cluster_count = max(1, round(len(coords) / self.cluster_size))
+        if self.partition == "grid":
+            self.labels = grid_partition(coords, cluster_count)
+        else:
+            self.labels = kmeans_partition(coords, cluster_count)
+        clusters = np.split(np.argsort(self.labels, kind="stable"),
+                            np.cumsum(np.bincount(self.labels))[:-1])
+        stage = self._record("partition", stage)
+
+        # Clusters, in waves of one cluster per worker
+        cluster_time = None
+        if time_limit is not None:
+            waves = math.ceil(len(clusters) / self.workers)
+            cluster_time = CLUSTER_TIME_SHARE * time_limit / waves
+        tasks = [(coords[members], metric, self.ga_kwargs, int(seed.generate_state(1)[0]),
+                  cluster_time, self.cluster_generations)
+                 for members, seed in zip(clusters, seeds.spawn(len(clusters)))]
+        if self.workers > 1 and len(clusters) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(clusters))) as executor:
+                tours = list(executor.map(_solve_tour, *zip(*tasks)))
+        else:
+            tours = [_solve_tour(*task) for task in tasks]
+        cycles = [members[tour] for members, tour in zip(clusters, tours)]
+        stage = self._record("clusters", stage)
+
+        # Order of the clusters
+        order_time = None if time_limit is None else ORDER_TIME_SHARE * time_limit
+        order_seed = int(seeds.spawn(1)[0].generate_state(1)[0])
+        self.cluster_order = _solve_tour(cluster_centroids(coords, self.labels), "euclidean",
+                                         self.ga_kwargs, order_seed, order_time,
+                                         self.cluster_generations)
+        stage = self._record("order", stage)
+
+        # Stitch the cluster paths in that order
+        tour = self._stitch(cycles, self.cluster_order)
+        self.stitched_distance = float(self.distances.tour_lengths(tour[None, :])[0])
+        stage = self._record("stitch", stage)
+
+        # Boundary repair, from the cities with a candidate in another cluster
+        neighbors = self.distances.nearest_neighbors(self.neighbor_count)
+        boundary = np.flatnonzero((self.labels[neighbors] != self.labels[:, None]).any(axis=1))
+        repair_deadline = deadline
+        if repair_time is not None:
+            repair_deadline = time.perf_counter() + repair_time
+        local_search(tour, self.distances, neighbors, deadline=repair_deadline, cities=boundary)
+        self.best_tour = tour
+        self.best_distance = float(self.distances.tour_lengths(tour[None, :])[0])
+        self._record("repair", stage)
+
+        self.timings["total"] = time.perf_counter() - start
+        return self.best_tour, self.best_distance
+
+    def _stitch(self, cycles, order):
+        """Join the cluster cycles into one tour, visiting the clusters in order"""
+        coords = self.distances.coords
+        distances = self.distances
+        # The first cluster is entered from the centroid of the last one
+        last = cycles[order[-1]]
+        _, nearest = cKDTree(coords[cycles[order[0]]]).query(coords[last].mean(axis=0))
+        first_entry = entry = int(cycles[order[0]][nearest])
+
+        def back_to_start(city):
+            return distances(city, first_entry), first_entry
+
+        paths = []
+        for step, cluster in enumerate(order):
+            following = back_to_start
+            if step + 1 < len(order):
+                following_cycle = cycles[order[step + 1]]
+                tree = cKDTree(coords[following_cycle])
+
+                def following(city, tree=tree, cycle=following_cycle):
+                    _, nearest = tree.query(coords[city])
+                    nxt = int(cycle[nearest])
+                    return distances(city, nxt), nxt
+
+            path, entry = _open_path(cycles[cluster], entry, following, distances)
+            paths.append(path)
+        return np.concatenate(paths).astype(np.int32)
+
+    def _record(self, stage, start):
+        """Record the duration of a stage and return the current time"""
+        now = time.perf_counter()
+        self.timings[stage] = now - start
+        return now
@@ -0,0 +1,105 @@
+"""
+Canonical tour hashes and population diversity metrics.
+
+A tour is hashed through its set of undirected edges: every edge is mixed
+into a 64-bit value and the values are summed (modulo 2**64). The hash
+therefore does not depend on the starting city nor on the direction of the
+tour, and is computed for a whole population with a few array operations.
+"""
+import numpy as np
+
+# Constants of the splitmix64 finalizer, mixing an edge key into 64 bits
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def _edge_keys(routes):
+    """(m, n) uint64 keys of the undirected edges of each route, smaller city first"""
+    routes = np.asarray(routes)
+    following = np.roll(routes, -1, axis=-1)
+    low = np.minimum(routes, following).astype(np.uint64)
+    high = np.maximum(routes, following).astype(np.uint64)
+    return (low << np.uint64(32)) | high
+
+
+def _mix(keys):
+    z = keys + _GOLDEN
+    z = (z ^ (z >> np.uint64(30))) * _MIX1
+    z = (z ^ (z >> np.uint64(27))) * _MIX2
+    return z ^ (z >> np.uint64(31))
+
+
+def tour_hashes(routes):
+    """
+    Canonical hash of each route, the same for all its rotations and reversals.
+
+    Args:
+        routes (numpy.ndarray): (m, n) array of routes, or a single route
+
+    Returns:
+        numpy.ndarray: (m,) uint64 hashes (a uint64 scalar for a single route)
+    """
+    return _mix(_edge_keys(routes)).sum(axis=-1, dtype=np.uint64)
+
+
+def duplicate_rows(hashes):
+    """
+    Rows whose hash already appears in an earlier row.
+
+    Args:
+        hashes (numpy.ndarray): Hash of each route
+
+    Returns:
+        numpy.ndarray: Sorted indices of the duplicates (the first copy is kept)
+    """
+    _, first = np.unique(hashes, return_index=True)
+    keep = np.zeros(len(hashes), dtype=bool)
+    keep[first] = True
+    return np.flatnonzero(~keep)
+
+
+def edge_entropy(routes):
+    """
+    Normalized entropy of the edge frequencies of a population.
+
+    0 when all the routes are the same tour, 1 when no two routes share an
+    edge. It measures how much of the edge material differs, unlike the
+    number of distinct tours which ignores how close they are.
+
+    Args:
+        routes (numpy.ndarray): (m, n) array of routes
+
+    Returns:
+        float: Entropy in [0, 1]
+    """
+    m, n = routes.shape
+    if m < 2:
+        return 0.0
+    _, counts = np.unique(_edge_keys(routes), return_counts=True)
+    p = counts / (m * n)
+    entropy = -np.sum(p * np.log(p))
+    # From log(n) (a single tour) to log(m * n) (all edges distinct)
+    return float(np.clip((entropy - np.log(n)) / np.log(m), 0.0, 1.0))
+
+
+def population_diversity(routes, hashes=None):
+    """
+    Diversity metrics of a population.
+
+    Args:
+        routes (numpy.ndarray): (m, n) array of routes
+        hashes (numpy.ndarray, optional): Their tour hashes, computed if not given
+
+    Returns:
+        dict: "unique_tours" (number of distinct tours), "unique_ratio"
+        (their share of the population) and "edge_entropy"
+    """
+    if hashes is None:
+        hashes = tour_hashes(routes)
+    unique = len(np.unique(hashes))
+    return {
+        "unique_tours": unique,
+        "unique_ratio": unique / max(1, len(hashes)),
+        "edge_entropy": edge_entropy(routes),
+    }
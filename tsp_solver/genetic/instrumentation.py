@@ -0,0 +1,139 @@
+import csv
+import json
+import os
+import time
+from collections import defaultdict, deque
+
+# Phases of a generation, in the order they run. "breed" is the creation of
+# all the children; in a single process it is split into "crossover" (summed
+# over the children) and "mutate" (one batch), with workers it is not
+PHASES = ("evaluate", "select", "crossover", "mutate", "breed", "local_search", "stopping")
+
+# Counters reported for every generation
+COUNTERS = ("evaluations", "duplicate_children", "improvements", "restarts")
+
+# Generations whose phases and rows are kept for the exports; older ones are
+# dropped (the totals still include them), so a long run uses bounded memory
+KEPT_GENERATIONS = 10000
+
+
+class Instrumentation:
+    """
+    Per-phase timers and counters of a GeneticAlgorithm.
+
+    The algorithm reports the duration of each phase and its counters, and
+    closes every generation with end_generation. Observers subscribed with
+    subscribe are called with an event dict:
+
+    - {"type": "phase", "name", "generation", "start", "duration"}
+    - {"type": "generation", "generation", "best_distance", "phases", "counters"}
+
+    Times are in seconds, relative to the creation of the instrumentation.
+    When a GeneticAlgorithm has no instrumentation, none of this runs.
+    Only the last kept_generations generations are exported; observers can
+    stream all of them elsewhere.
+    """
+
+    def __init__(self, kept_generations=KEPT_GENERATIONS):
+        self.observers = []
+        self.origin = time.perf_counter()
+        # (name, generation, start, duration, args) of the last phases, at most
+        # len(PHASES) per kept generation
+        self.events = deque(maxlen=kept_generations * len(PHASES))
+        self.rows = deque(maxlen=kept_generations)  # Phase times and counters of each kept generation
+        self.generations = 0  # Number of finished generations
+        self.totals = defaultdict(float)  # Total time of each phase
+        self.counters = defaultdict(int)  # Total of each counter
+        self._phases = defaultdict(float)
+        self._counters = defaultdict(int)
+
+    def subscribe(self, callback):
+        """Call callback(event) for every phase and generation event"""
+        self.observers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self.observers.remove(callback)
+
+    def _notify(self, event):
+        for callback in self.observers:
+            callback(event)
+
+    def phase(self, name, generation, start, end=None, **args):
+        """
+        Record a phase that ran from start to end (perf_counter values).
+
+        Args:
+            name (str): Phase name, one of PHASES
+            generation (int): Generation the phase belongs to
+            start (float): time.perf_counter() when the phase started
+            end (float, optional): time.perf_counter() when it ended (now by default)
+            **args: Extra values stored with the trace event
+        """
+        if end is None:
+            end = time.perf_counter()
+        duration = end - start
+        self._phases[name] += duration
+        self.totals[name] += duration
+        self.events.append((name, generation, start - self.origin, duration, args))
+        if self.observers:
+            self._notify({"type": "phase", "name": name, "generation": generation,
+                          "start": start - self.origin, "duration": duration})
+
+    def add_time(self, name, duration):
+        """Add time to a phase made of many short intervals (e.g. crossover of each child)"""
+        self._phases[name] += duration
+        self.totals[name] += duration
+
+    def count(self, name, value=1):
+        """Increment a counter of the current generation"""
+        self._counters[name] += value
+        self.counters[name] += value
+
+    def end_generation(self, generation, best_distance):
+        """Close the current generation and notify the observers"""
+        row = {"generation": generation, "best_distance": best_distance}
+        row.update({name: self._phases.get(name, 0.0) for name in PHASES})
+        row.update({name: self._counters.get(name, 0) for name in COUNTERS})
+        self.rows.append(row)
+        self.generations += 1
+        if self.observers:
+            self._notify({"type": "generation", "generation": generation,
+                          "best_distance": best_distance,
+                          "phases": dict(self._phases), "counters": dict(self._counters)})
+        self._phases.clear()
+        self._counters.clear()
+
+    def summary(self):
+        """Total time of each phase and total of each counter"""
+        return {"phases": dict(self.totals), "counters": dict(self.counters),
+                "generations": self.generations}
+
+    def to_chrome_trace(self, path):
+        """
+        Write the phases as Chrome trace events (chrome://tracing, Perfetto).
+
+        Each phase is a complete ("X") event and the counters of each
+        generation a counter ("C") event.
+        """
+        pid = os.getpid()
+        trace = [{"name": name, "cat": "ga", "ph": "X", "pid": pid, "tid": 0,
+                  "ts": start * 1e6, "dur": duration * 1e6,
+                  "args": dict(args, generation=generation)}
+                 for name, generation, start, duration, args in self.events]
+        ends = {}
+        for name, generation, start, duration, _ in self.events:
+            ends[generation] = max(ends.get(generation, 0.0), start + duration)
+        for row in self.rows:
+            trace.append({"name": "counters", "ph": "C", "pid": pid, "tid": 0,
+                          "ts": ends.get(row["generation"], 0.0) * 1e6,
+                          "args": {name: row[name] for name in COUNTERS}})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+
+    def to_csv(self, path):
+        """Write one row per kept generation: phase times (s) and counters"""
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["generation", "best_distance", *PHASES, *COUNTERS])
+            writer.writeheader()
+            writer.writerows(self.rows)
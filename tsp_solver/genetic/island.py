@@ -0,0 +1,198 @@
+import random
+import multiprocessing
+import numpy as np
+from .algorithm import GeneticAlgorithm
+from .diversity import tour_hashes
+
+TOPOLOGIES = ("ring", "random")
+
+
+def _island_process(conn, cities, ga_kwargs, seed):
+    """
+    Run one island: a GeneticAlgorithm driven by commands from the coordinator.
+
+    Commands are ("run", generations), ("migrate", routes, lengths) and ("stop",).
+    """
+    ga = GeneticAlgorithm(cities, seed=seed, **ga_kwargs)
+    ga.create_initial_population()
+    migration_size = 0
+
+    while True:
+        command = conn.recv()
+
+        if command[0] == "run":
+            generations, migration_size = command[1], command[2]
+            start = len(ga.history)
+            should_stop = False
+            for _ in range(generations):
+                _, _, _, should_stop = ga.run_generation()
+                if should_stop:
+                    break
+
+            lengths = ga.update_route_lengths()
+            best = np.argsort(lengths, kind='stable')[:migration_size]
+            conn.send((ga.history[start:], ga.best_tour, ga.best_distance,
+                       ga.population[best], lengths[best], should_stop))
+
+        elif command[0] == "migrate":
+            routes, lengths = command[1], command[2]
+            # Immigrants replace the worst individuals
+            worst = np.argsort(ga.update_route_lengths(), kind='stable')[::-1][:len(routes)]
+            ga.population[worst] = routes
+            ga.route_lengths[worst] = lengths
+            if ga.route_hashes is not None:
+                ga.route_hashes[worst] = tour_hashes(routes)
+
+        else:
+            conn.close()
+            return
+
+
+class IslandModel:
+    """
+    Island model built on GeneticAlgorithm.
+
+    Each island is an independent population evolving in its own process.
+    Every migration_interval generations, each island sends copies of its
+    migration_size best routes to the next island of the topology, where
+    they replace the worst individuals. With the "ring" topology island i
+    always sends to island i + 1; with "random" a new ring order is drawn
+    for every migration.
+    """
+
+    def __init__(self, cities, islands=4, migration_interval=20, migration_size=2,
+                 topology="ring", seed=None, **ga_kwargs):
+        """
+        Initialize the island model.
+
+        Args:
+            cities (list, TSPInstance or DistanceMatrix): Cities to visit, as accepted
+                by GeneticAlgorithm
+            islands (int): Number of populations, each one in its own process
+            migration_interval (int): Generations between two migrations
+            migration_size (int): Number of routes each island sends per migration
+            topology (str): "ring" or "random"
+            seed (int, optional): Seed of the coordinator and of the islands
+            **ga_kwargs: Parameters of the GeneticAlgorithm of each island
+        """
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown topology: {topology}")
+
+        self.cities = cities
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.topology = topology
+        self.rng = random.Random(seed)
+        self.ga_kwargs = ga_kwargs
+
+        self.best_route = None  # List of City objects for a list of cities, else best_tour
+        self.best_tour = None
+        self.best_distance = float('inf')
+        self.generation = 0
+        self.history = []  # Best distance over all islands, per generation
+        # Best distance of each island, per generation of the model: an island
+        # that stopped early keeps its last value
+        self.island_histories = [[] for _ in range(islands)]
+
+        self._connections = []
+        self._processes = []
+
+    def start(self):
+        """Start the island processes"""
+        if self._processes:
+            return
+
+        for _ in range(self.islands):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_island_process,
+                args=(child_conn, self.cities, self.ga_kwargs, self.rng.getrandbits(64)))
+            process.start()
+            child_conn.close()
+            self._connections.append(parent_conn)
+            self._processes.append(process)
+
+    def close(self):
+        """Stop the island processes"""
+        for conn in self._connections:
+            try:
+                conn.send(("stop",))
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+        for process in self._processes:
+            process.join()
+        self._connections = []
+        self._processes = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _route(self, tour):
+        """City objects of a tour when the model was given a list of cities, else the tour"""
+        if isinstance(self.cities, list):
+            return [self.cities[i] for i in tour]
+        return tour
+
+    def _destinations(self):
+        """Island receiving the migrants of each island"""
+        order = list(range(self.islands))
+        if self.topology == "random":
+            self.rng.shuffle(order)
+        destinations = [0] * self.islands
+        for i, island in enumerate(order):
+            destinations[island] = order[(i + 1) % self.islands]
+        return destinations
+
+    def run(self, generations):
+        """
+        Run all islands for a number of generations, migrating periodically.
+
+        The run ends early if every island's stopping criterion is met.
+
+        Args:
+            generations (int): Number of generations of each island
+
+        Returns:
+            tuple: (best_route, best_distance) over all islands
+        """
+        self.start()
+        remaining = generations
+
+        while remaining > 0:
+            epoch = min(self.migration_interval, remaining)
+            for conn in self._connections:
+                conn.send(("run", epoch, self.migration_size))
+            reports = [conn.recv() for conn in self._connections]
+
+            done = max(len(report[0]) for report in reports)
+            for island, (history, best_tour, best_distance, _, _, _) in enumerate(reports):
+                # Islands that stopped early are padded with their last value,
+                # so that every island history stays aligned on the generations
+                last = history[-1] if history else best_distance
+                self.island_histories[island].extend(list(history) + [last] * (done - len(history)))
+                if best_distance < self.best_distance:
+                    self.best_distance = best_distance
+                    self.best_tour = best_tour.copy()
+                    self.best_route = self._route(self.best_tour)
+
+            start = len(self.history)
+            for step in range(start, start + done):
+                self.history.append(min(history[step] for history in self.island_histories))
+            self.generation += done
+            remaining -= epoch
+
+            if all(report[5] for report in reports):
+                break
+
+            if remaining > 0 and self.islands > 1 and self.migration_size > 0:
+                for island, destination in enumerate(self._destinations()):
+                    routes, lengths = reports[island][3], reports[island][4]
+                    self._connections[destination].send(("migrate", routes, lengths))
+
+        return self.best_route, self.best_distance
@@ -0,0 +1,66 @@
+"""
+Kernel backends of the genetic operators and of route costing.
+
+Two backends implement the same kernels: "python" (kernels.reference,
+pure Python/NumPy) and "numba" (kernels.compiled, used when numba is
+installed). The backend is picked when the library loads, from the
+TSP_SOLVER_KERNELS environment variable ("auto", "numba" or "python",
+default "auto"), and can be switched with use_backend.
+
+The kernels take the random draws as arguments, so both backends give
+bit-identical routes and lengths for a given seed.
+"""
+import os
+from . import reference
+
+try:
+    from . import compiled
+except ImportError:
+    compiled = None
+
+BACKENDS = {"python": reference}
+if compiled is not None:
+    BACKENDS["numba"] = compiled
+
+KERNELS = ("tour_length", "ordered_crossover", "cycle_crossover",
+           "ordered_crossover_batch", "cycle_crossover_batch",
+           "swap_positions", "move_position", "reverse_segment",
+           "eax_intermediate", "links_to_tour", "edge_recombination")
+
+
+def get_backend(name="auto"):
+    """
+    Module implementing the kernels of a backend.
+
+    Args:
+        name (str): "numba", "python", or "auto" for numba when it is available
+
+    Returns:
+        module: kernels.compiled or kernels.reference
+    """
+    if name == "auto":
+        name = "numba" if "numba" in BACKENDS else "python"
+    if name not in BACKENDS:
+        raise ValueError(f"Kernel backend not available: {name}")
+    return BACKENDS[name]
+
+
+def use_backend(name="auto"):
+    """
+    Switch the kernels used by the operators and GeneticAlgorithm.
+
+    Worker processes started afterwards with the spawn method pick their
+    backend from TSP_SOLVER_KERNELS instead.
+
+    Returns:
+        str: Name of the selected backend
+    """
+    global backend
+    module = get_backend(name)
+    backend = "numba" if module is compiled else "python"
+    globals().update({kernel: getattr(module, kernel) for kernel in KERNELS})
+    return backend
+
+
+backend = None  # Name of the selected backend
+use_backend(os.environ.get("TSP_SOLVER_KERNELS", "auto"))
@@ -0,0 +1,121 @@
+"""
+Numba-compiled kernels, with the signatures and results of kernels.reference.
+
+Importing this module raises ImportError when numba is not installed.
+Functions are compiled on first use and cached on disk.
+"""
+import numpy as np
+from numba import njit
+from . import reference
+
+
+@njit(cache=True)
+def tour_length(tour, matrix):
+    """Length of a closed tour, summing the edges in order in float64"""
+    size = len(tour)
+    total = 0.0
+    for k in range(size):
+        nxt = k + 1 if k + 1 < size else 0
+        total += np.float64(matrix[tour[k], tour[nxt]])
+    return total
+
+
+@njit(cache=True)
+def ordered_crossover(parent1, parent2, start_idx, end_idx):
+    """OX child keeping parent1[start_idx:end_idx + 1] in place"""
+    size = len(parent1)
+    child = np.empty_like(parent1)
+    in_child = np.zeros(size, dtype=np.bool_)
+    for k in range(start_idx, end_idx + 1):
+        child[k] = parent1[k]
+        in_child[parent1[k]] = True
+
+    target = (end_idx + 1) % size
+    for k in range(size):
+        city = parent2[(end_idx + 1 + k) % size]
+        if not in_child[city]:
+            child[target] = city
+            target = (target + 1) % size
+    return child
+
+
+@njit(cache=True)
+def cycle_crossover(parent1, parent2):
+    """CX child: the cycle through position 0 from parent1, the rest from parent2"""
+    size = len(parent1)
+    position = np.empty(size, dtype=np.intp)
+    for k in range(size):
+        position[parent1[k]] = k
+
+    child = parent2.copy()
+    current_pos = 0
+    in_cycle = np.zeros(size, dtype=np.bool_)
+    while not in_cycle[current_pos]:
+        in_cycle[current_pos] = True
+        child[current_pos] = parent1[current_pos]
+        current_pos = position[parent2[current_pos]]
+    return child
+
+
+@njit(cache=True)
+def ordered_crossover_batch(parents1, parents2, cut_points):
+    """OX children of the rows of two parent arrays, with the (m, 2) sorted cut points"""
+    children = np.empty_like(parents1)
+    for row in range(parents1.shape[0]):
+        children[row] = ordered_crossover(parents1[row], parents2[row],
+                                          cut_points[row, 0], cut_points[row, 1])
+    return children
+
+
+@njit(cache=True)
+def cycle_crossover_batch(parents1, parents2):
+    """CX children of the rows of two parent arrays"""
+    children = np.empty_like(parents1)
+    for row in range(parents1.shape[0]):
+        children[row] = cycle_crossover(parents1[row], parents2[row])
+    return children
+
+
+@njit(cache=True)
+def swap_positions(route, swaps):
+    """Exchange route[i] and route[j] for each (i, j) row of swaps, in order"""
+    for k in range(len(swaps)):
+        i = swaps[k, 0]
+        j = swaps[k, 1]
+        city = route[i]
+        route[i] = route[j]
+        route[j] = city
+    return route
+
+
+@njit(cache=True)
+def move_position(route, source, target):
+    """Move the city at position source to position target, shifting the others"""
+    moved = route[source]
+    if source < target:
+        for k in range(source, target):
+            route[k] = route[k + 1]
+    else:
+        for k in range(source, target, -1):
+            route[k] = route[k - 1]
+    route[target] = moved
+    return route
+
+
+@njit(cache=True)
+def reverse_segment(route, i, j):
+    """Reverse route[i:j + 1] in place"""
+    while i < j:
+        city = route[i]
+        route[i] = route[j]
+        route[j] = city
+        i += 1
+        j -= 1
+    return route
+
+
+# The graph walks of the edge-based crossovers are written as plain loops in
+# kernels.reference, which numba compiles as they are
+eax_intermediate = njit(cache=True)(reference.eax_intermediate)
+links_to_tour = njit(cache=True)(reference.links_to_tour)
+edge_recombination = njit(cache=True)(reference.edge_recombination)
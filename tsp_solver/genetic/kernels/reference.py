@@ -0,0 +1,356 @@
+"""
+Reference kernels in pure Python/NumPy.
+
+Every kernel is deterministic: the random draws are made by the callers
+(see genetic.operators) and passed in, so that all the backends produce
+the same routes for a given seed.
+"""
+import numpy as np
+
+
+def tour_length(tour, matrix):
+    """Length of a closed tour, summing the edges in order in float64"""
+    tour = np.asarray(tour)
+    edges = matrix[tour, np.roll(tour, -1)]
+    # add.accumulate adds sequentially, like the compiled loop
+    return float(np.add.accumulate(edges, dtype=np.float64)[-1]) if len(edges) else 0.0
+
+
+def ordered_crossover(parent1, parent2, start_idx, end_idx):
+    """OX child keeping parent1[start_idx:end_idx + 1] in place"""
+    size = len(parent1)
+    child = np.empty_like(parent1)
+    child[start_idx:end_idx + 1] = parent1[start_idx:end_idx + 1]
+    in_child = np.zeros(size, dtype=bool)
+    in_child[parent1[start_idx:end_idx + 1]] = True
+
+    # Remaining cities in the order of parent2, starting after the second cut point
+    order = np.roll(parent2, -(end_idx + 1))
+    remaining = order[~in_child[order]]
+    child[(end_idx + 1 + np.arange(len(remaining))) % size] = remaining
+    return child
+
+
+def cycle_crossover(parent1, parent2):
+    """CX child: the cycle through position 0 from parent1, the rest from parent2"""
+    size = len(parent1)
+    position = np.empty(size, dtype=np.intp)
+    position[parent1] = np.arange(size)
+
+    in_cycle = np.zeros(size, dtype=bool)
+    current_pos = 0
+    while not in_cycle[current_pos]:
+        in_cycle[current_pos] = True
+        current_pos = position[parent2[current_pos]]
+    return np.where(in_cycle, parent1, parent2)
+
+
+def ordered_crossover_batch(parents1, parents2, cut_points):
+    """OX children of the rows of two parent arrays, with the (m, 2) sorted cut points"""
+    m, size = parents1.shape
+    start_idx = cut_points[:, 0:1]
+    end_idx = cut_points[:, 1:2]
+    rows = np.arange(m)[:, None]
+    positions = np.arange(size)[None, :]
+
+    segment = (positions >= start_idx) & (positions <= end_idx)
+    in_child = np.zeros((m, size), dtype=bool)
+    in_child[rows, parents1] = segment
+
+    order = np.take_along_axis(parents2, (end_idx + 1 + positions) % size, axis=1)
+    keep = ~in_child[rows, order]
+    targets = (end_idx + np.cumsum(keep, axis=1)) % size
+
+    children = np.where(segment, parents1, 0).astype(parents1.dtype)
+    children[np.broadcast_to(rows, keep.shape)[keep], targets[keep]] = order[keep]
+    return children
+
+
+def cycle_crossover_batch(parents1, parents2):
+    """CX children of the rows of two parent arrays"""
+    m, size = parents1.shape
+    rows = np.arange(m)
+
+    position = np.empty((m, size), dtype=np.intp)
+    position[rows[:, None], parents1] = np.arange(size)[None, :]
+
+    # Follow all cycles from position 0 together, until each one closes
+    in_cycle = np.zeros((m, size), dtype=bool)
+    current_pos = np.zeros(m, dtype=np.intp)
+    active = rows
+    while len(active):
+        in_cycle[active, current_pos[active]] = True
+        current_pos[active] = position[active, parents2[active, current_pos[active]]]
+        active = active[~in_cycle[active, current_pos[active]]]
+
+    return np.where(in_cycle, parents1, parents2)
+
+
+def swap_positions(route, swaps):
+    """Exchange route[i] and route[j] for each (i, j) row of swaps, in order"""
+    for i, j in swaps:
+        route[i], route[j] = route[j], route[i]
+    return route
+
+
+def move_position(route, source, target):
+    """Move the city at position source to position target, shifting the others"""
+    moved = route[source]
+    if source < target:
+        route[source:target] = route[source + 1:target + 1]
+    else:
+        route[target + 1:source + 1] = route[target:source]
+    route[target] = moved
+    return route
+
+
+def reverse_segment(route, i, j):
+    """Reverse route[i:j + 1] in place"""
+    route[i:j + 1] = route[i:j + 1][::-1]
+    return route
+
+
+# The kernels of the edge-based crossovers walk graphs city by city: they are
+# plain loops, which kernels.compiled compiles as they are.
+
+def eax_intermediate(parent1, parent2, block, draws):
+    """
+    Intermediate solution of edge assembly crossover (EAX).
+
+    The edges of both parents that are not common are decomposed into
+    AB-cycles, alternating edges of parent1 (A) and parent2 (B). The
+    E-set is one AB-cycle ("single" strategy) or, if block is true, that
+    cycle and every AB-cycle sharing a city with it. The A-edges of the
+    E-set are then removed from parent1 and its B-edges added: every city
+    keeps two neighbours, but the result may be made of several subtours.
+
+    Args:
+        parent1 (numpy.ndarray): Parent A (array of city indices)
+        parent2 (numpy.ndarray): Parent B (array of city indices)
+        block (bool): Use the block strategy for the E-set
+        draws (numpy.ndarray): Uniform random numbers in [0, 1), at least n of them
+
+    Returns:
+        tuple: (links, labels, count): the (n, 2) neighbours of every city,
+        the subtour of every city and the number of subtours
+    """
+    n = len(parent1)
+    links = np.empty((n, 2), dtype=np.int64)
+    b_edges = np.empty((n, 2), dtype=np.int64)
+    for k in range(n):
+        links[parent1[k], 0] = parent1[k - 1]
+        links[parent1[k], 1] = parent1[(k + 1) % n]
+        b_edges[parent2[k], 0] = parent2[k - 1]
+        b_edges[parent2[k], 1] = parent2[(k + 1) % n]
+
+    # Edges left to the AB-cycles: those of each parent that the other lacks
+    a_edges = links.copy()
+    for city in range(n):
+        for side in range(2):
+            other = a_edges[city, side]
+            if b_edges[city, 0] == other:
+                a_edges[city, side] = -1
+                b_edges[city, 0] = -1
+            elif b_edges[city, 1] == other:
+                a_edges[city, side] = -1
+                b_edges[city, 1] = -1
+
+    # Decompose them into AB-cycles with alternating walks. A city at an even
+    # position of the walk leaves by an A-edge, at an odd one by a B-edge; the
+    # walk closes a cycle when it reaches a city already on it at the same parity
+    path = np.empty(2 * n + 1, dtype=np.int64)
+    position = np.full((n, 2), -1, dtype=np.int64)
+    cycle_cities = np.empty(3 * n + 1, dtype=np.int64)
+    cycle_start = np.zeros(n + 1, dtype=np.int64)
+    cycle_parity = np.zeros(n, dtype=np.int64)  # 0 if the cycle starts with an A-edge
+    cycles = 0
+    total = 0
+    used = n
+    order = np.argsort(draws[:n])
+    for start in order:
+        while a_edges[start, 0] >= 0 or a_edges[start, 1] >= 0:
+            path[0] = start
+            position[start, 0] = 0
+            length = 1
+            while length > 0:
+                city = path[length - 1]
+                parity = (length - 1) % 2
+                edges = a_edges if parity == 0 else b_edges
+                if edges[city, 0] >= 0 and edges[city, 1] >= 0:
+                    side = 0 if draws[used % len(draws)] < 0.5 else 1
+                    used += 1
+                elif edges[city, 0] >= 0:
+                    side = 0
+                elif edges[city, 1] >= 0:
+                    side = 1
+                else:
+                    # The start city has no A-edge left: the walk is over
+                    for k in range(length):
+                        position[path[k], k % 2] = -1
+                    length = 0
+                    continue
+
+                nxt = edges[city, side]
+                edges[city, side] = -1
+                if edges[nxt, 0] == city:
+                    edges[nxt, 0] = -1
+                else:
+                    edges[nxt, 1] = -1
+                path[length] = nxt
+                end = length
+                length += 1
+
+                first = position[nxt, end % 2]
+                if first < 0:
+                    position[nxt, end % 2] = end
+                    continue
+                # AB-cycle path[first..end], the walk goes on from path[first]
+                for k in range(first, end + 1):
+                    cycle_cities[total] = path[k]
+                    total += 1
+                cycle_parity[cycles] = first % 2
+                cycles += 1
+                cycle_start[cycles] = total
+                for k in range(first + 1, end):
+                    position[path[k], k % 2] = -1
+                length = first + 1
+
+    labels = np.zeros(n, dtype=np.int64)
+    if cycles == 0:
+        return links, labels, 1
+
+    # E-set
+    selected = np.zeros(cycles, dtype=np.bool_)
+    center = min(int(draws[used % len(draws)] * cycles), cycles - 1)
+    selected[center] = True
+    if block:
+        in_center = np.zeros(n, dtype=np.bool_)
+        for k in range(cycle_start[center], cycle_start[center + 1]):
+            in_center[cycle_cities[k]] = True
+        for cycle in range(cycles):
+            for k in range(cycle_start[cycle], cycle_start[cycle + 1]):
+                if in_center[cycle_cities[k]]:
+                    selected[cycle] = True
+                    break
+
+    # Remove its A-edges from parent1, then add its B-edges
+    for step in range(2):
+        for cycle in range(cycles):
+            if not selected[cycle]:
+                continue
+            for k in range(cycle_start[cycle], cycle_start[cycle + 1] - 1):
+                if (cycle_parity[cycle] + k - cycle_start[cycle]) % 2 != step:
+                    continue
+                for city, other in ((cycle_cities[k], cycle_cities[k + 1]),
+                                    (cycle_cities[k + 1], cycle_cities[k])):
+                    if step == 0:
+                        side = 0 if links[city, 0] == other else 1
+                        links[city, side] = -1
+                    else:
+                        side = 0 if links[city, 0] < 0 else 1
+                        links[city, side] = other
+
+    # Subtours
+    labels[:] = -1
+    count = 0
+    for first in range(n):
+        if labels[first] >= 0:
+            continue
+        previous = -1
+        city = first
+        while True:
+            labels[city] = count
+            nxt = links[city, 0] if links[city, 0] != previous else links[city, 1]
+            previous = city
+            city = nxt
+            if city == first:
+                break
+        count += 1
+    return links, labels, count
+
+
+def links_to_tour(links, start):
+    """Tour given by the (n, 2) neighbours of every city, from start towards links[start, 1]"""
+    n = len(links)
+    tour = np.empty(n, dtype=np.int64)
+    previous = -1
+    city = start
+    for k in range(n):
+        tour[k] = city
+        nxt = links[city, 1] if links[city, 1] != previous else links[city, 0]
+        previous = city
+        city = nxt
+    return tour
+
+
+def edge_recombination(parent1, parent2, keys):
+    """
+    Edge recombination crossover (ERX) child.
+
+    From parent1[0], the tour goes on to the unvisited neighbour (in
+    either parent) that is preferably a neighbour in both parents, then
+    has the fewest unvisited neighbours left, then the smallest key. At a
+    dead end it jumps to the unvisited city with the smallest key.
+
+    Args:
+        parent1 (numpy.ndarray): First parent (array of city indices)
+        parent2 (numpy.ndarray): Second parent (array of city indices)
+        keys (numpy.ndarray): n random tie-breaking keys, one per city
+
+    Returns:
+        numpy.ndarray: Child (array of city indices)
+    """
+    n = len(parent1)
+    neighbors = np.full((n, 4), -1, dtype=np.int64)
+    common = np.zeros((n, 4), dtype=np.bool_)
+    degree = np.zeros(n, dtype=np.int64)
+    for k in range(2 * n):
+        tour = parent1 if k < n else parent2
+        position = k % n
+        city = tour[position]
+        for other in (tour[position - 1], tour[(position + 1) % n]):
+            found = False
+            for side in range(degree[city]):
+                if neighbors[city, side] == other:
+                    common[city, side] = True
+                    found = True
+            if not found:
+                neighbors[city, degree[city]] = other
+                degree[city] += 1
+
+    remaining = degree.copy()  # Unvisited neighbours of every city
+    visited = np.zeros(n, dtype=np.bool_)
+    order = np.argsort(keys)
+    pointer = 0
+    child = np.empty_like(parent1)
+    city = parent1[0]
+    for k in range(n):
+        child[k] = city
+        visited[city] = True
+        for side in range(degree[city]):
+            remaining[neighbors[city, side]] -= 1
+        if k == n - 1:
+            break
+
+        best = -1
+        best_common = False
+        for side in range(degree[city]):
+            other = neighbors[city, side]
+            if visited[other]:
+                continue
+            better = best < 0
+            if not better and common[city, side] != best_common:
+                better = common[city, side]
+            elif not better and remaining[other] != remaining[best]:
+                better = remaining[other] < remaining[best]
+            elif not better:
+                better = keys[other] < keys[best]
+            if better:
+                best = other
+                best_common = common[city, side]
+        if best < 0:
+            while visited[order[pointer]]:
+                pointer += 1
+            best = order[pointer]
+        city = best
+    return child
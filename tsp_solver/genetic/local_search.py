@@ -0,0 +1,235 @@
+import time
+from collections import deque
+import numpy as np
+
+# Minimum gain for a move to count as an improvement (guards against float noise)
+EPSILON = 1e-9
+
+
+class _Budget:
+    """Move and time budget shared by the local search passes"""
+
+    def __init__(self, max_moves=None, deadline=None):
+        self.moves = 0
+        self.max_moves = max_moves
+        self.deadline = deadline
+
+    def exhausted(self):
+        if self.max_moves is not None and self.moves >= self.max_moves:
+            return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+
+def _reverse(tour, position, i, j):
+    """Reverse the cyclic segment tour[i..j], or its complement if that is shorter"""
+    n = len(tour)
+    length = (j - i) % n + 1
+    if 2 * length > n:
+        i, j = (j + 1) % n, (i - 1) % n
+        length = n - length
+    if length < 2:
+        return
+    idx = (i + np.arange(length)) % n
+    cities = tour[idx][::-1]
+    tour[idx] = cities
+    position[cities] = idx
+
+
+def _positions(tour):
+    position = np.empty(len(tour), dtype=np.intp)
+    position[tour] = np.arange(len(tour))
+    return position
+
+
+def _active_cities(tour, cities=None):
+    """Queue of the cities to look at, and the mask of the queued ones"""
+    if cities is None:
+        return deque(int(city) for city in tour), np.ones(len(tour), dtype=bool)
+    queued = np.zeros(len(tour), dtype=bool)
+    queued[cities] = True
+    return deque(int(city) for city in np.flatnonzero(queued)), queued
+
+
+def two_opt(tour, distances, neighbors, budget=None, cities=None):
+    """
+    2-opt with candidate lists and don't-look bits.
+
+    For each active city a and each candidate c closer to a than its
+    current successor (or predecessor), the move replacing the edges
+    (a, succ a) and (c, succ c) by (a, c) and (succ a, succ c) is tried.
+    Cities whose neighbourhood did not yield a move are not looked at
+    again until one of their edges changes.
+
+    Args:
+        tour (numpy.ndarray): Route to improve in place (array of city indices)
+        distances (DistanceMatrix): Distance engine of the instance
+        neighbors (numpy.ndarray): (n, k) candidate lists, closest first
+        budget (_Budget, optional): Move and time budget
+        cities (array-like, optional): Cities looked at first, all of them by default.
+            Other cities are only looked at once an edge of theirs changes
+
+    Returns:
+        float: Change in route length (negative or zero)
+    """
+    n = len(tour)
+    if n < 5:
+        return 0.0
+    budget = budget or _Budget()
+    position = _positions(tour)
+    active, queued = _active_cities(tour, cities)
+    total = 0.0
+
+    while active and not budget.exhausted():
+        a = active.popleft()
+        queued[a] = False
+
+        for direction in (1, -1):
+            i = position[a]
+            b = int(tour[(i + direction) % n])
+            d_ab = distances(a, b)
+            move = None
+
+            for c in neighbors[a]:
+                c = int(c)
+                d_ac = distances(a, c)
+                if d_ac >= d_ab:
+                    break
+                j = position[c]
+                d = int(tour[(j + direction) % n])
+                if c == b or d == a:
+                    continue
+                delta = d_ac + distances(b, d) - d_ab - distances(c, d)
+                if delta < -EPSILON:
+                    move = (c, d, j, delta)
+                    break
+
+            if move is not None:
+                c, d, j, delta = move
+                if direction == 1:
+                    _reverse(tour, position, (i + 1) % n, j)
+                else:
+                    _reverse(tour, position, j, (i - 1) % n)
+                total += delta
+                budget.moves += 1
+                for city in (a, b, c, d):
+                    if not queued[city]:
+                        queued[city] = True
+                        active.append(city)
+                break
+
+    return total
+
+
+def or_opt(tour, distances, neighbors, max_segment=3, budget=None, cities=None):
+    """
+    Or-opt with candidate lists and don't-look bits.
+
+    Segments of 1 to max_segment cities starting at an active city are
+    moved, possibly reversed, between a candidate neighbour of their first
+    city and that neighbour's successor or predecessor.
+
+    Args:
+        tour (numpy.ndarray): Route to improve in place (array of city indices)
+        distances (DistanceMatrix): Distance engine of the instance
+        neighbors (numpy.ndarray): (n, k) candidate lists, closest first
+        max_segment (int): Longest segment moved
+        budget (_Budget, optional): Move and time budget
+        cities (array-like, optional): Cities looked at first, all of them by default.
+            Other cities are only looked at once an edge of theirs changes
+
+    Returns:
+        float: Change in route length (negative or zero)
+    """
+    n = len(tour)
+    if n < max_segment + 3:
+        return 0.0
+    budget = budget or _Budget()
+    position = _positions(tour)
+    active, queued = _active_cities(tour, cities)
+    total = 0.0
+
+    while active and not budget.exhausted():
+        first = active.popleft()
+        queued[first] = False
+        move = None
+
+        for length in range(1, max_segment + 1):
+            i = position[first]
+            last = int(tour[(i + length - 1) % n])
+            prev = int(tour[(i - 1) % n])
+            nxt = int(tour[(i + length) % n])
+            removal_gain = distances(prev, first) + distances(last, nxt) - distances(prev, nxt)
+            if removal_gain <= EPSILON:
+                continue
+
+            for c in neighbors[first]:
+                c = int(c)
+                d_c = distances(c, first)
+                if d_c >= removal_gain:
+                    break
+                if (position[c] - i) % n < length:
+                    continue  # c belongs to the segment
+                for offset in (1, -1):
+                    other = int(tour[(position[c] + offset) % n])
+                    if (position[other] - i) % n < length:
+                        continue
+                    # first is placed next to c, last next to other
+                    delta = d_c + distances(last, other) - distances(c, other) - removal_gain
+                    if delta < -EPSILON:
+                        move = (length, c, other, offset, delta)
+                        break
+                if move is not None:
+                    break
+            if move is not None:
+                break
+
+        if move is not None:
+            length, c, other, offset, delta = move
+            i = position[first]
+            idx = (i + np.arange(length)) % n
+            segment = tour[idx].copy()
+            rest = np.delete(tour, idx)
+            at = int(np.flatnonzero(rest == c)[0])
+            if offset == 1:
+                # ... c first..last other ...
+                new_tour = np.concatenate((rest[:at + 1], segment, rest[at + 1:]))
+            else:
+                # ... other last..first c ...
+                new_tour = np.concatenate((rest[:at], segment[::-1], rest[at:]))
+            tour[:] = new_tour
+            position[tour] = np.arange(n)
+            total += delta
+            budget.moves += 1
+            for city in (first, int(segment[-1]), c, other, prev, nxt):
+                if not queued[city]:
+                    queued[city] = True
+                    active.append(city)
+
+    return total
+
+
+def local_search(tour, distances, neighbors, max_moves=None, deadline=None, cities=None):
+    """
+    Alternate 2-opt and Or-opt until neither improves the route or the budget runs out.
+
+    Args:
+        tour (numpy.ndarray): Route to improve in place (array of city indices)
+        distances (DistanceMatrix): Distance engine of the instance
+        neighbors (numpy.ndarray): (n, k) candidate lists, closest first
+        max_moves (int, optional): Maximum number of improving moves
+        deadline (float, optional): time.perf_counter() value at which to stop
+        cities (array-like, optional): Cities each pass starts from, e.g. around the
+            places where the route was changed. All of them by default
+
+    Returns:
+        tuple: (delta, moves) change in route length and number of moves applied
+    """
+    budget = _Budget(max_moves, deadline)
+    total = 0.0
+    while not budget.exhausted():
+        total += two_opt(tour, distances, neighbors, budget, cities)
+        delta = or_opt(tour, distances, neighbors, budget=budget, cities=cities)
+        total += delta
+        if delta == 0:
+            break
+    return total, budget.moves
@@ -1,3 +1,7 @@
-from .selection import tournament_selection, elitism_selection
-from .crossover import ordered_crossover, cycle_crossover
-from .mutation import swap_mutation, insertion_mutation, inversion_mutation
\ No newline at end of file
+from .selection import (tournament_selection, elitism_selection, tournament_selection_batch,
+                        rank_selection, stochastic_universal_sampling)
+from .crossover import (ordered_crossover, cycle_crossover,
+                        ordered_crossover_batch, cycle_crossover_batch,
+                        edge_assembly_crossover, edge_recombination_crossover)
+from .mutation import (swap_mutation, insertion_mutation, inversion_mutation,
+                       swap_mutation_batch, insertion_mutation_batch, inversion_mutation_batch)
\ No newline at end of file
@@ -1,68 +1,200 @@
 import random
+import numpy as np
+from .. import kernels
 
-def ordered_crossover(parent1, parent2):
+def ordered_crossover(parent1, parent2, rng=random):
     """
     Ordered crossover (OX): preserves the relative order of cities from parent1
     while inheriting cities from parent2 that are not yet present.
     
+    Runs in O(n): a membership bitmap over the city indices replaces the
+    scans of the child. The cut points are drawn here and the child is
+    built by the selected kernel backend.
+    
     Args:
-        parent1 (list): First parent (list of cities)
-        parent2 (list): Second parent (list of cities)
+        parent1 (numpy.ndarray): First parent (array of city indices)
+        parent2 (numpy.ndarray): Second parent (array of city indices)
+        rng (random.Random, optional): Random number generator (the random module by default)
         
     Returns:
-        list: New individual (list of cities)
+        numpy.ndarray: New individual (array of city indices)
     """
-    child = [None] * len(parent1)
+    parent1 = np.asarray(parent1)
+    parent2 = np.asarray(parent2)
     
     # Randomly choose two cut points
-    start_idx, end_idx = sorted(random.sample(range(len(parent1)), 2))
+    start_idx, end_idx = sorted(rng.sample(range(len(parent1)), 2))
     
-    for i in range(start_idx, end_idx + 1):
-        child[i] = parent1[i]
+    # Copy the segment, then add the remaining cities in the order they
+    # appear in parent2, starting after the second cut point
+    return kernels.ordered_crossover(parent1, parent2, start_idx, end_idx)
+
+def cycle_crossover(parent1, parent2):
+    """
+    Cycle crossover (CX): preserves the absolute position of cities.
     
-    # Add the remaining cities in the order they appear in parent2
-    ptr = (end_idx + 1) % len(parent1)
-    p2_idx = (end_idx + 1) % len(parent2)
+    Runs in O(n) using the position array of parent1, in the selected
+    kernel backend.
     
-    while None in child:
-        if parent2[p2_idx] not in child:
-            child[ptr] = parent2[p2_idx]
-            ptr = (ptr + 1) % len(child)
-        p2_idx = (p2_idx + 1) % len(parent2)
+    Args:
+        parent1 (numpy.ndarray): First parent (array of city indices)
+        parent2 (numpy.ndarray): Second parent (array of city indices)
+        
+    Returns:
+        numpy.ndarray: New individual (array of city indices)
+    """
+    return kernels.cycle_crossover(np.asarray(parent1), np.asarray(parent2))
+
+def ordered_crossover_batch(parents1, parents2, cut_points=None, rng=random):
+    """
+    Ordered crossover applied to many pairs of parents at once.
     
-    return child
+    Row k of the result is the child ordered_crossover would produce from
+    parents1[k] and parents2[k] with the same cut points. All the children
+    are built by one call to the selected kernel backend.
+    
+    Args:
+        parents1 (numpy.ndarray): (m, n) array of first parents
+        parents2 (numpy.ndarray): (m, n) array of second parents
+        cut_points (numpy.ndarray, optional): (m, 2) array of sorted cut points,
+            drawn like ordered_crossover does if not given
+        rng (random.Random, optional): Random number generator (the random module by default)
+        
+    Returns:
+        numpy.ndarray: (m, n) array of children
+    """
+    parents1 = np.asarray(parents1)
+    parents2 = np.asarray(parents2)
+    m, size = parents1.shape
+    if cut_points is None:
+        cut_points = np.array([sorted(rng.sample(range(size), 2)) for _ in range(m)],
+                              dtype=np.intp).reshape(m, 2)
+    return kernels.ordered_crossover_batch(parents1, parents2, np.asarray(cut_points, dtype=np.intp))
 
-def cycle_crossover(parent1, parent2):
+def cycle_crossover_batch(parents1, parents2):
     """
-    Cycle crossover (CX): preserves the absolute position of cities.
+    Cycle crossover applied to many pairs of parents at once, by one call
+    to the selected kernel backend.
     
     Args:
-        parent1 (list): First parent (list of cities)
-        parent2 (list): Second parent (list of cities)
+        parents1 (numpy.ndarray): (m, n) array of first parents
+        parents2 (numpy.ndarray): (m, n) array of second parents
         
     Returns:
-        list: New individual (list of cities)
+        numpy.ndarray: (m, n) array of children
     """
-    size = len(parent1)
-    child = [None] * size
+    return kernels.cycle_crossover_batch(np.asarray(parents1), np.asarray(parents2))
+
+# Candidate cities of the subtour merge when no neighbor list is given, or
+# when all the neighbors of a subtour lie inside it: the subtour cities
+# tried against every other city
+MERGE_FALLBACK_CITIES = 8
+
+def _merge_subtours(links, labels, count, distances, neighbors=None):
+    """
+    Join the subtours of an EAX intermediate solution into one tour, in place.
+    
+    The smallest subtour is repeatedly merged with another one by the
+    cheapest 2-opt style exchange: an edge (u, u2) of the subtour and an
+    edge (v, v2) outside are replaced by (u, v), (u2, v2) or by (u, v2),
+    (u2, v), v being one of the nearest neighbors of u.
+    
+    Args:
+        links (numpy.ndarray): (n, 2) neighbors of every city
+        labels (numpy.ndarray): Subtour of every city
+        count (int): Number of subtours
+        distances (DistanceMatrix): Distances between the cities
+        neighbors (numpy.ndarray, optional): (n, k) candidate lists
+    """
+    while count > 1:
+        smallest = np.argmin(np.bincount(labels, minlength=count))
+        members = np.flatnonzero(labels == smallest)
+        # Every edge (u, u2) of the subtour, in both directions
+        cities = np.repeat(members, 2)
+        nexts = links[members].ravel()
+        
+        v = np.empty(0, dtype=np.int64)
+        if neighbors is not None:
+            candidates = neighbors[cities].astype(np.int64)
+            outside = labels[candidates] != smallest
+            u = np.broadcast_to(cities[:, None], candidates.shape)[outside]
+            u2 = np.broadcast_to(nexts[:, None], candidates.shape)[outside]
+            v = candidates[outside]
+        if not len(v):
+            cities = cities[:2 * MERGE_FALLBACK_CITIES]
+            nexts = nexts[:2 * MERGE_FALLBACK_CITIES]
+            others = np.flatnonzero(labels != smallest)
+            u, u2 = np.repeat(cities, len(others)), np.repeat(nexts, len(others))
+            v = np.tile(others, len(cities))
+        
+        # Both edges (v, v2) of every candidate v
+        u, u2, v = np.repeat(u, 2), np.repeat(u2, 2), np.repeat(v, 2)
+        v2 = links[v, np.arange(len(v)) % 2]
+        removed = distances.pair_distances(u, u2) + distances.pair_distances(v, v2)
+        straight = distances.pair_distances(u, v) + distances.pair_distances(u2, v2) - removed
+        crossed = distances.pair_distances(u, v2) + distances.pair_distances(u2, v) - removed
+        best = np.argmin(np.minimum(straight, crossed))
+        u, u2, v, v2 = u[best], u2[best], v[best], v2[best]
+        if crossed[best] < straight[best]:
+            v, v2 = v2, v
+        
+        # Replace (u, u2) and (v, v2) with (u, v) and (u2, v2)
+        for city, old, new in ((u, u2, v), (u2, u, v2), (v, v2, u), (v2, v, u2)):
+            links[city, 0 if links[city, 0] == old else 1] = new
+        
+        labels[members] = labels[v]
+        count -= 1
+        labels[labels == count] = smallest
+
+def edge_assembly_crossover(parent1, parent2, distances, rng, strategy="single", neighbors=None):
+    """
+    Edge assembly crossover (EAX).
     
-    p1_dict = {parent1[i]: i for i in range(size)}
-    p2_dict = {parent2[i]: i for i in range(size)}
+    The edges in which the parents differ are split into AB-cycles,
+    alternating edges of parent1 (A) and of parent2 (B). The child is
+    parent1 with the edges of an E-set exchanged: the A-edges of the
+    E-set are removed and its B-edges added. The resulting subtours are
+    joined greedily with short edges (nearest neighbors), so the child
+    inherits almost all its edges from its parents.
     
-    start_pos = 0
-    current_pos = 0
-    current_value = parent1[current_pos]
+    The AB-cycles and subtours are built by the selected kernel backend.
     
-    # cycle
-    while True:
-        child[current_pos] = parent1[current_pos]
-        current_pos = p1_dict[parent2[current_pos]]
+    Args:
+        parent1 (numpy.ndarray): First parent (array of city indices)
+        parent2 (numpy.ndarray): Second parent (array of city indices)
+        distances (DistanceMatrix): Distances between the cities
+        rng (numpy.random.Generator): Random number generator
+        strategy (str): E-set of "single" AB-cycle, or "block" of AB-cycles
+            sharing cities with a random one
+        neighbors (numpy.ndarray, optional): (n, k) candidate lists used to merge the subtours
         
-        if current_pos == start_pos:
-            break
+    Returns:
+        numpy.ndarray: New individual (array of city indices)
+    """
+    parent1 = np.asarray(parent1)
+    parent2 = np.asarray(parent2)
+    size = len(parent1)
+    if size < 5:
+        return parent1.copy()
     
-    for i in range(size):
-        if child[i] is None:
-            child[i] = parent2[i]
+    links, labels, count = kernels.eax_intermediate(parent1, parent2, strategy == "block",
+                                                    rng.random(2 * size))
+    _merge_subtours(links, labels, count, distances, neighbors)
+    return kernels.links_to_tour(links, parent1[0]).astype(parent1.dtype)
+
+def edge_recombination_crossover(parent1, parent2, rng):
+    """
+    Edge recombination crossover (ERX): builds the child from the union of
+    the parents' edges, visiting next the neighbor with the fewest
+    neighbors left (edges shared by both parents first).
     
-    return child
\ No newline at end of file
+    Args:
+        parent1 (numpy.ndarray): First parent (array of city indices)
+        parent2 (numpy.ndarray): Second parent (array of city indices)
+        rng (numpy.random.Generator): Random number generator (tie-breaking)
+        
+    Returns:
+        numpy.ndarray: New individual (array of city indices)
+    """
+    parent1 = np.asarray(parent1)
+    return kernels.edge_recombination(parent1, np.asarray(parent2), rng.random(len(parent1)))
@@ -1,57 +1,281 @@
 import random
+import numpy as np
+from .. import kernels
 
-def swap_mutation(route, mutation_rate):
+def _edge_sum(route, starts, distances):
+    """Length of the route edges (route[p], route[p + 1]) for the given start positions"""
+    n = len(route)
+    return sum(distances(route[p], route[(p + 1) % n]) for p in sorted({p % n for p in starts}))
+
+def swap_mutation(route, mutation_rate, distances=None, rng=random):
     """
     Swap mutation: randomly exchanges pairs of cities.
     
     Args:
-        route (list): Route to mutate (list of cities)
+        route (numpy.ndarray): Route to mutate in place (array of city indices)
         mutation_rate (float): Probability of applying mutation to each city
+        distances (DistanceMatrix, optional): If given, the change in route length is also returned
+        rng (random.Random, optional): Random number generator (the random module by default)
         
     Returns:
-        list: Mutated route
+        numpy.ndarray: Mutated route, or (route, delta) if distances is given
     """
-    for i in range(len(route)):
-        if random.random() < mutation_rate:
-            j = random.randint(0, len(route) - 1)
+    n = len(route)
+    swaps = []
+    for i in range(n):
+        if rng.random() < mutation_rate:
+            j = rng.randint(0, n - 1)
             if i != j:
-                route[i], route[j] = route[j], route[i]
-    return route
+                swaps.append((i, j))
+    if not swaps:
+        return route if distances is None else (route, 0)
+    
+    if distances is not None:
+        # Only the edges around the swapped positions change
+        affected = [p for i, j in swaps for p in (i - 1, i, j - 1, j)]
+        delta = -_edge_sum(route, affected, distances)
+    kernels.swap_positions(route, np.array(swaps, dtype=np.intp))
+    if distances is None:
+        return route
+    return route, delta + _edge_sum(route, affected, distances)
 
-def insertion_mutation(route, mutation_rate):
+def insertion_mutation(route, mutation_rate, distances=None, rng=random):
     """
     Insertion mutation: inserts a city at a new position.
     
     Args:
-        route (list): Route to mutate (list of cities)
+        route (numpy.ndarray): Route to mutate in place (array of city indices)
         mutation_rate (float): Probability of applying mutation
+        distances (DistanceMatrix, optional): If given, the change in route length is also returned
+        rng (random.Random, optional): Random number generator (the random module by default)
         
     Returns:
-        list: Mutated route
+        numpy.ndarray: Mutated route, or (route, delta) if distances is given
     """
-    if random.random() < mutation_rate:
-        city = random.randint(0, len(route) - 1)
-        insertion_pos = random.randint(0, len(route) - 1)
+    delta = 0
+    if rng.random() < mutation_rate:
+        city = rng.randint(0, len(route) - 1)
+        insertion_pos = rng.randint(0, len(route) - 1)
         
         if city != insertion_pos:
-            city = route.pop(city)
-            route.insert(insertion_pos, city)
+            n = len(route)
+            moved = route[city]
+            if distances is not None:
+                prev, nxt = route[city - 1], route[(city + 1) % n]
+                delta += distances(prev, nxt) - distances(prev, moved) - distances(moved, nxt)
+            
+            # Shift the cities between the two positions by one place
+            kernels.move_position(route, city, insertion_pos)
+            
+            if distances is not None:
+                # Neighbours of the moved city at its new position
+                prev, nxt = route[insertion_pos - 1], route[(insertion_pos + 1) % n]
+                delta += distances(prev, moved) + distances(moved, nxt) - distances(prev, nxt)
     
-    return route
+    return route if distances is None else (route, delta)
 
-def inversion_mutation(route, mutation_rate):
+def inversion_mutation(route, mutation_rate, distances=None, rng=random):
     """
     Inversion mutation: reverses the order of cities between two points.
     
+    Only the two edges at the ends of the reversed segment change, since
+    distances are symmetric.
+    
     Args:
-        route (list): Route to mutate (list of cities)
+        route (numpy.ndarray): Route to mutate in place (array of city indices)
         mutation_rate (float): Probability of applying mutation
+        distances (DistanceMatrix, optional): If given, the change in route length is also returned
+        rng (random.Random, optional): Random number generator (the random module by default)
+        
+    Returns:
+        numpy.ndarray: Mutated route, or (route, delta) if distances is given
+    """
+    delta = 0
+    if rng.random() < mutation_rate:
+        i, j = sorted(rng.sample(range(len(route)), 2))
+        if distances is not None:
+            affected = (i - 1, j)
+            delta -= _edge_sum(route, affected, distances)
+        kernels.reverse_segment(route, i, j)
+        if distances is not None:
+            delta += _edge_sum(route, affected, distances)
+    
+    return route if distances is None else (route, delta)
+
+def _mark_stale(lengths, rows):
+    if lengths is not None:
+        lengths[rows] = np.nan
+
+def swap_mutation_batch(routes, mutation_rate, rng, distances=None, lengths=None):
+    """
+    Swap mutation applied to many routes at once.
+    
+    Every position of every route is mutated with probability mutation_rate
+    (swapped with a uniformly drawn position), as in swap_mutation. All the
+    decisions are drawn at once: the number of mutated positions, then the
+    positions and their partners. The swaps are applied in order by one
+    kernel call over the whole array, or when lengths are to be updated,
+    in rounds holding the k-th swap of every route, each costed by the
+    change of the (at most four) edges around the swapped positions.
+    
+    Args:
+        routes (numpy.ndarray): (m, n) routes to mutate in place
+        mutation_rate (float): Probability of applying mutation to each city
+        rng (numpy.random.Generator): Random number generator
+        distances (DistanceMatrix, optional): If given, the known lengths are updated
+            by the mutation deltas (otherwise the mutated routes get NaN)
+        lengths (numpy.ndarray, optional): Cached lengths of the routes (NaN if unknown)
+        
+    Returns:
+        numpy.ndarray: Indices of the mutated routes
+    """
+    m, n = routes.shape
+    count = rng.binomial(m * n, mutation_rate) if m * n else 0
+    if not count:
+        return np.empty(0, dtype=np.intp)
+    positions = np.sort(rng.choice(m * n, size=count, replace=False))
+    partners = positions - positions % n + rng.integers(0, n, size=count)
+    moved = positions != partners
+    swaps = np.stack([positions[moved], partners[moved]], axis=1)
+    rows = swaps[:, 0] // n
+    mutated = np.unique(rows)
+    
+    if distances is None or lengths is None:
+        flat = routes.reshape(-1)
+        kernels.swap_positions(flat, swaps)
+        if not np.may_share_memory(flat, routes):
+            routes[...] = flat.reshape(m, n)
+        _mark_stale(lengths, mutated)
+        return mutated
+    
+    # Rank of each swap within its route: the swaps of a round touch distinct
+    # routes, and the rounds keep the order of the swaps of each route
+    rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+    order = np.argsort(rank, kind='stable')
+    for batch in np.split(order, np.cumsum(np.bincount(rank))[:-1]):
+        lengths[rows[batch]] += _swap_rows(routes, rows[batch], swaps[batch, 0] % n,
+                                           swaps[batch, 1] % n, distances)
+    return mutated
+
+def _swap_rows(routes, rows, a, b, distances):
+    """Swap positions a and b of distinct routes and return the length deltas"""
+    n = routes.shape[1]
+    # Edges starting at a - 1, a, b - 1 and b, each counted once when a and b are adjacent
+    starts = np.stack([a - 1, a, b - 1, b], axis=1) % n
+    keep = np.ones(starts.shape, dtype=bool)
+    keep[:, 2] = starts[:, 2] != a
+    keep[:, 3] = b != starts[:, 0]
+    ends = (starts + 1) % n
+    
+    def edges():
+        lengths = distances.pair_distances(routes[rows[:, None], starts],
+                                           routes[rows[:, None], ends])
+        return np.where(keep, lengths, 0).sum(axis=1)
+    
+    delta = -edges()
+    routes[rows, a], routes[rows, b] = routes[rows, b], routes[rows, a]
+    return delta + edges()
+
+def _draw_rows(m, mutation_rate, rng):
+    """Routes mutated with probability mutation_rate each"""
+    return np.flatnonzero(rng.random(m) < mutation_rate)
+
+def insertion_mutation_batch(routes, mutation_rate, rng, distances=None, lengths=None):
+    """
+    Insertion mutation applied to many routes at once.
+    
+    Each route is mutated with probability mutation_rate: the city at a
+    random position is moved to another random position, as in
+    insertion_mutation. The mutated routes are rebuilt with one gather.
+    
+    Args:
+        routes (numpy.ndarray): (m, n) routes to mutate in place
+        mutation_rate (float): Probability of applying mutation to each route
+        rng (numpy.random.Generator): Random number generator
+        distances (DistanceMatrix, optional): If given, the known lengths are updated
+            by the mutation deltas (otherwise the mutated routes get NaN)
+        lengths (numpy.ndarray, optional): Cached lengths of the routes (NaN if unknown)
+        
+    Returns:
+        numpy.ndarray: Indices of the mutated routes
+    """
+    m, n = routes.shape
+    rows = _draw_rows(m, mutation_rate, rng)
+    source, target = rng.integers(0, n, size=(2, len(rows)))
+    moved = source != target
+    rows, source, target = rows[moved], source[moved, None], target[moved, None]
+    if not len(rows):
+        return rows
+    
+    # Position read by each position of the mutated route
+    positions = np.arange(n)[None, :]
+    order = positions + ((positions >= source) & (positions < target)) \
+                      - ((positions > target) & (positions <= source))
+    order = np.where(positions == target, source, order)
+    
+    before = routes[rows]
+    after = np.take_along_axis(before, order, axis=1)
+    routes[rows] = after
+    
+    if distances is None or lengths is None:
+        _mark_stale(lengths, rows)
+        return rows
+    source, target = source[:, 0], target[:, 0]
+    index = np.arange(len(rows))
+    city = before[index, source]
+    prev, nxt = before[index, source - 1], before[index, (source + 1) % n]
+    delta = (distances.pair_distances(prev, nxt) - distances.pair_distances(prev, city)
+             - distances.pair_distances(city, nxt))
+    prev, nxt = after[index, target - 1], after[index, (target + 1) % n]
+    delta += (distances.pair_distances(prev, city) + distances.pair_distances(city, nxt)
+              - distances.pair_distances(prev, nxt))
+    lengths[rows] += delta
+    return rows
+
+def inversion_mutation_batch(routes, mutation_rate, rng, distances=None, lengths=None):
+    """
+    Inversion mutation applied to many routes at once.
+    
+    Each route is mutated with probability mutation_rate: the segment
+    between two distinct random positions is reversed, as in
+    inversion_mutation. The mutated routes are rebuilt with one gather.
+    
+    Args:
+        routes (numpy.ndarray): (m, n) routes to mutate in place
+        mutation_rate (float): Probability of applying mutation to each route
+        rng (numpy.random.Generator): Random number generator
+        distances (DistanceMatrix, optional): If given, the known lengths are updated
+            by the mutation deltas (otherwise the mutated routes get NaN)
+        lengths (numpy.ndarray, optional): Cached lengths of the routes (NaN if unknown)
         
     Returns:
-        list: Mutated route
+        numpy.ndarray: Indices of the mutated routes
     """
-    if random.random() < mutation_rate:
-        i, j = sorted(random.sample(range(len(route)), 2))
-        route[i:j+1] = reversed(route[i:j+1])
+    m, n = routes.shape
+    rows = _draw_rows(m, mutation_rate, rng)
+    if not len(rows) or n < 2:
+        return rows[:0]
+    # Two distinct positions, i < j
+    first = rng.integers(0, n, size=len(rows))
+    second = rng.integers(0, n - 1, size=len(rows))
+    second += second >= first
+    i, j = np.minimum(first, second)[:, None], np.maximum(first, second)[:, None]
+    
+    positions = np.arange(n)[None, :]
+    order = np.where((positions >= i) & (positions <= j), i + j - positions, positions)
+    before = routes[rows]
+    routes[rows] = np.take_along_axis(before, order, axis=1)
     
-    return route
\ No newline at end of file
+    if distances is None or lengths is None:
+        _mark_stale(lengths, rows)
+        return rows
+    # Only the edges at both ends of the segment change (none for a whole-route reversal)
+    i, j = i[:, 0], j[:, 0]
+    index = np.arange(len(rows))
+    prev, start = before[index, i - 1], before[index, i]
+    end, nxt = before[index, j], before[index, (j + 1) % n]
+    delta = (distances.pair_distances(prev, end) + distances.pair_distances(start, nxt)
+             - distances.pair_distances(prev, start) - distances.pair_distances(end, nxt))
+    delta[(i - 1) % n == j] = 0
+    lengths[rows] += delta
+    return rows
@@ -1,35 +1,122 @@
 import random
+import numpy as np
 
-def tournament_selection(population, fitness_results, tournament_size):
+def tournament_selection(population, fitness_results, tournament_size, rng=random):
     """
     Tournament selection: selects the best individuals from random subgroups.
     
     Args:
         population (list): List of routes (individuals) in the population
-        fitness_results (dict): Dictionary mapping each route's index to its fitness
+        fitness_results (numpy.ndarray): Fitness of each route, indexed like the population
         tournament_size (int): Number of individuals participating in each tournament
+        rng (random.Random, optional): Random number generator (the random module by default)
         
     Returns:
         int: Index of the selected individual
     """
-    tournament_candidates = random.sample(range(len(population)), tournament_size)
+    tournament_candidates = rng.sample(range(len(population)), tournament_size)
     tournament_fitness = [(i, fitness_results[i]) for i in tournament_candidates]
     tournament_fitness.sort(key=lambda x: x[1], reverse=True)
     
     return tournament_fitness[0][0]
 
+def tournament_selection_batch(fitness_results, count, tournament_size, rng):
+    """
+    All the tournaments of a generation at once.
+    
+    Draws a (count, tournament_size) matrix of candidate indices, distinct
+    within each row like in tournament_selection, and keeps the fittest
+    candidate of each row. Small tournaments redraw the few rows holding a
+    repeated index; large ones take the tournament_size smallest of a row
+    of random keys per tournament.
+    
+    Args:
+        fitness_results (numpy.ndarray): Fitness of each route, indexed like the population
+        count (int): Number of individuals to select
+        tournament_size (int): Number of individuals participating in each tournament
+            (capped at the population size)
+        rng (numpy.random.Generator): Random number generator
+        
+    Returns:
+        numpy.ndarray: Indices of the selected individuals
+    """
+    fitness_results = np.asarray(fitness_results)
+    n = len(fitness_results)
+    size = min(tournament_size, n)
+    if size * size <= n:
+        candidates = rng.integers(0, n, size=(count, size))
+        while True:
+            ordered = np.sort(candidates, axis=1)
+            repeated = np.flatnonzero((ordered[:, 1:] == ordered[:, :-1]).any(axis=1))
+            if not len(repeated):
+                break
+            candidates[repeated] = rng.integers(0, n, size=(len(repeated), size))
+    else:
+        candidates = np.argpartition(rng.random((count, n)), size - 1, axis=1)[:, :size]
+    winners = np.argmax(fitness_results[candidates], axis=1)
+    return candidates[np.arange(count), winners]
+
+def rank_selection(fitness_results, count, rng):
+    """
+    Linear rank selection: the probability of selecting an individual is
+    proportional to its rank (1 for the worst, n for the best), whatever
+    the scale of the fitness values.
+    
+    Args:
+        fitness_results (numpy.ndarray): Fitness of each route, indexed like the population
+        count (int): Number of individuals to select
+        rng (numpy.random.Generator): Random number generator
+        
+    Returns:
+        numpy.ndarray: Indices of the selected individuals
+    """
+    fitness_results = np.asarray(fitness_results)
+    n = len(fitness_results)
+    ranks = np.empty(n)
+    ranks[np.argsort(fitness_results, kind='stable')] = np.arange(1, n + 1)
+    return rng.choice(n, size=count, p=ranks / ranks.sum())
+
+def stochastic_universal_sampling(fitness_results, count, rng):
+    """
+    Stochastic universal sampling: fitness-proportionate selection with
+    count equally spaced pointers over the cumulative fitness, so that
+    each individual is selected close to its expected number of times.
+    
+    Args:
+        fitness_results (numpy.ndarray): Fitness of each route, indexed like the population
+        count (int): Number of individuals to select
+        rng (numpy.random.Generator): Random number generator
+        
+    Returns:
+        numpy.ndarray: Indices of the selected individuals
+    """
+    cumulative = np.cumsum(fitness_results, dtype=np.float64)
+    step = cumulative[-1] / count
+    pointers = rng.uniform(0, step) + step * np.arange(count)
+    return np.minimum(np.searchsorted(cumulative, pointers, side='right'), len(cumulative) - 1)
+
 def elitism_selection(fitness_results, elite_size):
     """
     Elitism selection: selects the n best individuals.
     
+    Uses a partial sort (argpartition) of the fitness, then orders only
+    the elites.
+    
     Args:
-        fitness_results (dict): Dictionary mapping each route's index to its fitness
+        fitness_results (numpy.ndarray): Fitness of each route, indexed like the population
         elite_size (int): Number of elites to select
         
     Returns:
-        list: Indices of selected elites
+        numpy.ndarray: Indices of selected elites, best first
     """
-    sorted_fitness = [(i, fitness_results[i]) for i in range(len(fitness_results))]
-    sorted_fitness.sort(key=lambda x: x[1], reverse=True)
+    fitness_results = np.asarray(fitness_results)
+    elite_size = min(elite_size, len(fitness_results))
+    if elite_size <= 0:
+        return np.empty(0, dtype=np.intp)
     
-    return [sorted_fitness[i][0] for i in range(min(elite_size, len(sorted_fitness)))]
\ No newline at end of file
+    threshold = fitness_results[np.argpartition(-fitness_results, elite_size - 1)[elite_size - 1]]
+    # Like a stable sort, the lowest indices win the ties at the threshold
+    better = np.flatnonzero(fitness_results > threshold)
+    ties = np.flatnonzero(fitness_results == threshold)[:elite_size - len(better)]
+    elites = np.concatenate([better, ties])
+    return elites[np.lexsort((elites, -fitness_results[elites]))]
\ No newline at end of file
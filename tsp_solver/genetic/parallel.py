@@ -0,0 +1,160 @@
+import random
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from ..core.distance import DistanceMatrix
+
+# Children created per task. It does not depend on the number of workers,
+# so a given seed gives the same offspring whatever the pool size.
+PARALLEL_CHUNK_SIZE = 16
+
+# Arrays of the worker process, attached to the shared memory blocks
+_worker = {}
+
+
+def _create_block(array):
+    """Copy an array into a new shared memory block"""
+    block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block
+
+
+def _attach(spec):
+    """Attach to a shared memory block described by (name, shape, dtype)"""
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _release(blocks):
+    for block in blocks:
+        try:
+            block.close()
+        except BufferError:
+            pass  # Still viewed by a numpy array, the mapping goes away with it
+        block.unlink()
+
+
+def _init_worker(specs, metric, config):
+    """Attach the worker to the instance and population blocks"""
+    from .algorithm import GeneticAlgorithm
+
+    blocks = {}
+    arrays = {}
+    for key, spec in specs.items():
+        blocks[key], arrays[key] = _attach(spec)
+
+    distances = DistanceMatrix.from_arrays(arrays.get('coords'), arrays.get('matrix'), metric)
+    _worker['blocks'] = blocks  # Keep the blocks mapped for the life of the worker
+    _worker['arrays'] = arrays
+    _worker['ga'] = GeneticAlgorithm(distances, **config)
+
+
+def _breed_chunk(start, stop, seed, parameters=None):
+    """Create and evaluate the children of slots [start, stop) with their own generator"""
+    ga = _worker['ga']
+    for name, value in (parameters or {}).items():
+        setattr(ga, name, value)
+    arrays = _worker['arrays']
+    children, lengths = arrays['children'], arrays['child_lengths']
+
+    ga.rng = random.Random(seed)
+    ga.np_rng = np.random.default_rng(seed)
+    ga.breed(arrays['parents'], arrays['parent_lengths'], children, lengths, range(start, stop))
+
+    stale = start + np.flatnonzero(np.isnan(lengths[start:stop]))
+    if len(stale):
+        lengths[stale] = ga.distances.tour_lengths(children[stale])
+
+
+class ParallelBreeder:
+    """
+    Creates and evaluates the offspring of a GeneticAlgorithm in worker processes.
+
+    The coordinates, the distance matrix and the parent/children arrays live
+    in shared memory, so each generation only sends slot ranges and seeds to
+    the workers. Every chunk of PARALLEL_CHUNK_SIZE children is bred with a
+    generator seeded from the generation seed and the chunk index.
+    """
+
+    def __init__(self, ga, workers):
+        """
+        Start the worker processes.
+
+        Args:
+            ga (GeneticAlgorithm): Algorithm whose offspring are bred
+            workers (int): Number of worker processes
+        """
+        distances = ga.distances
+        shape = (ga.population_size, ga.num_cities)
+        arrays = {
+            'parents': np.zeros(shape, dtype=np.int32),
+            'parent_lengths': np.zeros(ga.population_size),
+            'children': np.zeros(shape, dtype=np.int32),
+            'child_lengths': np.zeros(ga.population_size),
+        }
+        if distances.coords is not None:
+            arrays['coords'] = distances.coords
+        if distances.matrix is not None:
+            arrays['matrix'] = distances.matrix
+
+        self.blocks = []
+        self.arrays = {}
+        specs = {}
+        for key, array in arrays.items():
+            block = _create_block(np.ascontiguousarray(array))
+            self.blocks.append(block)
+            self.arrays[key] = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+            specs[key] = (block.name, array.shape, array.dtype.str)
+        self._finalizer = weakref.finalize(self, _release, self.blocks)
+
+        config = {
+            'population_size': ga.population_size,
+            'elite_size': ga.elite_size,
+            'mutation_rate': ga.mutation_rate,
+            'crossover_type': ga.crossover_type,
+            'mutation_type': ga.mutation_type,
+            'crossover_rate': ga.crossover_rate,
+            'neighbor_count': ga.neighbor_count,
+            'adaptive': ga.adaptive,
+        }
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(specs, distances.metric, config))
+
+    def breed(self, selected_routes, selected_lengths, out_routes, out_lengths, first_slot, seed,
+              parameters=None):
+        """
+        Fill out_routes[first_slot:] with children of the selected routes.
+
+        Args:
+            selected_routes (numpy.ndarray): Parents to pick from
+            selected_lengths (numpy.ndarray): Cached lengths of the parents
+            out_routes (numpy.ndarray): Array receiving the children
+            out_lengths (numpy.ndarray): Array receiving the children lengths
+            first_slot (int): First row to fill (the rows before hold the elites)
+            seed (int): Seed of this generation
+            parameters (dict, optional): GeneticAlgorithm attributes set in the workers
+                before breeding (the operators chosen by the adaptive mode)
+        """
+        self.arrays['parents'][...] = selected_routes
+        self.arrays['parent_lengths'][...] = selected_lengths
+
+        size = len(out_routes)
+        futures = []
+        for chunk, start in enumerate(range(first_slot, size, PARALLEL_CHUNK_SIZE)):
+            chunk_seed = int(np.random.SeedSequence([seed, chunk]).generate_state(1, np.uint64)[0])
+            stop = min(start + PARALLEL_CHUNK_SIZE, size)
+            futures.append(self.executor.submit(_breed_chunk, start, stop, chunk_seed, parameters))
+        for future in futures:
+            future.result()
+
+        out_routes[first_slot:] = self.arrays['children'][first_slot:]
+        out_lengths[first_slot:] = self.arrays['child_lengths'][first_slot:]
+
+    def close(self):
+        """Stop the workers and free the shared memory"""
+        self.executor.shutdown()
+        self.arrays = {}
+        self._finalizer()
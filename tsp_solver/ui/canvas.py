@@ -1,10 +1,56 @@
+import time
+import numpy as np
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.collections import LineCollection
 from matplotlib.figure import Figure
+from PyQt5.QtCore import QTimer
+
+# Maximum number of redraws per second
+MAX_FPS = 20
+
+# Share of the GUI thread time rendering may take: slow frames (large
+# instances, tangled early routes) lower the frame rate accordingly
+MAX_RENDER_SHARE = 0.25
+
+# City names are only drawn up to this many cities
+LABEL_LIMIT = 100
+
+# The distance curve is downsampled to at most this many points
+HISTORY_POINTS = 2000
+
+
+def downsample_history(history, max_points=HISTORY_POINTS):
+    """
+    Evenly spaced points of a distance history, always keeping the last one.
+    
+    Args:
+        history (list): Best distance of each generation
+        max_points (int): Maximum number of points returned
+    
+    Returns:
+        tuple: (generations, distances) numpy arrays
+    """
+    distances = np.asarray(history, dtype=np.float64)
+    generations = np.arange(len(distances))
+    if len(distances) > max_points:
+        step = -(-len(distances) // max_points)
+        generations = np.append(generations[:-1:step], generations[-1])
+        distances = distances[generations]
+    return generations, distances
+
 
 class MatplotlibCanvas(FigureCanvas):
-    """Class for creating a Matplotlib canvas integrated with PyQt"""
+    """
+    Class for creating a Matplotlib canvas integrated with PyQt
+    
+    The cities, axes and labels are drawn once per instance (set_cities);
+    the route and the distance curve are animated artists whose data is
+    updated in place and blitted over the cached background. Redraws are
+    capped to MAX_FPS (less if rendering is slow): requests in between are
+    coalesced into one.
+    """
     
-    def __init__(self, parent=None, width=10, height=6, dpi=100):
+    def __init__(self, parent=None, width=10, height=6, dpi=100, max_fps=MAX_FPS):
         """
         Initialize the Matplotlib canvas.
         
@@ -13,6 +59,7 @@ class MatplotlibCanvas(FigureCanvas):
             width (float): Canvas width
             height (float): Canvas height
             dpi (int): Canvas resolution
+            max_fps (int): Maximum number of redraws per second
         """
         self.fig = Figure(figsize=(width, height), dpi=dpi)
         self.axes1 = self.fig.add_subplot(121)  # cities and the path
@@ -29,4 +76,138 @@ class MatplotlibCanvas(FigureCanvas):
         self.axes2.set_title("Evolution of the distance")
         self.axes2.set_xlabel("Generation")
         self.axes2.set_ylabel("Distance")
-        self.axes2.grid(True)
\ No newline at end of file
+        self.axes2.grid(True)
+        
+        self.coords = np.empty((0, 2))
+        self.scatter = None
+        self.labels = []
+        # Animated artists: left out of full draws, blitted over the background
+        # One segment per edge: much faster to rasterize than one long self-crossing line
+        self.route_lines = LineCollection([], colors='r', alpha=0.7, animated=True)
+        self.axes1.add_collection(self.route_lines)
+        self.tour = None  # Route to draw at the next frame, None once drawn
+        self.history = None  # Distance history to draw at the next frame, None once drawn
+        self.history_line, = self.axes2.plot([], [], 'g-', animated=True)
+        self.background = None
+        
+        self.min_interval = 1.0 / max_fps
+        self.interval = self.min_interval  # Current time between two redraws
+        self.last_draw = 0.0
+        self.full_redraw = True  # The background must be redrawn (limits or scale changed)
+        self.draw_timer = QTimer(self)
+        self.draw_timer.setSingleShot(True)
+        self.draw_timer.timeout.connect(self.render)
+        self.mpl_connect("draw_event", self._on_draw)
+    
+    def set_cities(self, coords, names=None):
+        """
+        Draw the cities of a new instance and clear the route and history.
+        
+        Args:
+            coords (numpy.ndarray): (n, 2) city coordinates
+            names (list, optional): City names, drawn below LABEL_LIMIT cities
+        """
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        if self.scatter is not None:
+            self.scatter.remove()
+        for label in self.labels:
+            label.remove()
+        
+        x, y = self.coords[:, 0], self.coords[:, 1]
+        self.scatter = self.axes1.scatter(x, y, c='blue', marker='o', s=None if len(x) <= LABEL_LIMIT else 2)
+        self.labels = []
+        if names is not None and len(names) <= LABEL_LIMIT:
+            self.labels = [self.axes1.annotate(name, (cx, cy), fontsize=8)
+                           for name, cx, cy in zip(names, x, y)]
+        if len(x):
+            margin = max(np.ptp(x), np.ptp(y), 1.0) * 0.05
+            self.axes1.set_xlim(x.min() - margin, x.max() + margin)
+            self.axes1.set_ylim(y.min() - margin, y.max() + margin)
+        
+        self.route_lines.set_segments([])
+        self.tour = None
+        self.history = None
+        self.history_line.set_data([], [])
+        self.axes2.set_yscale('linear')
+        self.axes2.set_xlim(0, 100)
+        self.request_draw(full=True)
+    
+    def show_route(self, tour):
+        """
+        Set the route drawn over the cities (array of city indices, or None).
+        
+        Like the history, it is only processed when a frame is rendered,
+        so updates replaced before the next frame cost nothing.
+        """
+        self.tour = np.empty(0, dtype=np.int64) if tour is None else tour
+    
+    def show_history(self, history):
+        """Set the distance curve (list of the best distance of each generation)"""
+        self.history = history
+    
+    def _update_history(self):
+        """Downsample the pending history, rescaling the axes only when it leaves them"""
+        history, self.history = self.history, None
+        if history is None:
+            return
+        if not len(history):
+            self.history_line.set_data([], [])
+            return
+        generations, distances = downsample_history(history)
+        self.history_line.set_data(generations, distances)
+        
+        axes = self.axes2
+        # The x limit doubles when reached, so the axis is not redrawn every generation
+        if generations[-1] >= axes.get_xlim()[1]:
+            axes.set_xlim(0, max(100, 2 * generations[-1]))
+            self.full_redraw = True
+        low, high = distances.min(), distances.max()
+        bottom, top = axes.get_ylim()
+        if self.full_redraw or low < bottom or high > top:
+            # Logarithmic scale if there is a lot of data
+            log = len(history) > 50 and high / low > 10
+            axes.set_yscale('log' if log else 'linear')
+            # Room below the curve, so that improvements do not rescale it every generation
+            if log:
+                axes.set_ylim(low / 1.5, high * 1.1)
+            else:
+                margin = (high - low) * 0.05 or high * 0.05 or 1.0
+                axes.set_ylim(max(0.0, low - max(margin, 0.1 * low)), high + margin)
+            self.full_redraw = True
+    
+    def request_draw(self, full=False):
+        """Redraw now, or at the next frame if the last redraw was too recent"""
+        self.full_redraw |= full
+        wait = self.last_draw + self.interval - time.perf_counter()
+        if wait <= 0:
+            self.draw_timer.stop()
+            self.render()
+        elif not self.draw_timer.isActive():
+            self.draw_timer.start(int(wait * 1000) + 1)
+    
+    def render(self):
+        """Blit the animated artists, or redraw everything if the background changed"""
+        start = time.perf_counter()
+        self._update_history()
+        if self.full_redraw or self.background is None:
+            self.full_redraw = False
+            self.draw()  # The draw event caches the background and draws the artists
+        else:
+            self.restore_region(self.background)
+            self._draw_animated()
+            self.blit(self.fig.bbox)
+        self.last_draw = time.perf_counter()
+        self.interval = max(self.min_interval, (self.last_draw - start) / MAX_RENDER_SHARE)
+    
+    def _on_draw(self, event):
+        """Cache the background after a full draw (also after a resize)"""
+        self.background = self.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+    
+    def _draw_animated(self):
+        if self.tour is not None:
+            points = self.coords[self.tour]
+            self.route_lines.set_segments(np.stack([points, np.roll(points, -1, axis=0)], axis=1))
+            self.tour = None
+        self.axes1.draw_artist(self.route_lines)
+        self.axes2.draw_artist(self.history_line)
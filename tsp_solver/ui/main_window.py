@@ -1,24 +1,19 @@
 # tsp_solver/ui/main_window.py
 import sys
 import random
-import time
-import threading
 import numpy as np
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLabel, QPushButton, QSpinBox, 
                             QDoubleSpinBox, QGroupBox, QGridLayout, QStatusBar,
                             QComboBox, QFileDialog, QCheckBox)
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QObject
+from PyQt5.QtCore import Qt, QTimer
 
 from ..core.city import City
+from ..core.tsplib_importer import TSPLibImporter
 from ..genetic.algorithm import GeneticAlgorithm
+from ..genetic.background import BackgroundSolver, PROGRESS_INTERVAL
 from .canvas import MatplotlibCanvas
 
-class SignalEmitter(QObject):
-    """Class for emitting signals between threads"""
-    update_signal = pyqtSignal()
-    generation_signal = pyqtSignal(int, float)
-
 class TSPWindow(QMainWindow):
     """Main window of the application"""
     
@@ -32,13 +27,13 @@ class TSPWindow(QMainWindow):
         
         self.cities = []
         self.genetic_algo = None
+        self.plotted_algo = None  # Algorithm whose cities are on the canvas
         self.is_running = False
-        self.thread = None
+        self.solver = None  # Background process running the algorithm
         
-        # signals for thread communication
-        self.signal_emitter = SignalEmitter()
-        self.signal_emitter.update_signal.connect(self.update_plots)
-        self.signal_emitter.generation_signal.connect(self.update_generation_info)
+        # Progress of the solver process, read from the GUI thread
+        self.progress_timer = QTimer(self)
+        self.progress_timer.timeout.connect(self.poll_solver)
         
         # Create the user interface
         self.init_ui()
@@ -92,7 +87,7 @@ class TSPWindow(QMainWindow):
 
         param_layout.addWidget(QLabel("Crossover type:"), 1, 4)
         self.crossover_type = QComboBox()
-        self.crossover_type.addItems(["ordered", "cycle"])
+        self.crossover_type.addItems(["ordered", "cycle", "eax", "eax_block", "erx"])
         param_layout.addWidget(self.crossover_type, 1, 5)
         
         param_layout.addWidget(QLabel("Mutation type:"), 2, 0)
@@ -118,6 +113,11 @@ class TSPWindow(QMainWindow):
         self.generations_check.setValue(20)
         param_layout.addWidget(self.generations_check, 2, 6)
         
+        self.adaptive = QCheckBox("Adaptive operators")
+        self.adaptive.setToolTip("Choose the crossover, the mutation and the mutation rate "
+                                 "of every generation automatically")
+        param_layout.addWidget(self.adaptive, 3, 0, 1, 2)
+        
         button_layout = QHBoxLayout()
         
         self.import_button = QPushButton("Import TSPLIB")
@@ -173,7 +173,7 @@ class TSPWindow(QMainWindow):
                 n_cities = 3  # Minimum 3 cities for a valid problem
                 self.city_count.setValue(3)
                 
-            self.stop_algorithm()
+            self.stop_algorithm(wait=True)
             
             self.cities = []
             for i in range(n_cities):
@@ -198,7 +198,8 @@ class TSPWindow(QMainWindow):
                 mutation_type=mutation_type,
                 use_stopping_criterion=self.use_stopping.isChecked(),
                 improvement_threshold=self.improvement_threshold.value(),
-                generations_without_improvement=self.generations_check.value()
+                generations_without_improvement=self.generations_check.value(),
+                adaptive=self.adaptive.isChecked()
             )
             
             self.genetic_algo.create_initial_population()
@@ -229,28 +230,11 @@ class TSPWindow(QMainWindow):
             
             if filename:
                 # Stop the algorithm if running
-                self.stop_algorithm()
+                self.stop_algorithm(wait=True)
                 
-                # Read the TSPLIB file
-                self.cities = []
-                with open(filename, 'r') as file:
-                    dimension = 0
-                    coords_started = False
-                    
-                    for line in file:
-                        line = line.strip()
-                        if line.startswith("DIMENSION"):
-                            dimension = int(line.split(":")[-1])
-                        elif line == "NODE_COORD_SECTION":
-                            coords_started = True
-                        elif coords_started and line != "EOF":
-                            # Parse coordinates
-                            parts = line.split()
-                            if len(parts) >= 3:
-                                idx = int(parts[0])
-                                x = float(parts[1])
-                                y = float(parts[2])
-                                self.cities.append(City(x, y, f"City-{idx}"))
+                # Read the TSPLIB file (shared loader, with the binary cache)
+                instance = TSPLibImporter.load(filename)
+                self.cities = instance.cities()
                 
                 self.city_count.setValue(len(self.cities))
                 
@@ -262,7 +246,7 @@ class TSPWindow(QMainWindow):
                 mutation_type = self.mutation_type.currentText()
                 
                 self.genetic_algo = GeneticAlgorithm(
-                    self.cities, 
+                    instance, 
                     population_size=pop_size,
                     elite_size=elite,
                     mutation_rate=mutation,
@@ -271,7 +255,8 @@ class TSPWindow(QMainWindow):
                     mutation_type=mutation_type,
                     use_stopping_criterion=self.use_stopping.isChecked(),
                     improvement_threshold=self.improvement_threshold.value(),
-                    generations_without_improvement=self.generations_check.value()
+                    generations_without_improvement=self.generations_check.value(),
+                    adaptive=self.adaptive.isChecked()
                 )
                 
                 self.genetic_algo.create_initial_population()
@@ -298,48 +283,65 @@ class TSPWindow(QMainWindow):
             self.start_algorithm()
     
     def start_algorithm(self):
-        """Start the genetic algorithm in a separate thread"""
+        """Start the genetic algorithm in a separate process"""
         if not self.is_running and self.genetic_algo:
             self.is_running = True
             self.start_button.setText("Stop Algorithm")
             self.generate_button.setEnabled(False)
+            self.import_button.setEnabled(False)
             self.step_button.setEnabled(False)
             
-            self.thread = threading.Thread(target=self.run_algorithm)
-            self.thread.daemon = True
-            self.thread.start()
+            self.solver = BackgroundSolver(self.genetic_algo)
+            self.progress_timer.start(int(PROGRESS_INTERVAL * 1000))
             
             self.statusBar.showMessage("Algorithm running...")
     
-    def stop_algorithm(self):
-        """Stop the genetic algorithm"""
-        self.is_running = False
-        if self.thread and self.thread.is_alive():
-            self.thread.join(0.1)  # Wait for the thread to finish
+    def stop_algorithm(self, wait=False):
+        """
+        Stop the genetic algorithm.
+        
+        Args:
+            wait (bool): Wait for the solver process to hand its state back
+                (otherwise it is picked up by poll_solver)
+        """
+        if self.solver is None:
+            return
+        if wait:
+            self.solver.close()
+            self.poll_solver()
+        else:
+            self.solver.stop()
+            self.start_button.setEnabled(False)
+            self.statusBar.showMessage("Stopping...")
+    
+    def poll_solver(self):
+        """Show the progress of the solver process and handle its end"""
+        solver = self.solver
+        if solver is None:
+            return
+        
+        if solver.poll():
+            self.update_generation_info(self.genetic_algo.generation, self.genetic_algo.best_distance)
+            self.update_plots()
+        if not solver.finished:
+            return
         
+        self.progress_timer.stop()
+        self.solver = None
+        self.is_running = False
         self.start_button.setText("Start Algorithm")
+        self.start_button.setEnabled(True)
         self.generate_button.setEnabled(True)
+        self.import_button.setEnabled(True)
         self.step_button.setEnabled(True)
         
-        if self.genetic_algo:
+        if solver.stop_reason == "stagnation":
+            self.statusBar.showMessage(f"Algorithm stopped: no significant improvement after {self.generations_check.value()} generations")
+        elif solver.stop_reason == "error":
+            self.statusBar.showMessage(f"Error: {solver.error}")
+        else:
             self.statusBar.showMessage(f"Algorithm stopped at generation {self.genetic_algo.generation}")
     
-    def run_algorithm(self):
-        """Run the genetic algorithm until stopped"""
-        while self.is_running:
-            best_route, best_distance, generation, should_stop = self.genetic_algo.run_generation()
-            self.signal_emitter.generation_signal.emit(generation, best_distance)
-            
-            if generation % 5 == 0 or generation < 10:
-                self.signal_emitter.update_signal.emit()
-            
-            if should_stop:
-                self.stop_algorithm()
-                self.statusBar.showMessage(f"Algorithm stopped: no significant improvement after {self.generations_check.value()} generations")
-                break
-            
-            time.sleep(0.05)
-    
     def run_step(self):
         """Execute one step (generation) of the genetic algorithm"""
         if self.genetic_algo:
@@ -360,51 +362,22 @@ class TSPWindow(QMainWindow):
         self.distance_label.setText(f"{distance:.2f}")
     
     def update_plots(self):
-        """Update plots with current data"""
+        """Update plots with current data (redraws are rate-limited by the canvas)"""
         if not self.genetic_algo:
             return
         
-        self.canvas.axes1.clear()
-        self.canvas.axes2.clear()
-        
-        self.canvas.axes1.set_title("Traveling Salesman Problem")
-        self.canvas.axes1.set_xlabel("X")
-        self.canvas.axes1.set_ylabel("Y")
-        self.canvas.axes1.grid(True)
-        
-        self.canvas.axes2.set_title("Distance Evolution")
-        self.canvas.axes2.set_xlabel("Generation")
-        self.canvas.axes2.set_ylabel("Distance")
-        self.canvas.axes2.grid(True)
-        
-        x = [city.x for city in self.cities]
-        y = [city.y for city in self.cities]
-        self.canvas.axes1.scatter(x, y, c='blue', marker='o')
-        
-        for city in self.cities:
-            self.canvas.axes1.annotate(city.name, (city.x, city.y), fontsize=8)
-        
-        # plot best route if available
-        if self.genetic_algo.best_route:  
-            best_route = self.genetic_algo.best_route
-            for i in range(len(best_route)):
-                city1 = best_route[i]
-                city2 = best_route[(i + 1) % len(best_route)]
-                self.canvas.axes1.plot([city1.x, city2.x], [city1.y, city2.y], 'r-', alpha=0.7)
-        
-        history = self.genetic_algo.history
-        if history:
-            generations = list(range(len(history)))
-            self.canvas.axes2.plot(generations, history, 'g-')
-            
-            # Logarithmic scale if there is a lot of data
-            if len(history) > 50 and max(history) / min(history) > 10:
-                self.canvas.axes2.set_yscale('log')
+        # Cities are drawn once per algorithm, only the route and history change
+        if self.plotted_algo is not self.genetic_algo:
+            self.plotted_algo = self.genetic_algo
+            coords = [(city.x, city.y) for city in self.cities]
+            self.canvas.set_cities(coords, [city.name for city in self.cities])
         
-        # Refresh the canvas
-        self.canvas.draw()
+        best_tour = self.genetic_algo.best_tour
+        self.canvas.show_route(None if best_tour is None else best_tour.copy())
+        self.canvas.show_history(self.genetic_algo.history)
+        self.canvas.request_draw()
     
     def closeEvent(self, event):
         """Handle window closing"""
-        self.stop_algorithm()
+        self.stop_algorithm(wait=True)
         event.accept()
\ No newline at end of file